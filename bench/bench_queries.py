@@ -0,0 +1,198 @@
+import argparse
+import datetime
+import json
+import subprocess
+import time
+
+from common import ROOT, fetch_all, open_connection, summarize
+
+import spa_data
+
+CLIENTS_SQL = (
+    "SELECT client_id FROM appointments GROUP BY client_id ORDER BY count(*) DESC, client_id LIMIT ?"
+)
+USERS_SQL = "SELECT phone, full_name FROM users ORDER BY id DESC LIMIT ?"
+OFFERS_SQL = (
+    "SELECT cf.salon_id, cf.service_id FROM catalog_flat cf "
+    "WHERE EXISTS (SELECT 1 FROM masters m WHERE m.salon_id = cf.salon_id AND m.active) "
+    "ORDER BY cf.salon_id DESC, cf.service_id LIMIT ?"
+)
+CITIES_SQL = "SELECT DISTINCT city FROM salons ORDER BY city LIMIT ?"
+REVIEW_SALONS_SQL = "SELECT salon_id FROM salon_rating_stats WHERE pending_count > 0 ORDER BY salon_id LIMIT ?"
+SEARCHES = ["массаж", "пилинг аппар", "салон 1", "стрижка прем"]
+
+
+def time_calls(calls, repeat):
+    timings = []
+    for index in range(repeat):
+        call = calls[index % len(calls)]
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return summarize(timings)
+
+
+def sample(db, size):
+    return {
+        "clients": [row[0] for row in fetch_all(db, CLIENTS_SQL, [size])],
+        "users": fetch_all(db, USERS_SQL, [size]),
+        "offers": fetch_all(db, OFFERS_SQL, [size]),
+        "cities": [row[0] for row in fetch_all(db, CITIES_SQL, [size])],
+        "review_salons": [row[0] for row in fetch_all(db, REVIEW_SALONS_SQL, [size])],
+    }
+
+
+def catalog_next_page(filters, db):
+    page = spa_data.fetch_catalog_page(filters, db=db)
+    if page and page[2]:
+        spa_data.fetch_catalog_page(filters, page[1], db=db)
+
+
+def scenarios(db, data):
+    clients = data["clients"]
+    offers = data["offers"]
+    return {
+        "catalog": [lambda: spa_data.fetch_catalog_page({}, db=db)],
+        "catalog_next_page": [lambda: catalog_next_page({}, db)],
+        "catalog_city": [
+            lambda city=city: spa_data.fetch_catalog_page({"city": city}, db=db) for city in data["cities"]
+        ],
+        "catalog_price": [
+            lambda: spa_data.fetch_catalog_page({"price_min": 1000, "price_max": 2000}, db=db)
+        ],
+        "catalog_rating": [lambda: spa_data.fetch_catalog_page({"sort": spa_data.CATALOG_SORT_RATING}, db=db)],
+        "catalog_search": [
+            lambda text=text: spa_data.fetch_catalog_page({"search": text}, db=db) for text in SEARCHES
+        ],
+        "catalog_estimate": [
+            lambda text=text: spa_data.fetch_catalog_estimate({"search": text}, db=db) for text in SEARCHES
+        ],
+        "catalog_estimate_city": [
+            lambda city=city: spa_data.fetch_catalog_estimate(
+                {"city": city, "price_min": 1000, "price_max": 2000}, db=db
+            )
+            for city in data["cities"]
+        ],
+        "bookings_upcoming": [
+            lambda client=client: spa_data.fetch_bookings(client, "upcoming", db=db) for client in clients
+        ],
+        "bookings_history": [
+            lambda client=client: spa_data.fetch_bookings(client, "history", db=db) for client in clients
+        ],
+        "review_queue": [
+            lambda salon=salon: spa_data.fetch_review_queue(salon, db=db) for salon in data["review_salons"]
+        ],
+        "available_slots": [
+            lambda salon=salon, service=service: spa_data.fetch_available_slots(salon, service, db=db)
+            for salon, service in offers
+        ],
+        "find_user_phone": [lambda phone=phone: spa_data.find_user(phone, db=db) for phone, _ in data["users"]],
+        "find_user_name": [lambda name=name: spa_data.find_user(name, db=db) for _, name in data["users"]],
+        "user_directory": [lambda: spa_data.fetch_user_directory({}, db=db)],
+        "user_directory_phone": [
+            lambda phone=phone: spa_data.fetch_user_directory({"search": phone[:8]}, db=db)
+            for phone, _ in data["users"]
+            if phone
+        ],
+        "user_directory_name": [
+            lambda name=name: spa_data.fetch_user_directory({"search": name.split()[0][:4]}, db=db)
+            for _, name in data["users"]
+        ],
+    }
+
+
+def bench_book_cancel(db, data, repeat):
+    book_timings = []
+    cancel_timings = []
+    client = data["clients"][0]
+    for index in range(repeat):
+        salon, service = data["offers"][index % len(data["offers"])]
+        started = time.perf_counter()
+        booked = spa_data.book_first_available(client, salon, service, db=db)
+        book_timings.append((time.perf_counter() - started) * 1000)
+        if not booked:
+            continue
+        started = time.perf_counter()
+        spa_data.cancel_appointment(booked[0].appointment_id, booked[0].start_ts, db=db)
+        cancel_timings.append((time.perf_counter() - started) * 1000)
+    results = {"book_first_available": summarize(book_timings)}
+    if cancel_timings:
+        results["cancel_appointment"] = summarize(cancel_timings)
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    regressions = []
+    print(f"\n{'сценарий':<22} {'было, мс':>9} {'стало, мс':>10} {'изменение':>10}")
+    for name, stats in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None or not before["median_ms"]:
+            continue
+        change = stats["median_ms"] / before["median_ms"] - 1
+        mark = ""
+        if change > tolerance and stats["median_ms"] - before["median_ms"] > min_delta_ms:
+            mark = "  регрессия"
+            regressions.append(name)
+        print(f"{name:<22} {before['median_ms']:>9.2f} {stats['median_ms']:>10.2f} {change:>+9.0%}{mark}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время выполнения запросов приложения на текущих данных")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--sample", type=int, default=20, help="сколько клиентов, услуг и городов перебирать")
+    parser.add_argument("--skip-writes", action="store_true", help="не выполнять запись и отмену")
+    parser.add_argument("--output", help="сохранить результаты в JSON")
+    parser.add_argument("--baseline", help="сравнить с ранее сохранёнными результатами")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="допустимый рост медианы")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="минимальный рост медианы, мс")
+    args = parser.parse_args()
+
+    db = open_connection()
+    data = sample(db, args.sample)
+    if not data["clients"] or not data["offers"]:
+        raise SystemExit("Нет данных для теста: запустите generate_data.py")
+
+    results = {}
+    print(f"{'сценарий':<22} {'p50, мс':>8} {'p95, мс':>8} {'p99, мс':>8}")
+    for name, calls in scenarios(db, data).items():
+        if not calls:
+            continue
+        results[name] = time_calls(calls, args.repeat)
+    if not args.skip_writes:
+        results.update(bench_book_cancel(db, data, args.repeat))
+    for name, stats in results.items():
+        print(f"{name:<22} {stats['median_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "recorded_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                    "revision": git_revision(),
+                    "repeat": args.repeat,
+                    "results": results,
+                },
+                handle,
+                ensure_ascii=False,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            regressions = compare(results, json.load(handle), args.tolerance, args.min_delta_ms)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
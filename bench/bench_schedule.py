@@ -0,0 +1,93 @@
+import argparse
+import time
+
+from PySide6.QtSql import QSqlQuery
+
+from common import fetch_all, open_connection, parse_sizes, run
+
+SEED_SALON_SQL = (
+    "INSERT INTO salons(name, city, address) "
+    "VALUES ('Салон расписания', 'Город 0', 'ул. Тестовая, 0') RETURNING id"
+)
+
+SEED_MASTERS_SQL = (
+    "INSERT INTO masters(salon_id, full_name, specialization) "
+    "SELECT ?, 'Мастер ' || g, 'Тест' FROM generate_series(1, ?) AS g"
+)
+
+MASTERS_SQL = "SELECT id FROM masters WHERE salon_id = ? ORDER BY id"
+
+SLOT_TIMES_SQL = (
+    "SELECT (d.day + t.start_time::time)::timestamptz::TEXT, "
+    "       (d.day + t.start_time::time + INTERVAL '60 minutes')::timestamptz::TEXT "
+    "FROM generate_series(CURRENT_DATE + 1000, CURRENT_DATE + 999 + ?::INTEGER, INTERVAL '1 day') AS d(day) "
+    "CROSS JOIN generate_series(TIMESTAMP '2000-01-01 10:00', TIMESTAMP '2000-01-01 17:00', "
+    "                           INTERVAL '60 minutes') AS t(start_time)"
+)
+
+ROW_INSERT_SQL = "INSERT INTO schedule_slots(master_id, start_ts, end_ts) VALUES ({}, '{}', '{}')"
+
+PARTITIONS_SQL = (
+    "SELECT create_schedule_partitions(CURRENT_DATE + 1000, CURRENT_DATE + 1000 + ?::INTEGER)"
+)
+
+GENERATE_SQL = (
+    "SELECT generate_schedule(NULL, CURRENT_DATE + 1000, CURRENT_DATE + 999 + ?::INTEGER)"
+)
+
+
+def seed_masters(db, count):
+    salon_id = fetch_all(db, SEED_SALON_SQL)[0][0]
+    run(db, SEED_MASTERS_SQL, [salon_id, count])
+    run(db, "UPDATE masters SET active = (salon_id = ?)", [salon_id])
+    return [row[0] for row in fetch_all(db, MASTERS_SQL, [salon_id])]
+
+
+def bench_per_row(db, masters, days):
+    db.transaction()
+    try:
+        master_ids = seed_masters(db, masters)
+        run(db, PARTITIONS_SQL, [days])
+        slot_times = fetch_all(db, SLOT_TIMES_SQL, [days])
+        query = QSqlQuery(db)
+        started = time.perf_counter()
+        for master_id in master_ids:
+            for start_ts, end_ts in slot_times:
+                if not query.exec(ROW_INSERT_SQL.format(int(master_id), start_ts, end_ts)):
+                    raise RuntimeError(query.lastError().text())
+        elapsed = (time.perf_counter() - started) * 1000
+        return len(master_ids) * len(slot_times), elapsed
+    finally:
+        db.rollback()
+
+
+def bench_generate(db, masters, days):
+    db.transaction()
+    try:
+        seed_masters(db, masters)
+        started = time.perf_counter()
+        created = fetch_all(db, GENERATE_SQL, [days])[0][0]
+        elapsed = (time.perf_counter() - started) * 1000
+        return created, elapsed
+    finally:
+        db.rollback()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Построчная вставка слотов против generate_schedule")
+    parser.add_argument("--masters", default="5,20,50", help="количество мастеров")
+    parser.add_argument("--days", type=int, default=28, help="горизонт расписания в днях")
+    args = parser.parse_args()
+
+    db = open_connection()
+    print(f"{'мастеров':>9} {'слотов':>8} {'построчно, мс':>14} {'generate, мс':>13}")
+    for masters in parse_sizes(args.masters):
+        rows, per_row_ms = bench_per_row(db, masters, args.days)
+        created, generate_ms = bench_generate(db, masters, args.days)
+        if created != rows:
+            print(f"предупреждение: создано {created} слотов вместо {rows}")
+        print(f"{masters:>9} {rows:>8} {per_row_ms:>14.1f} {generate_ms:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
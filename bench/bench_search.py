@@ -0,0 +1,123 @@
+import argparse
+
+from common import open_connection, parse_sizes, run, time_query
+
+SERVICES_PER_SALON = 50
+
+SEARCHES = ["массаж", "спорт", "салон 77", "пилинг аппар"]
+
+LEGACY_SQL = (
+    "SELECT srv.name AS service_name, salons.name AS salon_name, salons.city AS city, "
+    "       COALESCE(ss.price, srv.base_price) AS price, "
+    "       salons.id AS salon_id, srv.id AS service_id "
+    "FROM salon_services ss "
+    "JOIN salons ON salons.id = ss.salon_id "
+    "JOIN services srv ON srv.id = ss.service_id "
+    "WHERE (srv.name ILIKE ? OR salons.name ILIKE ?) "
+    "ORDER BY salons.city, salons.name, srv.name "
+    "LIMIT 101"
+)
+
+RANKED_SQL = (
+    "SELECT srv.name AS service_name, salons.name AS salon_name, salons.city AS city, "
+    "       COALESCE(ss.price, srv.base_price) AS price, "
+    "       salons.id AS salon_id, srv.id AS service_id, "
+    "       GREATEST(COALESCE(srv_rank.rank, 0), COALESCE(salon_rank.rank, 0)) AS search_rank "
+    "FROM salon_services ss "
+    "JOIN salons ON salons.id = ss.salon_id "
+    "JOIN services srv ON srv.id = ss.service_id "
+    "LEFT JOIN ("
+    "    SELECT id, GREATEST(ts_rank(search_tsv, to_tsquery('russian', ?)), "
+    "                        similarity(name, ?))::FLOAT8 AS rank "
+    "    FROM services WHERE search_tsv @@ to_tsquery('russian', ?) OR name ILIKE ?"
+    ") srv_rank ON srv_rank.id = ss.service_id "
+    "LEFT JOIN ("
+    "    SELECT id, GREATEST(ts_rank(search_tsv, to_tsquery('russian', ?)), "
+    "                        similarity(name, ?))::FLOAT8 AS rank "
+    "    FROM salons WHERE search_tsv @@ to_tsquery('russian', ?) OR name ILIKE ?"
+    ") salon_rank ON salon_rank.id = ss.salon_id "
+    "WHERE (ss.service_id = ANY (ARRAY("
+    "    SELECT id FROM services WHERE search_tsv @@ to_tsquery('russian', ?) OR name ILIKE ?"
+    ")) OR ss.salon_id = ANY (ARRAY("
+    "    SELECT id FROM salons WHERE search_tsv @@ to_tsquery('russian', ?) OR name ILIKE ?"
+    "))) "
+    "ORDER BY search_rank DESC, salons.id, srv.id "
+    "LIMIT 101"
+)
+
+SEED_SERVICES_SQL = (
+    "INSERT INTO services(name, description, base_price, duration_min) "
+    "SELECT (ARRAY['Массаж','Пилинг','Маникюр','Педикюр','Обёртывание',"
+    "              'Стрижка','Окрашивание','Укладка','Чистка лица','Депиляция'])[1 + g % 10] "
+    "       || ' ' || "
+    "       (ARRAY['классический','спортивный','аппаратный','горячий','релакс',"
+    "              'экспресс','премиум','детский','мужской','восточный'])[1 + (g / 10) % 10] "
+    "       || ' ' || g, "
+    "       'Тестовая услуга', 1000 + g * 10, 60 "
+    "FROM generate_series(1, ?) AS g"
+)
+
+SEED_SALONS_SQL = (
+    "INSERT INTO salons(name, city, address) "
+    "SELECT 'Салон ' || g, 'Город ' || (g % 30), 'ул. Тестовая, ' || g "
+    "FROM generate_series(1, ?) AS g"
+)
+
+SEED_CATALOG_SQL = (
+    "INSERT INTO salon_services(salon_id, service_id, price) "
+    "SELECT s.id, v.id, CASE WHEN (s.id + v.id) % 3 = 0 THEN NULL ELSE 500 + (s.id * v.id) % 4000 END "
+    "FROM salons s CROSS JOIN services v "
+    "WHERE s.address LIKE 'ул. Тестовая, %' AND v.description = 'Тестовая услуга'"
+)
+
+
+def prefix_tsquery(text):
+    return " & ".join(f"{word}:*" for word in text.casefold().split())
+
+
+def bench_size(db, size, repeat):
+    salons = max(1, size // SERVICES_PER_SALON)
+    db.transaction()
+    try:
+        run(db, SEED_SERVICES_SQL, [SERVICES_PER_SALON])
+        run(db, SEED_SALONS_SQL, [salons])
+        run(db, SEED_CATALOG_SQL)
+        run(db, "ANALYZE salons")
+        run(db, "ANALYZE services")
+        run(db, "ANALYZE salon_services")
+
+        results = []
+        for text in SEARCHES:
+            pattern = f"%{text}%"
+            ts_query = prefix_tsquery(text)
+            legacy = time_query(db, LEGACY_SQL, [pattern, pattern], repeat)
+            rank_params = [ts_query, text, ts_query, pattern]
+            ranked = time_query(
+                db,
+                RANKED_SQL,
+                rank_params + rank_params + [ts_query, pattern, ts_query, pattern],
+                repeat,
+            )
+            results.append((text, legacy, ranked))
+        return results
+    finally:
+        db.rollback()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Задержка поиска по каталогу в зависимости от размера каталога")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="размеры каталога (строк salon_services)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    db = open_connection()
+    print(f"{'строк':>9}  {'запрос':<14} {'ILIKE, мс':>10} {'индекс, мс':>11}")
+    for size in parse_sizes(args.sizes):
+        for text, legacy, ranked in bench_size(db, size, args.repeat):
+            print(
+                f"{size:>9}  {text:<14} {legacy['median_ms']:>10.2f} {ranked['median_ms']:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import random
+import threading
+import time
+
+from PySide6.QtSql import QSqlDatabase, QSqlQuery
+
+from common import fetch_all, open_connection, parse_sizes, run
+from db import create_connection
+
+SEED_SALON_SQL = (
+    "INSERT INTO salons(name, city, address) "
+    "VALUES ('Салон нагрузки', 'Город 0', 'ул. Тестовая, 0') RETURNING id"
+)
+
+SEED_MASTERS_SQL = (
+    "INSERT INTO masters(salon_id, full_name, specialization) "
+    "SELECT ?, 'Мастер ' || g, 'Тест' FROM generate_series(1, ?) AS g"
+)
+
+MASTERS_SQL = "SELECT id FROM masters WHERE salon_id = ? ORDER BY id"
+
+INSERT_SQL = (
+    "INSERT INTO schedule_slots(master_id, start_ts, end_ts) "
+    "VALUES ({master_id}, date_trunc('day', now()) + INTERVAL '2000 days' + {offset} * INTERVAL '30 minutes', "
+    "        date_trunc('day', now()) + INTERVAL '2000 days' + ({offset} + 2) * INTERVAL '30 minutes')"
+)
+
+PARTITIONS_SQL = (
+    "SELECT create_schedule_partitions((now() + INTERVAL '2000 days')::DATE, "
+    "                                  (now() + INTERVAL '2001 days' + ? * INTERVAL '30 minutes')::DATE)"
+)
+
+OVERLAPS_SQL = (
+    "SELECT count(*) FROM schedule_slots s "
+    "JOIN schedule_slots o ON o.master_id = s.master_id AND o.id > s.id "
+    " AND tstzrange(s.start_ts, s.end_ts, '[)') && tstzrange(o.start_ts, o.end_ts, '[)') "
+    "WHERE s.master_id IN (SELECT id FROM masters WHERE salon_id = ?)"
+)
+
+REJECTED_SQLSTATES = {"23P01", "23514"}
+
+
+def writer(index, master_ids, attempts, horizon, results):
+    name = f"smart_spa_bench_writer_{index}"
+    db = create_connection(name)
+    if not db.open():
+        results[index] = (0, 0, db.lastError().text())
+        return
+    rng = random.Random(index)
+    inserted = 0
+    conflicts = 0
+    error_text = ""
+    query = QSqlQuery(db)
+    for _ in range(attempts):
+        sql = INSERT_SQL.format(master_id=int(rng.choice(master_ids)), offset=rng.randrange(horizon))
+        if query.exec(sql):
+            inserted += 1
+        elif query.lastError().nativeErrorCode() in REJECTED_SQLSTATES:
+            conflicts += 1
+        else:
+            error_text = query.lastError().text()
+            break
+    del query
+    db.close()
+    del db
+    QSqlDatabase.removeDatabase(name)
+    results[index] = (inserted, conflicts, error_text)
+
+
+def bench_writers(db, salon_id, master_ids, writers, attempts, horizon):
+    run(db, "DELETE FROM schedule_slots WHERE master_id IN (SELECT id FROM masters WHERE salon_id = ?)", [salon_id])
+    results = [None] * writers
+    threads = [
+        threading.Thread(target=writer, args=(index, master_ids, attempts, horizon, results))
+        for index in range(writers)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    for _, _, error_text in results:
+        if error_text:
+            raise RuntimeError(error_text)
+    inserted = sum(item[0] for item in results)
+    conflicts = sum(item[1] for item in results)
+    overlaps = fetch_all(db, OVERLAPS_SQL, [salon_id])[0][0]
+    return inserted, conflicts, overlaps, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пропускная способность вставки слотов при параллельных писателях")
+    parser.add_argument("--writers", default="1,2,4,8", help="количество параллельных соединений")
+    parser.add_argument("--attempts", type=int, default=2000, help="попыток вставки на писателя")
+    parser.add_argument("--masters", type=int, default=20)
+    parser.add_argument("--horizon", type=int, default=4000, help="число получасовых позиций для случайного старта")
+    args = parser.parse_args()
+
+    db = open_connection()
+    salon_id = fetch_all(db, SEED_SALON_SQL)[0][0]
+    try:
+        run(db, SEED_MASTERS_SQL, [salon_id, args.masters])
+        master_ids = [row[0] for row in fetch_all(db, MASTERS_SQL, [salon_id])]
+        run(db, PARTITIONS_SQL, [args.horizon])
+        print(f"{'писателей':>10} {'вставлено':>10} {'конфликтов':>11} {'пересечений':>12} {'вставок/с':>10}")
+        for writers in parse_sizes(args.writers):
+            inserted, conflicts, overlaps, elapsed = bench_writers(
+                db, salon_id, master_ids, writers, args.attempts, args.horizon
+            )
+            rate = (inserted + conflicts) / elapsed if elapsed else 0.0
+            print(f"{writers:>10} {inserted:>10} {conflicts:>11} {overlaps:>12} {rate:>10.0f}")
+    finally:
+        run(db, "DELETE FROM salons WHERE id = ?", [salon_id])
+
+
+if __name__ == "__main__":
+    main()
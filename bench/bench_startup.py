@@ -0,0 +1,147 @@
+import argparse
+import datetime
+import json
+import os
+import runpy
+import subprocess
+import sys
+import time
+
+from common import ROOT, fetch_all, open_connection, summarize
+
+from ui_forms import RUNTIME_UI_ENV
+
+CLIENT_SQL = (
+    "SELECT u.phone FROM users u JOIN roles r ON r.id = u.role_id "
+    "WHERE r.code = 'client' AND u.phone IS NOT NULL ORDER BY u.id LIMIT 1"
+)
+STAGES = ("login_window_ms", "first_catalog_ms", "login_to_catalog_ms")
+
+
+def run_app(user, launched_at):
+    from PySide6.QtCore import QEvent, QObject, QTimer
+    from PySide6.QtWidgets import QApplication, QLineEdit, QPushButton
+
+    marks = {}
+
+    def elapsed_ms():
+        return (time.time() - launched_at) * 1000
+
+    def submit_login(window):
+        button = window.findChild(QPushButton, "btnLogin")
+        if not button.isEnabled():
+            QTimer.singleShot(5, lambda: submit_login(window))
+            return
+        window.findChild(QLineEdit, "leUsername").setText(user)
+        marks["login_submitted_ms"] = elapsed_ms()
+        button.click()
+
+    class StartupProbe(QObject):
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Paint:
+                self.on_paint(watched)
+            return False
+
+        def on_paint(self, widget):
+            if "login_window_ms" not in marks:
+                if widget.objectName() == "LoginWindow":
+                    marks["login_window_ms"] = elapsed_ms()
+                    QTimer.singleShot(0, lambda: submit_login(widget))
+                return
+            table = widget.parent()
+            if table is None or table.objectName() != "tblCatalog":
+                return
+            model = table.model()
+            if model is None or model.rowCount() == 0:
+                return
+            marks["first_catalog_ms"] = elapsed_ms()
+            marks["login_to_catalog_ms"] = marks["first_catalog_ms"] - marks["login_submitted_ms"]
+            QApplication.instance().removeEventFilter(self)
+            print(json.dumps(marks), flush=True)
+            QApplication.instance().exit(0)
+
+    probe = StartupProbe()
+    app_exec = QApplication.exec
+
+    def exec_with_probe(app):
+        app.installEventFilter(probe)
+        return app_exec()
+
+    QApplication.exec = exec_with_probe
+    os.chdir(ROOT)
+    try:
+        runpy.run_path(os.path.join(ROOT, "main.py"), run_name="__main__")
+    except SystemExit as error:
+        if error.code:
+            raise
+
+
+def measure(user, runtime_ui, timeout):
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env.pop(RUNTIME_UI_ENV, None)
+    if runtime_ui:
+        env[RUNTIME_UI_ENV] = "1"
+    command = [sys.executable, os.path.abspath(__file__), "--app", user, "--launched-at", repr(time.time())]
+    try:
+        result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise SystemExit(f"Приложение не показало каталог за {timeout} с")
+    lines = [line for line in result.stdout.splitlines() if line.startswith("{")]
+    if result.returncode != 0 or not lines:
+        raise SystemExit(f"Запуск приложения завершился с ошибкой:\n{result.stderr}")
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время запуска приложения до окна входа и до первой страницы каталога")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=1, help="сколько первых запусков не учитывать")
+    parser.add_argument("--user", help="логин клиента; по умолчанию первый клиент в базе")
+    parser.add_argument("--runtime-ui", action="store_true", help="загружать .ui через QUiLoader вместо модулей")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="сохранить результаты в JSON")
+    parser.add_argument("--app", help=argparse.SUPPRESS)
+    parser.add_argument("--launched-at", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.app:
+        run_app(args.app, args.launched_at)
+        return
+
+    user = args.user
+    if not user:
+        rows = fetch_all(open_connection(), CLIENT_SQL)
+        if not rows:
+            raise SystemExit("Нет клиентов для входа: запустите generate_data.py или укажите --user")
+        user = rows[0][0]
+
+    for _ in range(args.warmup):
+        measure(user, args.runtime_ui, args.timeout)
+    runs = [measure(user, args.runtime_ui, args.timeout) for _ in range(args.repeat)]
+    results = {stage: summarize([run[stage] for run in runs]) for stage in STAGES}
+
+    print(f"{'этап':<22} {'p50, мс':>8} {'p95, мс':>8} {'max, мс':>8}")
+    for stage, stats in results.items():
+        print(
+            f"{stage:<22} {stats['median_ms']:>8.1f} {stats['p95_ms']:>8.1f} "
+            f"{max(run[stage] for run in runs):>8.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "recorded_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                    "ui": "runtime" if args.runtime_ui else "compiled",
+                    "repeat": args.repeat,
+                    "results": results,
+                },
+                handle,
+                ensure_ascii=False,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from PySide6.QtCore import QCoreApplication
+from PySide6.QtSql import QSqlQuery
+
+from db import create_connection
+
+_app = None
+
+
+def open_connection(name="smart_spa_bench"):
+    global _app
+    if QCoreApplication.instance() is None:
+        _app = QCoreApplication(sys.argv[:1])
+    try:
+        db = create_connection(name)
+    except ConnectionError as error:
+        raise SystemExit(str(error))
+    if not db.open():
+        raise SystemExit(f"Не удалось подключиться к БД: {db.lastError().text()}")
+    return db
+
+
+def run(db, sql, params=None):
+    query = QSqlQuery(db)
+    query.setForwardOnly(True)
+    if params:
+        query.prepare(sql)
+        for value in params:
+            query.addBindValue(value)
+        ok = query.exec()
+    else:
+        ok = query.exec(sql)
+    if not ok:
+        raise RuntimeError(f"{query.lastError().text()}\n{sql}")
+    return query
+
+
+def fetch_all(db, sql, params=None):
+    query = run(db, sql, params)
+    rows = []
+    while query.next():
+        rows.append([query.value(i) for i in range(query.record().count())])
+    return rows
+
+
+def time_query(db, sql, params=None, repeat=20):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        query = run(db, sql, params)
+        while query.next():
+            pass
+        timings.append((time.perf_counter() - started) * 1000)
+    return summarize(timings)
+
+
+def summarize(timings):
+    ordered = sorted(timings)
+    p95_index = min(len(ordered) - 1, int(round(len(ordered) * 0.95)) - 1)
+    p99_index = min(len(ordered) - 1, int(round(len(ordered) * 0.99)) - 1)
+    return {
+        "median_ms": statistics.median(ordered),
+        "p95_ms": ordered[max(p95_index, 0)],
+        "p99_ms": ordered[max(p99_index, 0)],
+        "count": len(ordered),
+    }
+
+
+def parse_sizes(text):
+    return [int(part) for part in text.split(",") if part.strip()]
@@ -0,0 +1,266 @@
+import argparse
+import csv
+import datetime
+import io
+import os
+import random
+import subprocess
+import time
+
+from common import fetch_all, open_connection, run
+from db import DB_SETTINGS, SESSION_SETTINGS
+
+SERVICE_KINDS = [
+    "Массаж", "Пилинг", "Маникюр", "Педикюр", "Обёртывание",
+    "Стрижка", "Окрашивание", "Укладка", "Чистка лица", "Депиляция",
+]
+SERVICE_STYLES = [
+    "классический", "спортивный", "аппаратный", "горячий", "релакс",
+    "экспресс", "премиум", "детский", "мужской", "восточный",
+]
+SPECIALIZATIONS = ["Массаж", "Косметология", "Ногтевой сервис", "Парикмахер", "SPA-терапия"]
+FIRST_NAMES = ["Анна", "Мария", "Елена", "Ольга", "Ирина", "Иван", "Пётр", "Алексей", "Дмитрий", "Сергей"]
+LAST_NAMES = ["Иванова", "Петрова", "Смирнова", "Кузнецова", "Попова", "Соколова", "Лебедева", "Козлова"]
+REVIEW_STATUSES = ("одобрен", "на модерации", "отклонён")
+REVIEW_COMMENTS = ["Отлично", "Всё понравилось", "Приду ещё", "Нормально", "Долго ждала", "Не понравилось"]
+SLOT_HOURS = range(10, 18)
+DURATIONS = (30, 45, 60)
+
+TABLES = ("users", "salons", "masters", "services", "schedule_slots", "appointments", "reviews")
+
+
+def psql_command(args, sql):
+    return [
+        args.psql,
+        "-h", str(DB_SETTINGS["host"]),
+        "-p", str(DB_SETTINGS["port"]),
+        "-U", str(DB_SETTINGS["user"]),
+        "-d", str(DB_SETTINGS["database"]),
+        "-v", "ON_ERROR_STOP=1",
+        "-q",
+        "-c", sql,
+    ]
+
+
+def copy_rows(args, table, columns, rows):
+    env = dict(os.environ)
+    env["PGPASSWORD"] = str(DB_SETTINGS["password"])
+    env["PGOPTIONS"] = " ".join(f"-c {name}={value}" for name, value in SESSION_SETTINGS.items())
+    sql = f"\\copy {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    started = time.perf_counter()
+    process = subprocess.Popen(psql_command(args, sql), stdin=subprocess.PIPE, env=env)
+    stream = io.TextIOWrapper(process.stdin, encoding="utf-8", newline="")
+    writer = csv.writer(stream)
+    count = 0
+    try:
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        stream.close()
+    except BrokenPipeError:
+        pass
+    if process.wait() != 0:
+        raise SystemExit(f"COPY в {table} завершился с ошибкой")
+    print(f"{table:<16} {count:>10} строк  {time.perf_counter() - started:>7.1f} с")
+    return count
+
+
+def next_ids(db):
+    return {
+        table: int(fetch_all(db, f"SELECT COALESCE(max(id), 0) FROM {table}")[0][0]) + 1
+        for table in TABLES
+    }
+
+
+def sync_sequences(db):
+    for table in TABLES:
+        run(
+            db,
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"GREATEST((SELECT max(id) FROM {table}), 1))",
+        )
+
+
+def generate(args):
+    rng = random.Random(args.seed)
+    db = open_connection()
+    ids = next_ids(db)
+    client_role = fetch_all(db, "SELECT id FROM roles WHERE code = 'client'")[0][0]
+
+    clients = list(range(ids["users"], ids["users"] + args.clients))
+    copy_rows(
+        args,
+        "users",
+        ["id", "full_name", "phone", "email", "password_hash", "role_id"],
+        (
+            (
+                user_id,
+                f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {user_id}",
+                f"+7{9000000000 + user_id}",
+                f"client{user_id}@example.com",
+                "hash",
+                client_role,
+            )
+            for user_id in clients
+        ),
+    )
+
+    salons = list(range(ids["salons"], ids["salons"] + args.salons))
+    copy_rows(
+        args,
+        "salons",
+        ["id", "name", "city", "address"],
+        (
+            (salon_id, f"Салон {salon_id}", f"Город {salon_id % args.cities}", f"ул. Генераторная, {salon_id}")
+            for salon_id in salons
+        ),
+    )
+
+    masters = []
+    master_id = ids["masters"]
+    for salon_id in salons:
+        for _ in range(args.masters_per_salon):
+            masters.append((master_id, salon_id))
+            master_id += 1
+    copy_rows(
+        args,
+        "masters",
+        ["id", "salon_id", "full_name", "specialization"],
+        (
+            (master_id, salon_id, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", rng.choice(SPECIALIZATIONS))
+            for master_id, salon_id in masters
+        ),
+    )
+
+    services = list(range(ids["services"], ids["services"] + args.services))
+    copy_rows(
+        args,
+        "services",
+        ["id", "name", "description", "base_price", "duration_min"],
+        (
+            (
+                service_id,
+                f"{SERVICE_KINDS[service_id % 10]} {SERVICE_STYLES[(service_id // 10) % 10]} {service_id}",
+                "Сгенерированная услуга",
+                500 + (service_id * 37) % 5000,
+                DURATIONS[service_id % len(DURATIONS)],
+            )
+            for service_id in services
+        ),
+    )
+
+    offers = {
+        salon_id: rng.sample(services, min(args.services_per_salon, len(services)))
+        for salon_id in salons
+    }
+    copy_rows(
+        args,
+        "salon_services",
+        ["salon_id", "service_id", "price"],
+        (
+            (salon_id, service_id, None if rng.random() < 0.3 else 500 + rng.randrange(4000))
+            for salon_id, offered in offers.items()
+            for service_id in offered
+        ),
+    )
+
+    today = datetime.date.today()
+    first_day = today - datetime.timedelta(days=args.months * 30)
+    days = [first_day + datetime.timedelta(days=offset) for offset in range(args.months * 30 + args.ahead_days)]
+    now = datetime.datetime.now()
+    run(
+        db,
+        "SELECT create_schedule_partitions(?::DATE, ?::DATE)",
+        [days[0].isoformat(), (days[-1] + datetime.timedelta(days=1)).isoformat()],
+    )
+    appointments = []
+    reviews = []
+    counters = {"slot": ids["schedule_slots"], "appointment": ids["appointments"], "review": ids["reviews"]}
+
+    def slot_rows():
+        for master_id, salon_id in masters:
+            for day in days:
+                for hour in SLOT_HOURS:
+                    start = datetime.datetime.combine(day, datetime.time(hour))
+                    slot_id = counters["slot"]
+                    counters["slot"] += 1
+                    booked = False
+                    if rng.random() < args.booked_share:
+                        status = book_status(rng, start < now)
+                        booked = status != "отменена"
+                        appointment_id = counters["appointment"]
+                        counters["appointment"] += 1
+                        client_id = rng.choice(clients)
+                        appointments.append(
+                            (
+                                appointment_id, client_id, salon_id, master_id,
+                                rng.choice(offers[salon_id]), slot_id, status,
+                                start - datetime.timedelta(days=rng.randrange(1, 14)), start,
+                            )
+                        )
+                        if status == "завершена" and rng.random() < args.review_share:
+                            reviews.append(
+                                (
+                                    counters["review"], salon_id, client_id, appointment_id,
+                                    rng.choices(range(1, 6), weights=(1, 1, 2, 4, 6))[0],
+                                    rng.choice(REVIEW_COMMENTS),
+                                    rng.choices(REVIEW_STATUSES, weights=(85, 10, 5))[0],
+                                    start + datetime.timedelta(hours=rng.randrange(2, 72)),
+                                )
+                            )
+                            counters["review"] += 1
+                    yield (
+                        slot_id, master_id, start.isoformat(sep=" "),
+                        (start + datetime.timedelta(hours=1)).isoformat(sep=" "), booked,
+                    )
+
+    copy_rows(args, "schedule_slots", ["id", "master_id", "start_ts", "end_ts", "is_booked"], slot_rows())
+    copy_rows(
+        args,
+        "appointments",
+        ["id", "client_id", "salon_id", "master_id", "service_id", "slot_id", "status", "created_at", "slot_start_ts"],
+        ((*row[:7], row[7].isoformat(sep=" "), row[8].isoformat(sep=" ")) for row in appointments),
+    )
+    copy_rows(
+        args,
+        "reviews",
+        ["id", "salon_id", "client_id", "appointment_id", "rating", "comment", "status", "created_at"],
+        ((*row[:7], row[7].isoformat(sep=" ")) for row in reviews),
+    )
+
+    sync_sequences(db)
+    for table in TABLES + ("salon_services", "catalog_flat", "salon_rating_stats"):
+        run(db, f"ANALYZE {table}")
+
+
+def book_status(rng, past):
+    if rng.random() < 0.1:
+        return "отменена"
+    if past:
+        return "завершена"
+    return "подтверждена" if rng.random() < 0.7 else "ожидает подтверждения"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерация синтетической сети салонов через COPY")
+    parser.add_argument("--cities", type=int, default=30)
+    parser.add_argument("--salons", type=int, default=200)
+    parser.add_argument("--masters-per-salon", type=int, default=5)
+    parser.add_argument("--services", type=int, default=100)
+    parser.add_argument("--services-per-salon", type=int, default=30)
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--months", type=int, default=3, help="месяцев истории расписания")
+    parser.add_argument("--ahead-days", type=int, default=30, help="дней расписания вперёд")
+    parser.add_argument("--booked-share", type=float, default=0.35, help="доля слотов с записью")
+    parser.add_argument("--review-share", type=float, default=0.3, help="доля завершённых визитов с отзывом")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--psql", default="psql", help="путь к psql")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    generate(args)
+    print(f"готово за {time.perf_counter() - started:.1f} с")
+
+
+if __name__ == "__main__":
+    main()
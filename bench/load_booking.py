@@ -0,0 +1,176 @@
+import argparse
+import threading
+import time
+
+from PySide6.QtSql import QSqlDatabase, QSqlQuery
+
+from common import fetch_all, open_connection, parse_sizes, run, summarize
+from db import create_connection
+
+RETRY_SQLSTATES = {"40001", "40P01", "55P03"}
+SLOT_TAKEN_SQLSTATE = "P0001"
+
+SEED_SALON_SQL = (
+    "INSERT INTO salons(name, city, address) "
+    "VALUES ('Салон нагрузки', 'Город 0', 'ул. Тестовая, 0') RETURNING id"
+)
+SEED_MASTERS_SQL = (
+    "INSERT INTO masters(salon_id, full_name, specialization) "
+    "SELECT ?, 'Мастер ' || g, 'Тест' FROM generate_series(1, ?) AS g"
+)
+SEED_SERVICE_SQL = (
+    "INSERT INTO services(name, description, base_price, duration_min) "
+    "VALUES ('Нагрузочная услуга', 'Тестовая услуга', 1000, 60) RETURNING id"
+)
+SEED_CLIENT_SQL = (
+    "INSERT INTO users(full_name, phone, email, password_hash, role_id) "
+    "VALUES ('Нагрузочный клиент', '+70000000000', NULL, 'hash', "
+    "        (SELECT id FROM roles WHERE code = 'client')) RETURNING id"
+)
+SCHEDULE_SQL = (
+    "SELECT generate_schedule(m.id, CURRENT_DATE + 1, CURRENT_DATE + ?::INTEGER) "
+    "FROM masters m WHERE m.salon_id = ?"
+)
+RESET_SQL = (
+    "DELETE FROM appointments WHERE salon_id = {salon}; "
+    "UPDATE schedule_slots SET is_booked = FALSE "
+    "WHERE master_id IN (SELECT id FROM masters WHERE salon_id = {salon})"
+)
+
+FIRST_AVAILABLE_SQL = "SELECT appointment_id FROM book_first_available({client}, {salon}, {service})"
+NEXT_SLOT_SQL = (
+    "SELECT slot_id, master_id FROM next_free_slots({salon}, {service}, 1) "
+    "ORDER BY start_ts, master_id LIMIT 1"
+)
+BOOK_SLOT_SQL = "SELECT book_appointment({client}, {salon}, {master}, {service}, {slot})"
+
+
+def book_first_available(query, ids):
+    if not query.exec(FIRST_AVAILABLE_SQL.format(**ids)):
+        return None, query.lastError().nativeErrorCode(), query.lastError().text()
+    return query.next(), "", ""
+
+
+def book_listed_slot(query, ids):
+    if not query.exec(NEXT_SLOT_SQL.format(**ids)):
+        return None, query.lastError().nativeErrorCode(), query.lastError().text()
+    if not query.next():
+        return False, "", ""
+    slot_id = int(query.value(0))
+    master_id = int(query.value(1))
+    if not query.exec(BOOK_SLOT_SQL.format(master=master_id, slot=slot_id, **ids)):
+        return None, query.lastError().nativeErrorCode(), query.lastError().text()
+    return True, "", ""
+
+
+MODES = {
+    "first": book_first_available,
+    "list": book_listed_slot,
+}
+
+
+def booker(index, mode, ids, bookings, max_attempts, results):
+    name = f"smart_spa_bench_booker_{index}"
+    db = create_connection(name)
+    if not db.open():
+        results[index] = ([], 0, 0, db.lastError().text())
+        return
+    query = QSqlQuery(db)
+    query.exec("SET lock_timeout = '2s'")
+    book = MODES[mode]
+    latencies = []
+    retries = 0
+    failures = 0
+    error_text = ""
+    for _ in range(bookings):
+        started = time.perf_counter()
+        for attempt in range(max_attempts):
+            booked, error_code, error_text = book(query, ids)
+            if booked:
+                latencies.append((time.perf_counter() - started) * 1000)
+                break
+            if booked is False:
+                failures += 1
+                break
+            if error_code not in RETRY_SQLSTATES and error_code != SLOT_TAKEN_SQLSTATE:
+                break
+            error_text = ""
+            retries += 1
+        else:
+            failures += 1
+        if error_text:
+            break
+    del query
+    db.close()
+    del db
+    QSqlDatabase.removeDatabase(name)
+    results[index] = (latencies, retries, failures, error_text)
+
+
+def run_load(db, mode, ids, bookers, bookings, max_attempts):
+    for statement in RESET_SQL.format(salon=ids["salon"]).split("; "):
+        run(db, statement)
+    results = [None] * bookers
+    threads = [
+        threading.Thread(target=booker, args=(index, mode, ids, bookings, max_attempts, results))
+        for index in range(bookers)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = []
+    retries = 0
+    failures = 0
+    for item_latencies, item_retries, item_failures, error_text in results:
+        if error_text:
+            raise RuntimeError(error_text)
+        latencies.extend(item_latencies)
+        retries += item_retries
+        failures += item_failures
+    stats = summarize(latencies) if latencies else {"median_ms": 0.0, "p99_ms": 0.0, "count": 0}
+    return stats, retries, failures, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест параллельной записи клиентов")
+    parser.add_argument("--bookers", default="1,4,8,16", help="количество параллельных клиентов")
+    parser.add_argument("--bookings", type=int, default=50, help="записей на клиента")
+    parser.add_argument("--masters", type=int, default=10)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--attempts", type=int, default=20, help="максимум попыток на одну запись")
+    parser.add_argument("--modes", default="list,first", help="list — выбор из списка слотов, first — book_first_available")
+    args = parser.parse_args()
+
+    db = open_connection()
+    salon_id = fetch_all(db, SEED_SALON_SQL)[0][0]
+    service_id = fetch_all(db, SEED_SERVICE_SQL)[0][0]
+    client_id = fetch_all(db, SEED_CLIENT_SQL)[0][0]
+    try:
+        run(db, SEED_MASTERS_SQL, [salon_id, args.masters])
+        run(db, "INSERT INTO salon_services(salon_id, service_id) VALUES (?, ?)", [salon_id, service_id])
+        run(db, SCHEDULE_SQL, [args.days, salon_id])
+        ids = {"client": int(client_id), "salon": int(salon_id), "service": int(service_id)}
+
+        print(f"{'режим':<6} {'клиентов':>9} {'записей':>8} {'повторов':>9} {'отказов':>8} "
+              f"{'записей/с':>10} {'p50, мс':>8} {'p99, мс':>8}")
+        for mode in [item.strip() for item in args.modes.split(",") if item.strip()]:
+            for bookers in parse_sizes(args.bookers):
+                stats, retries, failures, elapsed = run_load(
+                    db, mode, ids, bookers, args.bookings, args.attempts
+                )
+                rate = stats["count"] / elapsed if elapsed else 0.0
+                print(f"{mode:<6} {bookers:>9} {stats['count']:>8} {retries:>9} {failures:>8} "
+                      f"{rate:>10.0f} {stats['median_ms']:>8.1f} {stats['p99_ms']:>8.1f}")
+    finally:
+        run(db, "DELETE FROM appointments WHERE salon_id = ?", [salon_id])
+        run(db, "DELETE FROM salons WHERE id = ?", [salon_id])
+        run(db, "DELETE FROM services WHERE id = ?", [service_id])
+        run(db, "DELETE FROM users WHERE id = ?", [client_id])
+
+
+if __name__ == "__main__":
+    main()
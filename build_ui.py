@@ -0,0 +1,46 @@
+import ast
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ElementTree
+
+from ui_forms import FORM_BASES, UI_DIR, module_name, source_digest
+
+
+def prune_imports(code):
+    tree = ast.parse(code)
+    used = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+    lines = code.splitlines()
+    for node in reversed(tree.body):
+        if not isinstance(node, ast.ImportFrom):
+            continue
+        names = [alias.name for alias in node.names if alias.name in used]
+        replacement = [f"from {node.module} import {', '.join(names)}"] if names else []
+        lines[node.lineno - 1:node.end_lineno] = replacement
+    return "\n".join(lines)
+
+
+def compile_form(path, uic="pyside6-uic"):
+    name = os.path.splitext(os.path.basename(path))[0]
+    base = ElementTree.parse(path).getroot().find("widget").get("class")
+    if base not in FORM_BASES:
+        raise SystemExit(f"{path}: неподдерживаемый корневой виджет {base}")
+    code = subprocess.run([uic, path], capture_output=True, text=True, check=True).stdout
+    code = prune_imports(code)
+    target = os.path.join(UI_DIR, f"{module_name(name)}.py")
+    with open(target, "w", encoding="utf-8") as handle:
+        handle.write(code.rstrip() + "\n\n")
+        handle.write(f'FORM_BASE = "{base}"\n')
+        handle.write(f'SOURCE_DIGEST = "{source_digest(path)}"\n')
+    return target
+
+
+def main():
+    uic = sys.argv[1] if len(sys.argv) > 1 else "pyside6-uic"
+    for file_name in sorted(os.listdir(UI_DIR)):
+        if file_name.endswith(".ui"):
+            print(compile_form(os.path.join(UI_DIR, file_name), uic))
+
+
+if __name__ == "__main__":
+    main()
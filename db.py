@@ -1,27 +1,271 @@
+import configparser
+import os
+import threading
+import time
+
 from PySide6.QtSql import QSqlDatabase, QSqlQuery
 from PySide6.QtWidgets import QMessageBox
 
+DB_DEFAULTS = {
+    "driver": "QPSQL",
+    "host": "localhost",
+    "database": "smart_spa",
+    "user": "postgres",
+    "password": None,
+    "port": 5432,
+    "connect_timeout": 5,
+    "pool_min": 1,
+    "pool_max": 4,
+    "pool_timeout": 10.0,
+    "health_check_interval": 30.0,
+    "partition_months_ahead": 3,
+    "partition_keep_months": 0,
+    "slow_query_ms": 300.0,
+    "slow_query_log": "logs/slow_queries.log",
+    "metrics_file": "logs/metrics.json",
+}
+
+DB_CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "db.ini")
+DB_CONFIG_SECTION = "database"
+DB_ENV_PREFIX = "SMART_SPA_DB_"
+
+SESSION_SETTINGS = {
+    "search_path": "smart_spa,public",
+    "client_min_messages": "warning",
+}
+
+
+def load_settings(config_path=None, environ=None):
+    environ = os.environ if environ is None else environ
+    settings = dict(DB_DEFAULTS)
+
+    parser = configparser.ConfigParser()
+    parser.read(config_path or environ.get(DB_ENV_PREFIX + "CONFIG", DB_CONFIG_FILE), encoding="utf-8")
+    if parser.has_section(DB_CONFIG_SECTION):
+        for key, value in parser.items(DB_CONFIG_SECTION):
+            if key in settings:
+                settings[key] = value
+
+    for key in settings:
+        value = environ.get(DB_ENV_PREFIX + key.upper())
+        if value is not None:
+            settings[key] = value
+
+    for key, default in DB_DEFAULTS.items():
+        if isinstance(default, (int, float)):
+            settings[key] = type(default)(settings[key])
+    return settings
+
+
+DB_SETTINGS = load_settings()
+
+
+def create_connection(name=None, settings=None):
+    settings = settings or DB_SETTINGS
+    if settings["password"] is None:
+        raise ConnectionError(
+            f"Не задан пароль БД: укажите password в секции [{DB_CONFIG_SECTION}] файла "
+            f"{os.path.basename(DB_CONFIG_FILE)} или переменную окружения {DB_ENV_PREFIX}PASSWORD."
+        )
+    if name is None:
+        db = QSqlDatabase.addDatabase(settings["driver"])
+    else:
+        db = QSqlDatabase.addDatabase(settings["driver"], name)
+    db.setHostName(settings["host"])
+    db.setDatabaseName(settings["database"])
+    db.setUserName(settings["user"])
+    db.setPassword(settings["password"])
+    db.setPort(settings["port"])
+    db.setConnectOptions(f"connect_timeout={settings['connect_timeout']};{session_options()}")
+    return db
+
+
+def session_options():
+    flags = " ".join(f"-c {name}={value}" for name, value in SESSION_SETTINGS.items())
+    return f"options='{flags}'"
+
+
+CONNECTION_LOST_SQLSTATES = {"57P01", "57P02", "57P03"}
+
+_close_listeners = []
+
+
+def add_close_listener(callback):
+    _close_listeners.append(callback)
+
+
+def close_connection(db):
+    for callback in _close_listeners:
+        callback(db.connectionName())
+    db.close()
+
+
+def connection_lost(db, error):
+    code = error.nativeErrorCode()
+    return code.startswith("08") or code in CONNECTION_LOST_SQLSTATES or not connection_alive(db)
+
+
+def connection_alive(db):
+    query = QSqlQuery(db)
+    return db.isOpen() and query.exec("SELECT 1")
+
+
+_checked_at = {}
+
+
+def ensure_connection(db, force=False):
+    name = db.connectionName()
+    now = time.monotonic()
+    if not force and now - _checked_at.get(name, 0.0) < DB_SETTINGS["health_check_interval"]:
+        return True
+    if not connection_alive(db):
+        close_connection(db)
+        if not db.open():
+            _checked_at.pop(name, None)
+            return False
+    _checked_at[name] = now
+    return True
+
+
+class PoolExhausted(RuntimeError):
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, min_size=None, max_size=None, prefix="smart_spa_pool", settings=None):
+        self._settings = settings or DB_SETTINGS
+        self._min_size = self._settings["pool_min"] if min_size is None else min_size
+        self._max_size = self._settings["pool_max"] if max_size is None else max_size
+        self._timeout = self._settings["pool_timeout"]
+        self._health_check_interval = self._settings["health_check_interval"]
+        self._prefix = prefix
+        self._slots = threading.BoundedSemaphore(self._max_size)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._idle = []
+        self._checked_at = {}
+        self._pids = {}
+
+    def connection_name(self):
+        return f"{self._prefix}_{threading.get_ident()}"
+
+    def acquire(self, timeout=None):
+        depth = getattr(self._local, "depth", 0)
+        name = self.connection_name()
+        if depth:
+            self._local.depth = depth + 1
+            return QSqlDatabase.database(name, False)
+
+        if not self._slots.acquire(timeout=self._timeout if timeout is None else timeout):
+            raise PoolExhausted(f"Нет свободных соединений с БД (максимум {self._max_size}).")
+        try:
+            db = self._checkout(name)
+        except Exception:
+            self._slots.release()
+            raise
+        self._local.depth = 1
+        return db
+
+    def release(self, db):
+        depth = getattr(self._local, "depth", 0)
+        if depth > 1:
+            self._local.depth = depth - 1
+            return
+        self._local.depth = 0
+        with self._lock:
+            keep = len(self._idle) < self._min_size
+            if keep:
+                self._idle.append(db.connectionName())
+        if not keep:
+            close_connection(db)
+        self._slots.release()
+
+    def connection(self, timeout=None):
+        return _PooledConnection(self, timeout)
+
+    def backend_pid(self, db):
+        return self._pids.get(db.connectionName())
+
+    def close_thread_connection(self):
+        name = self.connection_name()
+        with self._lock:
+            if name in self._idle:
+                self._idle.remove(name)
+        if QSqlDatabase.contains(name):
+            self._discard(name)
+
+    def reconnect(self, db):
+        close_connection(db)
+        return self._open(db)
+
+    def _checkout(self, name):
+        with self._lock:
+            if name in self._idle:
+                self._idle.remove(name)
+        if QSqlDatabase.contains(name):
+            db = QSqlDatabase.database(name, False)
+            if self._healthy(db):
+                return db
+            close_connection(db)
+        else:
+            db = create_connection(name, self._settings)
+        if not self._open(db):
+            raise ConnectionError(db.lastError().text() or "Не удалось подключиться к БД.")
+        return db
+
+    def _open(self, db):
+        if not db.open():
+            return False
+        query = QSqlQuery(db)
+        if query.exec("SELECT pg_backend_pid()") and query.next():
+            self._pids[db.connectionName()] = query.value(0)
+        self._checked_at[db.connectionName()] = time.monotonic()
+        return True
+
+    def _healthy(self, db):
+        if not db.isOpen():
+            return False
+        name = db.connectionName()
+        if time.monotonic() - self._checked_at.get(name, 0.0) < self._health_check_interval:
+            return True
+        if not connection_alive(db):
+            return False
+        self._checked_at[name] = time.monotonic()
+        return True
+
+    def _discard(self, name):
+        close_connection(QSqlDatabase.database(name, False))
+        self._pids.pop(name, None)
+        self._checked_at.pop(name, None)
+        QSqlDatabase.removeDatabase(name)
+
+
+class _PooledConnection:
+    def __init__(self, pool, timeout):
+        self._pool = pool
+        self._timeout = timeout
+        self._db = None
+
+    def __enter__(self):
+        self._db = self._pool.acquire(self._timeout)
+        return self._db
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._pool.release(self._db)
+        self._db = None
+        return False
+
+
 def connect_db():
-    db = QSqlDatabase.addDatabase("QPSQL")
-    db.setHostName("localhost")
-    db.setDatabaseName("smart_spa")
-    db.setUserName("postgres")
-    db.setPassword("23565471")
-    db.setPort(5432)
+    try:
+        db = create_connection()
+    except ConnectionError as error:
+        QMessageBox.critical(None, "Ошибка БД", str(error))
+        return False
 
     if not db.open():
         QMessageBox.critical(None, "Ошибка БД", db.lastError().text())
         return False
 
-    query = QSqlQuery()
-    if not query.exec("SET search_path TO smart_spa, public;"):
-        QMessageBox.warning(None, "Предупреждение БД", query.lastError().text())
-
-    suppress_notice_query = QSqlQuery()
-    if not suppress_notice_query.exec("SET client_min_messages TO warning;"):
-        QMessageBox.warning(
-            None,
-            "Предупреждение БД",
-            suppress_notice_query.lastError().text(),
-        )
+    _checked_at[db.connectionName()] = time.monotonic()
     return True
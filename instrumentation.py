@@ -0,0 +1,213 @@
+import json
+import os
+import re
+import threading
+import time
+from decimal import Decimal
+
+from PySide6.QtSql import QSqlQuery
+
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+QUOTED_LITERAL = re.compile(r"('(?:[^']|'')*')")
+EXPLAIN_STATEMENT = re.compile(r"^\s*EXPLAIN\b", re.IGNORECASE)
+PLAIN_SELECT = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+WRITE_CLAUSES = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|FOR\s+(NO\s+KEY\s+)?UPDATE|FOR\s+(KEY\s+)?SHARE)\b", re.IGNORECASE
+)
+READ_ONLY_SQLSTATE = "25006"
+
+
+def sql_literal(value):
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float, Decimal)):
+        return str(value)
+    text = value.toString("yyyy-MM-ddTHH:mm:ss") if hasattr(value, "toString") else str(value)
+    return "'" + text.replace("'", "''") + "'"
+
+
+def is_plain_select(sql):
+    return bool(PLAIN_SELECT.match(sql)) and not WRITE_CLAUSES.search(QUOTED_LITERAL.sub("''", sql))
+
+
+def inline_params(sql, params):
+    if not params:
+        return sql
+    values = iter(params)
+    parts = QUOTED_LITERAL.split(sql)
+    for index in range(0, len(parts), 2):
+        parts[index] = re.sub(r"\?", lambda match: sql_literal(next(values)), parts[index])
+    return "".join(parts)
+
+
+def read_plan(query):
+    plan = []
+    while query.next():
+        plan.append(query.value(0))
+    return plan
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, elapsed_ms, rows=0, failed=False):
+        index = 0
+        while index < len(LATENCY_BUCKETS_MS) and elapsed_ms > LATENCY_BUCKETS_MS[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.rows += rows or 0
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if failed:
+            self.errors += 1
+
+    def percentile(self, fraction):
+        if not self.count:
+            return 0.0
+        target = self.count * fraction
+        seen = 0
+        for index, amount in enumerate(self.buckets):
+            seen += amount
+            if seen >= target:
+                if index < len(LATENCY_BUCKETS_MS):
+                    return float(min(LATENCY_BUCKETS_MS[index], self.max_ms))
+                return self.max_ms
+        return self.max_ms
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": {
+                f"<={bound}": amount for bound, amount in zip(LATENCY_BUCKETS_MS, self.buckets)
+            } | {f">{LATENCY_BUCKETS_MS[-1]}": self.buckets[-1]},
+        }
+
+
+class Instrumentation:
+    def __init__(self, slow_query_ms=300.0, slow_log_path=None, export_path=None, explain_interval=300.0):
+        self.slow_query_ms = slow_query_ms
+        self.slow_log_path = slow_log_path
+        self.export_path = export_path
+        self._explain_interval = explain_interval
+        self._histograms = {}
+        self._sources = {}
+        self._explained_at = {}
+        self._explainer = None
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+
+    def add_source(self, name, stats):
+        self._sources[name] = stats
+
+    def set_explainer(self, explainer):
+        self._explainer = explainer
+
+    def record_query(self, site, elapsed_ms, rows=0, failed=False, sql=None, params=None):
+        self._add("query", site, elapsed_ms, rows, failed)
+        if failed or elapsed_ms < self.slow_query_ms or sql is None:
+            return
+        if self._explainer is None or EXPLAIN_STATEMENT.match(sql) or not self._explain_due(site):
+            self._log_slow(site, elapsed_ms, rows, sql, params, [])
+            return
+        self._explainer(site, elapsed_ms, rows, sql, params)
+
+    def explain(self, db, site, elapsed_ms, rows, sql, params):
+        self._log_slow(site, elapsed_ms, rows, sql, params, self._explain(db, sql, params))
+
+    def record_render(self, site, elapsed_ms, rows=0):
+        self._add("render", site, elapsed_ms, rows)
+
+    def summary(self):
+        with self._lock:
+            sites = {
+                f"{kind}:{site}": histogram.summary()
+                for (kind, site), histogram in sorted(self._histograms.items())
+            }
+        return {
+            "started_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self._started_at)),
+            "exported_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "slow_query_ms": self.slow_query_ms,
+            "sites": sites,
+            "caches": {name: stats() for name, stats in self._sources.items()},
+        }
+
+    def export(self, path=None):
+        path = path or self.export_path
+        if not path:
+            return None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.summary(), handle, ensure_ascii=False, indent=2)
+        return path
+
+    def _add(self, kind, site, elapsed_ms, rows, failed=False):
+        key = (kind, site or "без контекста")
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+            histogram.add(elapsed_ms, rows, failed)
+
+    def _explain_due(self, site):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._explained_at.get(site, -self._explain_interval) < self._explain_interval:
+                return False
+            self._explained_at[site] = now
+        return True
+
+    def _explain(self, db, sql, params):
+        statement = inline_params(sql, params)
+        if is_plain_select(sql):
+            plan, error = self._explain_analyze(db, statement)
+            if error is None or error.nativeErrorCode() != READ_ONLY_SQLSTATE:
+                return plan
+        query = QSqlQuery(db)
+        if not query.exec(f"EXPLAIN {statement}"):
+            return [query.lastError().text()]
+        return read_plan(query)
+
+    def _explain_analyze(self, db, statement):
+        if not db.transaction():
+            return [db.lastError().text()], db.lastError()
+        query = QSqlQuery(db)
+        try:
+            query.exec("SET TRANSACTION READ ONLY")
+            if not query.exec(f"EXPLAIN (ANALYZE, BUFFERS) {statement}"):
+                return [query.lastError().text()], query.lastError()
+            return read_plan(query), None
+        finally:
+            db.rollback()
+
+    def _log_slow(self, site, elapsed_ms, rows, sql, params, plan):
+        if not self.slow_log_path:
+            return
+        lines = [
+            f"{time.strftime('%Y-%m-%d %H:%M:%S')} [{site}] {elapsed_ms:.1f} мс, строк: {rows}",
+            sql,
+        ]
+        if params:
+            lines.append(f"параметры: {list(params)!r}")
+        lines.extend(plan)
+        lines.append("")
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.slow_log_path)), exist_ok=True)
+            with open(self.slow_log_path, "a", encoding="utf-8") as handle:
+                handle.write("\n".join(lines) + "\n")
@@ -1,19 +1,95 @@
 import sys
-import os
+import re
+import time
 from decimal import Decimal, InvalidOperation
 
 from PySide6.QtWidgets import (
     QApplication,
     QMessageBox,
-    QTableWidgetItem,
-    QTableWidget,
+    QAbstractItemView,
     QInputDialog,
 )
-from PySide6.QtUiTools import QUiLoader
-from PySide6.QtCore import QFile, QDate, QTime, QDateTime, Qt
-from PySide6.QtSql import QSqlQuery
-
-from db import connect_db
+from PySide6.QtCore import QDateTime, QObject, QTimer, Qt
+from PySide6.QtGui import QKeySequence, QShortcut
+from PySide6.QtSql import QSqlDatabase
+
+from db import DB_SETTINGS, connect_db
+from instrumentation import Instrumentation
+from query_cache import QueryCache
+from query_executor import QueryExecutor
+from spa_data import (
+    RESYNC,
+    BookedSlotRow,
+    BookingRow,
+    CatalogRow,
+    ChangeFeed,
+    ReviewRow,
+    ReviewSalonRow,
+    RoleRow,
+    SalonRatingRow,
+    SalonServiceRow,
+    ServiceRow,
+    SlotRow,
+    UserRow,
+    add_salon_service,
+    approve_reviews,
+    cancel_appointment,
+    configure,
+    delete_salon_service,
+    delete_user,
+    fetch_appointment_status,
+    fetch_available_services,
+    fetch_masters,
+    fetch_salons,
+    find_user,
+    generate_schedule,
+    make_rows,
+    reject_reviews,
+    update_salon_service_price,
+)
+from spa_data.bookings import (
+    AVAILABLE_SLOTS_SQL,
+    BOOK_APPOINTMENT_SQL,
+    BOOK_FIRST_AVAILABLE_SQL,
+    BOOKED_STATUS,
+    CANCELLABLE_STATUSES,
+    CANCELLED_STATUS,
+    available_slots_params,
+    book_appointment_params,
+    book_first_available_params,
+    booking_descending,
+    booking_in_view,
+    booking_sort_key,
+    build_client_bookings_query,
+    build_bookings_page_query,
+    split_bookings_page,
+)
+from spa_data.catalog import (
+    CATALOG_SORT_RATING,
+    CITIES_SQL,
+    SERVICES_SQL,
+    build_catalog_conditions,
+    build_catalog_page_query,
+    build_catalog_rank,
+    build_estimate_query,
+    split_catalog_page,
+)
+from spa_data.directory import (
+    ROLES_SQL,
+    SALON_SERVICES_SQL,
+    build_salon_services_by_key_query,
+    build_user_directory_query,
+    split_user_page,
+)
+from spa_data.reviews import (
+    REVIEW_SALONS_SQL,
+    build_review_queue_query,
+    build_salon_ratings_query,
+    split_review_page,
+)
+from spa_data.session import run_booking, statement_cache
+from table_model import RowTableModel, format_cell
+from ui_forms import load_form
 
 ROLE_ALIASES = {
     "client": "client",
@@ -31,76 +107,156 @@ ROLE_CONFIGS = {
     "admin": {"tabs": ("admin",), "title": "Smart-SPA — Администратор"},
 }
 
+TAB_FORMS = {
+    "catalog": "CatalogTab",
+    "book": "BookingsTab",
+    "salon": "SalonTab",
+    "admin": "AdminTab",
+}
+TAB_QUERY_KEYS = {
+    "catalog": ("catalog", "cities", "services"),
+    "book": ("bookings_upcoming", "bookings_history"),
+    "salon": ("salon_services",),
+    "admin": ("users", "reviews", "roles", "review_salons"),
+}
+TAB_MAX_AGE_S = 300.0
+TAB_PREFETCH_DELAY_MS = 250
+CHANGE_FLUSH_DELAY_MS = 200
+
+main = None
 current_user = None
 current_role = None
-catalog_filter_state = {"city": None, "search": ""}
+built_tabs = {}
+tab_loaded_at = {}
+catalog_filter_state = {
+    "city": None,
+    "search": "",
+    "service_id": None,
+    "price_min": None,
+    "price_max": None,
+    "sort": None,
+}
 catalog_filters_initialized = False
+catalog_page_state = {
+    "conditions": [],
+    "params": [],
+    "rank": None,
+    "sort": None,
+    "cursor": None,
+    "estimate": None,
+    "cache_key": None,
+}
+bookings_page_state = {"user_id": None, "upcoming": None, "history": None}
+review_page_state = {"salon_id": None, "cursor": None, "salons": {}}
+user_page_state = {"search": "", "role_id": None, "cursor": None}
+query_handlers = {}
+query_retries = {}
+pending_changes = {"bookings": set(), "salon_services": set(), "ratings": set()}
+requested_changes = {"bookings": set(), "salon_services": set(), "ratings": set()}
+catalog_cache = QueryCache(max_entries=32, ttl=120.0)
+instrumentation = Instrumentation(
+    slow_query_ms=DB_SETTINGS["slow_query_ms"],
+    slow_log_path=DB_SETTINGS["slow_query_log"],
+    export_path=DB_SETTINGS["metrics_file"],
+)
+instrumentation.add_source("statement_cache", statement_cache.stats)
+instrumentation.add_source("catalog_cache", catalog_cache.stats)
+
+DB_ERROR_MESSAGES = {
+    "23P01": "Выбранное время пересекается с уже существующим слотом мастера.",
+    "40001": "Запись не удалась из-за одновременного бронирования. Попробуйте ещё раз.",
+    "40P01": "Запись не удалась из-за одновременного бронирования. Попробуйте ещё раз.",
+    "55P03": "Это время сейчас бронирует другой клиент. Попробуйте ещё раз или выберите другое время.",
+}
 
-def load_ui(path):
-    if not os.path.exists(path):
-        print("Файл не найден:", path)
-    f = QFile(path)
-    if not f.open(QFile.ReadOnly):
-        print("Ошибка открытия:", path)
-    ui = QUiLoader().load(f)
-    f.close()
-    return ui
-
-
-def format_cell(value):
-    if value is None:
-        return ""
-    if isinstance(value, QDateTime):
-        return value.toString("dd.MM.yyyy HH:mm")
-    if isinstance(value, QDate):
-        return value.toString("dd.MM.yyyy")
-    if isinstance(value, QTime):
-        return value.toString("HH:mm")
-    if isinstance(value, Decimal):
-        return f"{value:.2f}"
-    if isinstance(value, float):
-        return f"{value:.2f}"
-    return str(value)
-
-
-def populate_table(table, headers, rows, row_payloads=None):
+FIRST_AVAILABLE_SLOT = "first_available"
+
+CATALOG_FILTER_KEYS = ("city", "search", "service_id", "price_min", "price_max", "sort")
+CATALOG_SORT_OPTIONS = (("По городу и салону", None), ("По рейтингу", CATALOG_SORT_RATING))
+PRICE_FILTER_STEPS = (500, 1000, 1500, 2000, 3000, 5000, 10000)
+CATALOG_CACHE_ROW_LIMIT = 2000
+SEARCH_DEBOUNCE_MS = 300
+BOOKING_TABLES = {"upcoming": "tblBookings", "history": "tblBookingsHistory"}
+TABLE_ROW_KEYS = {
+    "tblCatalog": lambda item: (item.salon_id, item.service_id),
+    "tblServices": lambda item: (item.salon_id, item.service_id),
+    "tblUsers": lambda item: item.id,
+    "tblBookings": lambda item: item.id,
+    "tblBookingsHistory": lambda item: item.id,
+    "tblReviews": lambda item: item.id,
+}
+
+
+def populate_table(table, headers, rows, row_payloads=None, page_loader=None):
     if table is None:
         return
 
-    table.blockSignals(True)
-    table.setSortingEnabled(False)
-    table.clear()
-    table.setRowCount(len(rows))
-    table.setColumnCount(len(headers))
-    table.setHorizontalHeaderLabels(headers)
-
-    if isinstance(table, QTableWidget):
-        table.setSelectionBehavior(QTableWidget.SelectRows)
-        table.setSelectionMode(QTableWidget.SingleSelection)
-
-    for row_idx, row in enumerate(rows):
-        for col_idx, cell in enumerate(row):
-            item = QTableWidgetItem(format_cell(cell))
-            item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-            table.setItem(row_idx, col_idx, item)
-
-        if row_payloads and row_idx < len(row_payloads):
-            payload = row_payloads[row_idx]
-            if payload is not None:
-                item = table.item(row_idx, 0)
-                if item is not None:
-                    item.setData(Qt.UserRole, payload)
-
-    header = table.horizontalHeader()
-    if header is not None:
-        header.setStretchLastSection(True)
+    started = time.perf_counter()
+    model = table.model()
+    if not isinstance(model, RowTableModel):
+        model = RowTableModel(parent=table)
+        table.setModel(model)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setSelectionMode(QAbstractItemView.SingleSelection)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        header = table.horizontalHeader()
+        if header is not None:
+            header.setStretchLastSection(True)
+            header.setSortIndicator(-1, Qt.AscendingOrder)
+        table.setSortingEnabled(True)
+
+    model.set_rows(headers, rows, row_payloads, page_loader)
     table.resizeColumnsToContents()
-    table.setSortingEnabled(True)
-    table.blockSignals(False)
+    instrumentation.record_render(table.objectName(), (time.perf_counter() - started) * 1000, len(rows))
+
+
+def table_row_count(table):
+    model = table.model() if table is not None else None
+    if model is None:
+        return 0
+    return model.rowCount()
+
+
+def table_model(table_name):
+    table = getattr(main, table_name, None)
+    model = table.model() if table is not None else None
+    return model if isinstance(model, RowTableModel) else None
+
+
+def sorted_position(table_name, item, sort_key, descending=False):
+    model = table_model(table_name)
+    if model is None:
+        return None
+    key = sort_key(item)
+    if descending:
+        position = sum(1 for payload in model.payloads() if payload is not None and sort_key(payload) > key)
+    else:
+        position = sum(1 for payload in model.payloads() if payload is not None and sort_key(payload) < key)
+    if position >= model.loaded_count() and model.has_more_pages():
+        return None
+    return position
 
 
-def show_db_error(query, context):
-    error_text = query.lastError().text() if query.lastError().isValid() else ""
+def apply_row_change(table_name, key, cells=None, item=None, position=None):
+    model = table_model(table_name)
+    if model is None:
+        return
+    key_of = TABLE_ROW_KEYS[table_name]
+    row_idx = model.find_row(lambda payload: key_of(payload) == key)
+    if item is None:
+        if row_idx >= 0:
+            model.remove_row(row_idx)
+    elif row_idx >= 0:
+        model.update_row(row_idx, cells, item)
+    elif position is not None:
+        model.insert_row(cells, item, position)
+
+
+def show_db_error(error, context):
+    error_text = error.text() if error.isValid() else ""
+    friendly_text = DB_ERROR_MESSAGES.get(error.nativeErrorCode()) if error.isValid() else None
+    if friendly_text:
+        error_text = friendly_text
     details = f"{context}." if context else "Ошибка выполнения запроса."
     if error_text:
         details = f"{details}\n{error_text}"
@@ -108,61 +264,54 @@ def show_db_error(query, context):
     QMessageBox.critical(parent, "Ошибка БД", details)
 
 
-def execute_select(sql, params=None, context=""):
-    query = QSqlQuery()
-    if params:
-        query.prepare(sql)
-        for value in params:
-            query.addBindValue(value)
-        if not query.exec():
-            show_db_error(query, context)
-            return None
-    else:
-        if not query.exec(sql):
-            show_db_error(query, context)
-            return None
-    return query
-
-
-def execute_action(sql, params=None, context=""):
-    query = QSqlQuery()
-    if params:
-        query.prepare(sql)
-        for value in params:
-            query.addBindValue(value)
-        if not query.exec():
-            show_db_error(query, context)
-            return False
-    else:
-        if not query.exec(sql):
-            show_db_error(query, context)
-            return False
-    return True
+def submit_query(key, sql, params, context, on_result, on_retry=None, runner=None):
+    query_handlers[key] = on_result
+    query_retries[key] = on_retry
+    executor.submit(key, sql, params, context, runner)
 
 
-def find_user(login_text):
-    login_text = (login_text or "").strip()
-    if not login_text:
-        return None
+def on_query_result(key, request_id, rows):
+    handler = query_handlers.pop(key, None)
+    query_retries.pop(key, None)
+    if handler is not None:
+        handler(rows)
+
 
-    sql = (
-        "SELECT u.id, u.full_name, r.code AS role_code, r.name AS role_name "
-        "FROM users u "
-        "JOIN roles r ON r.id = u.role_id "
-        "WHERE u.phone = ? OR u.email = ? OR lower(u.full_name) = lower(?) "
-        "LIMIT 1"
+def on_query_failed(key, request_id, context, error_text, error_code=""):
+    handler = query_handlers.pop(key, None)
+    retry = query_retries.pop(key, None)
+    error_text = DB_ERROR_MESSAGES.get(error_code) or error_text
+    details = f"{context}." if context else "Ошибка выполнения запроса."
+    if error_text:
+        details = f"{details}\n{error_text}"
+    for tab, keys in TAB_QUERY_KEYS.items():
+        if key in keys:
+            tab_loaded_at.pop(tab, None)
+    parent = globals().get("main") or globals().get("login")
+    if retry is None:
+        QMessageBox.critical(parent, "Ошибка БД", details)
+        if handler is not None:
+            handler(None)
+        return
+    if handler is not None:
+        handler(None)
+    answer = QMessageBox.critical(
+        parent,
+        "Ошибка БД",
+        f"{details}\nПовторить загрузку?",
+        QMessageBox.Retry | QMessageBox.Cancel,
     )
-    query = execute_select(sql, [login_text, login_text, login_text], "Поиск пользователя")
-    if query is None:
-        return None
-    if query.next():
-        return {
-            "id": query.value("id"),
-            "full_name": query.value("full_name"),
-            "role_code": query.value("role_code"),
-            "role_name": query.value("role_name"),
-        }
-    return None
+    if answer == QMessageBox.Retry:
+        retry()
+
+
+def set_table_loading(table, loading):
+    if table is None:
+        return
+    if loading:
+        table.viewport().setCursor(Qt.BusyCursor)
+    else:
+        table.viewport().unsetCursor()
 
 
 def populate_city_filter(selected_city=None):
@@ -170,24 +319,85 @@ def populate_city_filter(selected_city=None):
     if combo is None:
         return
 
-    sql = "SELECT DISTINCT city FROM salons ORDER BY city"
-    query = execute_select(sql, context="Загрузка списка городов")
-    cities = []
-    if query is not None:
-        while query.next():
-            city_value = query.value("city")
-            if city_value:
-                cities.append(city_value)
+    def apply_cities(result_rows):
+        cities = [row["city"] for row in result_rows or [] if row["city"]]
+
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItem("Все города", "")
+        for city in cities:
+            combo.addItem(city, city)
+
+        index = 0
+        if selected_city:
+            found_index = combo.findData(selected_city)
+            if found_index != -1:
+                index = found_index
+        combo.setCurrentIndex(index)
+        combo.blockSignals(False)
+
+    submit_query("cities", CITIES_SQL, None, "Загрузка списка городов", apply_cities)
+
+
+def populate_service_filter(selected_service=None):
+    combo = getattr(main, "cbService", None)
+    if combo is None:
+        return
+
+    def apply_services(result_rows):
+        services = make_rows(ServiceRow, result_rows or [])
+
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItem("Все услуги", None)
+        for service in services:
+            combo.addItem(service.name, service.id)
+
+        index = 0
+        if selected_service:
+            found_index = combo.findData(selected_service)
+            if found_index != -1:
+                index = found_index
+        combo.setCurrentIndex(index)
+        combo.blockSignals(False)
+
+    submit_query("services", SERVICES_SQL, None, "Загрузка списка услуг", apply_services)
+
+
+def populate_price_filters(price_min=None, price_max=None):
+    for name, selected in (("cbCPriceMin", price_min), ("cbPriceMax", price_max)):
+        combo = getattr(main, name, None)
+        if combo is None:
+            continue
+
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItem("Любая", None)
+        for step in PRICE_FILTER_STEPS:
+            combo.addItem(format_price(step), step)
+
+        index = 0
+        if selected is not None:
+            found_index = combo.findData(selected)
+            if found_index != -1:
+                index = found_index
+        combo.setCurrentIndex(index)
+        combo.blockSignals(False)
+
+
+def populate_sort_filter(selected_sort=None):
+    combo = getattr(main, "cbSort", None)
+    if combo is None:
+        return
 
     combo.blockSignals(True)
     combo.clear()
-    combo.addItem("Все города", "")
-    for city in cities:
-        combo.addItem(city, city)
+    for title, sort in CATALOG_SORT_OPTIONS:
+        combo.addItem(title, sort)
 
     index = 0
-    if selected_city:
-        found_index = combo.findData(selected_city)
+    if selected_sort:
+        found_index = combo.findData(selected_sort)
         if found_index != -1:
             index = found_index
     combo.setCurrentIndex(index)
@@ -198,173 +408,328 @@ def load_catalog(update_filters=False):
     global catalog_filters_initialized
 
     table = getattr(main, "tblCatalog", None)
-    headers = ["Наименование", "Город", "Цена"]
+    headers = ["Наименование", "Город", "Цена", "Рейтинг"]
     search_edit = getattr(main, "leSearch", None)
 
     if update_filters or not catalog_filters_initialized:
         populate_city_filter(catalog_filter_state.get("city"))
+        populate_service_filter(catalog_filter_state.get("service_id"))
+        populate_price_filters(
+            catalog_filter_state.get("price_min"),
+            catalog_filter_state.get("price_max"),
+        )
+        populate_sort_filter(catalog_filter_state.get("sort"))
         catalog_filters_initialized = True
 
     if search_edit is not None:
         current_text = catalog_filter_state.get("search", "")
         if search_edit.text() != current_text:
+            search_edit.blockSignals(True)
             search_edit.setText(current_text)
+            search_edit.blockSignals(False)
+
+    cache_key = catalog_cache_key()
+    catalog_page_state["cache_key"] = cache_key
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        executor.cancel("catalog")
+        executor.cancel("catalog_estimate")
+        set_table_loading(table, False)
+        show_cached_catalog(table, headers, cached)
+        return
 
-    sql = (
-        "SELECT srv.name AS service_name, salons.name AS salon_name, salons.city AS city, "
-        "       COALESCE(ss.price, srv.base_price) AS price, "
-        "       salons.id AS salon_id, srv.id AS service_id "
-        "FROM salon_services ss "
-        "JOIN salons ON salons.id = ss.salon_id "
-        "JOIN services srv ON srv.id = ss.service_id"
-    )
-
-    params = []
-    conditions = []
-    selected_city = catalog_filter_state.get("city")
-    search_text = (catalog_filter_state.get("search", "") or "").strip()
-
-    if selected_city:
-        conditions.append("salons.city = ?")
-        params.append(selected_city)
-
-    if search_text:
-        like_pattern = f"%{search_text}%"
-        conditions.append("(srv.name ILIKE ? OR salons.name ILIKE ?)")
-        params.extend([like_pattern, like_pattern])
-
-    if conditions:
-        sql += " WHERE " + " AND ".join(conditions)
-
-    sql += " ORDER BY salons.city, salons.name, srv.name"
-
-    query = execute_select(sql, params if params else None, context="Загрузка каталога услуг")
-    rows = []
-    payloads = []
-    if query is not None:
-        while query.next():
-            rows.append([
-                query.value("service_name"),
-                query.value("city"),
-                query.value("price"),
-            ])
-            payloads.append(
+    conditions, params = build_catalog_conditions(catalog_filter_state)
+    rank = build_catalog_rank(catalog_filter_state)
+    sort = catalog_filter_state.get("sort")
+    catalog_page_state["conditions"] = conditions
+    catalog_page_state["params"] = params
+    catalog_page_state["rank"] = rank
+    catalog_page_state["sort"] = sort
+    catalog_page_state["cursor"] = None
+    catalog_page_state["estimate"] = None
+
+    def apply_first_page(result_rows):
+        set_table_loading(table, False)
+        rows, payloads, cursor, has_more = read_catalog_page(result_rows or [], None)
+        catalog_page_state["cursor"] = cursor
+        if result_rows is not None:
+            catalog_cache.put(
+                cache_key,
                 {
-                    "salon_id": query.value("salon_id"),
-                    "service_id": query.value("service_id"),
-                    "salon_name": query.value("salon_name"),
-                    "service_name": query.value("service_name"),
-                }
+                    "conditions": conditions,
+                    "params": params,
+                    "rank": rank,
+                    "sort": sort,
+                    "rows": rows,
+                    "payloads": payloads,
+                    "cursor": cursor,
+                    "has_more": has_more,
+                    "estimate": catalog_page_state["estimate"],
+                },
             )
-    populate_table(table, headers, rows, payloads)
+        populate_table(
+            table,
+            headers,
+            rows,
+            payloads,
+            page_loader=load_next_catalog_page if has_more else None,
+        )
+        update_catalog_total()
+
+    def apply_estimate(result_rows):
+        if result_rows:
+            catalog_page_state["estimate"] = result_rows[0].get("estimate")
+            cached_entry = catalog_cache.peek(cache_key)
+            if cached_entry is not None:
+                cached_entry["estimate"] = catalog_page_state["estimate"]
+        update_catalog_total()
+
+    provisional = refine_cached_catalog(cache_key)
+    if provisional is not None:
+        populate_table(table, headers, provisional["rows"], provisional["payloads"])
+
+    set_table_loading(table, True)
+    update_catalog_total(loading=True)
+    sql, page_params = build_catalog_page_query(conditions, params, rank=rank, sort=sort)
+    submit_query("catalog", sql, page_params, "Загрузка каталога услуг", apply_first_page)
+    sql, estimate_params = build_estimate_query(catalog_filter_state)
+    submit_query("catalog_estimate", sql, estimate_params, "Оценка размера каталога", apply_estimate)
+
+
+def catalog_cache_key():
+    values = []
+    for key in CATALOG_FILTER_KEYS:
+        value = catalog_filter_state.get(key)
+        if key == "search":
+            value = (value or "").strip().casefold()
+        values.append(value or None)
+    return tuple(values)
+
+
+def refine_cached_catalog(cache_key):
+    search_index = CATALOG_FILTER_KEYS.index("search")
+    search_text = cache_key[search_index] or ""
+    if not search_text:
+        return None
+
+    for cached_key, entry in catalog_cache.items():
+        if entry["has_more"]:
+            continue
+        cached_search = cached_key[search_index] or ""
+        if cached_search == search_text or not search_text.startswith(cached_search):
+            continue
+        if any(
+            cached_key[i] != cache_key[i] for i in range(len(cache_key)) if i != search_index
+        ):
+            continue
+
+        rows = []
+        payloads = []
+        for row, payload in zip(entry["rows"], entry["payloads"]):
+            if catalog_row_matches(payload, search_text):
+                rows.append(row)
+                payloads.append(payload)
+        return {"rows": rows, "payloads": payloads}
+    return None
+
+
+def catalog_row_matches(payload, search_text):
+    haystack = " ".join(
+        str(value or "") for value in (payload.service_name, payload.salon_name, payload.city)
+    ).casefold()
+    if search_text in haystack:
+        return True
+    words = re.findall(r"\w+", haystack)
+    return all(
+        any(word.startswith(prefix) for word in words)
+        for prefix in re.findall(r"\w+", search_text)
+    )
+
+
+def show_cached_catalog(table, headers, entry):
+    catalog_page_state["conditions"] = entry["conditions"]
+    catalog_page_state["params"] = entry["params"]
+    catalog_page_state["rank"] = entry["rank"]
+    catalog_page_state["sort"] = entry["sort"]
+    catalog_page_state["cursor"] = entry["cursor"]
+    catalog_page_state["estimate"] = entry["estimate"]
+    populate_table(
+        table,
+        headers,
+        entry["rows"],
+        entry["payloads"],
+        page_loader=load_next_catalog_page if entry["has_more"] else None,
+    )
+    update_catalog_total()
+
+
+def invalidate_catalog_cache():
+    catalog_cache.clear()
+
+
+def read_catalog_page(result_rows, cursor):
+    page, next_cursor, has_more = split_catalog_page(
+        make_rows(CatalogRow, result_rows), cursor, sort=catalog_page_state["sort"]
+    )
+    rows = [catalog_cells(item) for item in page]
+    return rows, page, next_cursor, has_more
+
+
+def catalog_cells(item):
+    return [item.service_name, item.city, item.price, item.rating or None]
+
+
+def catalog_sort_key(item):
+    if catalog_page_state["sort"] == CATALOG_SORT_RATING:
+        return (-(item.rating or 0), -item.salon_id, -item.service_id)
+    return (item.city or "", item.salon_name or "", item.salon_id, item.service_name or "", item.service_id)
+
+
+def catalog_row_visible(item):
+    city = catalog_filter_state.get("city")
+    service_id = catalog_filter_state.get("service_id")
+    price_min = catalog_filter_state.get("price_min")
+    price_max = catalog_filter_state.get("price_max")
+    search_text = (catalog_filter_state.get("search") or "").strip().casefold()
+    if city and item.city != city:
+        return False
+    if service_id and item.service_id != service_id:
+        return False
+    if price_min is not None and (item.price is None or item.price < price_min):
+        return False
+    if price_max is not None and (item.price is None or item.price > price_max):
+        return False
+    return not search_text or catalog_row_matches(item, search_text)
+
+
+def load_next_catalog_page():
+    table = getattr(main, "tblCatalog", None)
+    if table is None:
+        return
+
+    cache_key = catalog_page_state["cache_key"]
+
+    def append_page(result_rows):
+        set_table_loading(table, False)
+        if result_rows is None:
+            table.model().fail_page()
+            update_catalog_total()
+            return
+        rows, payloads, cursor, has_more = read_catalog_page(
+            result_rows, catalog_page_state["cursor"]
+        )
+        catalog_page_state["cursor"] = cursor
+        cached_entry = catalog_cache.peek(cache_key)
+        if cached_entry is not None and len(cached_entry["rows"]) < CATALOG_CACHE_ROW_LIMIT:
+            cached_entry["rows"] = cached_entry["rows"] + rows
+            cached_entry["payloads"] = cached_entry["payloads"] + payloads
+            cached_entry["cursor"] = cursor
+            cached_entry["has_more"] = has_more
+        table.model().append_rows(rows, payloads, has_more)
+        update_catalog_total()
+
+    set_table_loading(table, True)
+    sql, params = build_catalog_page_query(
+        catalog_page_state["conditions"],
+        catalog_page_state["params"],
+        catalog_page_state["cursor"],
+        catalog_page_state["rank"],
+        sort=catalog_page_state["sort"],
+    )
+    submit_query("catalog", sql, params, "Загрузка каталога услуг", append_page, table.model().retry_page)
+
+
+def update_catalog_total(loading=False):
+    label = getattr(main, "lblCatalogTotal", None)
+    table = getattr(main, "tblCatalog", None)
+    if label is None or table is None:
+        return
+
+    if loading:
+        label.setText("Загрузка…")
+        return
+
+    model = table.model()
+    loaded = model.loaded_count() if model is not None else 0
+    if model is None or not model.has_more_pages():
+        label.setText(f"Найдено: {loaded}")
+        return
+
+    estimate = catalog_page_state.get("estimate") or 0
+    label.setText(f"Показано: {loaded} из ≈ {max(int(estimate), loaded)}")
 
 
 def load_bookings(user_id):
-    table = getattr(main, "tblBookings", None)
+    bookings_page_state["user_id"] = user_id
+    for view in BOOKING_TABLES:
+        load_bookings_page(view)
+
+
+def load_bookings_page(view, append=False):
+    table = getattr(main, BOOKING_TABLES[view], None)
     headers = ["Номер", "Салон", "Услуга", "Начало", "Статус"]
+    user_id = bookings_page_state["user_id"]
+    key = f"bookings_{view}"
+    if table is None:
+        return
 
     if user_id is None:
+        executor.cancel(key)
+        bookings_page_state[view] = None
         populate_table(table, headers, [])
         return
 
-    sql = (
-        "SELECT a.id, salons.name AS salon_name, srv.name AS service_name, "
-        "       slots.start_ts AS start_ts, a.status AS status "
-        "FROM appointments a "
-        "JOIN salons ON salons.id = a.salon_id "
-        "JOIN services srv ON srv.id = a.service_id "
-        "JOIN schedule_slots slots ON slots.id = a.slot_id "
-        "WHERE a.client_id = ? "
-        "ORDER BY slots.start_ts"
-    )
-    query = execute_select(sql, [user_id], "Загрузка записей клиента")
-    rows = []
-    if query is not None:
-        while query.next():
-            rows.append([
-                query.value("id"),
-                query.value("salon_name"),
-                query.value("service_name"),
-                query.value("start_ts"),
-                query.value("status"),
-            ])
-    populate_table(table, headers, rows)
-
-
-def fetch_available_slots(salon_id, limit=20):
-    if salon_id is None:
-        return []
-
-    sql = (
-        "SELECT slots.id AS slot_id, slots.start_ts AS start_ts, slots.end_ts AS end_ts, "
-        "       m.id AS master_id, m.full_name AS master_name, m.specialization AS specialization "
-        "FROM masters m "
-        "JOIN schedule_slots slots ON slots.master_id = m.id "
-        "LEFT JOIN appointments a ON a.slot_id = slots.id "
-        "WHERE m.salon_id = ? AND m.active = TRUE AND slots.is_booked = FALSE "
-        "      AND a.slot_id IS NULL AND slots.start_ts >= now() "
-        "ORDER BY slots.start_ts "
-        "LIMIT ?"
-    )
-    query = execute_select(sql, [salon_id, limit], "Поиск свободных слотов")
-    slots = []
-    if query is not None:
-        while query.next():
-            slots.append(
-                {
-                    "slot_id": query.value("slot_id"),
-                    "start_ts": query.value("start_ts"),
-                    "end_ts": query.value("end_ts"),
-                    "master_id": query.value("master_id"),
-                    "master_name": query.value("master_name"),
-                    "specialization": query.value("specialization"),
-                }
-            )
-    return slots
+    cursor = bookings_page_state[view] if append else None
 
+    def apply_page(result_rows):
+        set_table_loading(table, False)
+        if result_rows is None and append:
+            table.model().fail_page()
+            return
+        page, next_cursor, has_more = split_bookings_page(make_rows(BookingRow, result_rows or []), cursor)
+        bookings_page_state[view] = next_cursor
+        rows = [list(item) for item in page]
+        if append:
+            table.model().append_rows(rows, page, has_more)
+            return
+        populate_table(
+            table,
+            headers,
+            rows,
+            page,
+            page_loader=(lambda: load_bookings_page(view, append=True)) if has_more else None,
+        )
 
-def fetch_salons():
-    sql = "SELECT id, name, city FROM salons ORDER BY name"
-    query = execute_select(sql, context="Загрузка списка салонов")
-    salons = []
-    if query is not None:
-        while query.next():
-            salons.append(
-                {
-                    "id": query.value("id"),
-                    "name": query.value("name"),
-                    "city": query.value("city"),
-                }
-            )
-    return salons
+    set_table_loading(table, True)
+    sql, params = build_bookings_page_query(user_id, view, cursor)
+    retry = table.model().retry_page if append else None
+    submit_query(key, sql, params, "Загрузка записей клиента", apply_page, retry)
 
 
-def fetch_available_services_for_salon(salon_id):
-    if salon_id is None:
-        return []
-
-    sql = (
-        "SELECT s.id AS service_id, s.name AS service_name, s.duration_min, s.base_price "
-        "FROM services s "
-        "WHERE NOT EXISTS ("
-        "    SELECT 1 FROM salon_services ss "
-        "    WHERE ss.salon_id = ? AND ss.service_id = s.id"
-        ") "
-        "ORDER BY s.name"
+def apply_booking_change(booking):
+    now = QDateTime.currentDateTime()
+    for view, table_name in BOOKING_TABLES.items():
+        position = None
+        if booking_in_view(booking, view, now):
+            position = sorted_position(table_name, booking, booking_sort_key, booking_descending(view))
+        apply_row_change(table_name, booking.id, list(booking), booking, position)
+
+
+def fetch_available_slots(salon_id, service_id, on_result, limit=20):
+    if salon_id is None or service_id is None:
+        on_result([])
+        return
+
+    def apply_slots(result_rows):
+        on_result(None if result_rows is None else make_rows(SlotRow, result_rows))
+
+    submit_query(
+        "slots",
+        AVAILABLE_SLOTS_SQL,
+        available_slots_params(salon_id, service_id, limit),
+        "Поиск свободных слотов",
+        apply_slots,
     )
-    query = execute_select(sql, [salon_id], "Доступные услуги для салона")
-    services = []
-    if query is not None:
-        while query.next():
-            services.append(
-                {
-                    "id": query.value("service_id"),
-                    "name": query.value("service_name"),
-                    "duration_min": query.value("duration_min"),
-                    "base_price": query.value("base_price"),
-                }
-            )
-    return services
 
 
 def format_price(value):
@@ -394,21 +759,19 @@ def choose_slot_for_booking(slots, salon_name="", service_name=""):
     if not slots:
         return None
 
-    options = []
+    options = ["0. Ближайшее свободное время (автоматически)"]
     for index, slot in enumerate(slots, start=1):
-        start_text = format_cell(slot.get("start_ts"))
-        end_text = format_cell(slot.get("end_ts"))
+        start_text = format_cell(slot.start_ts)
+        end_text = format_cell(slot.end_ts)
         time_text = start_text
         if start_text and end_text and end_text != start_text:
             time_text = f"{start_text} – {end_text}"
 
         master_parts = []
-        master_name = slot.get("master_name")
-        specialization = slot.get("specialization")
-        if master_name:
-            master_parts.append(master_name)
-        if specialization:
-            master_parts.append(specialization)
+        if slot.master_name:
+            master_parts.append(slot.master_name)
+        if slot.specialization:
+            master_parts.append(slot.specialization)
         master_text = " — ".join(master_parts)
 
         option_text = f"{index}. {time_text}"
@@ -438,30 +801,37 @@ def choose_slot_for_booking(slots, salon_name="", service_name=""):
         selected_index = options.index(selection)
     except ValueError:
         return None
-    return slots[selected_index]
+    if selected_index == 0:
+        return FIRST_AVAILABLE_SLOT
+    return slots[selected_index - 1]
 
 
 def read_catalog_filters_from_ui():
-    combo = getattr(main, "cbCity", None)
     search_edit = getattr(main, "leSearch", None)
 
-    city_value = None
-    if combo is not None and combo.count() > 0:
-        data = combo.currentData()
-        if data:
-            city_value = data
+    def combo_value(name):
+        combo = getattr(main, name, None)
+        if combo is None or combo.count() == 0:
+            return None
+        return combo.currentData() or None
 
     search_text = ""
     if search_edit is not None:
         search_text = search_edit.text().strip()
 
-    return city_value, search_text
+    return {
+        "city": combo_value("cbCity"),
+        "search": search_text,
+        "service_id": combo_value("cbService"),
+        "price_min": combo_value("cbCPriceMin"),
+        "price_max": combo_value("cbPriceMax"),
+        "sort": combo_value("cbSort"),
+    }
 
 
 def on_apply_filter():
-    city_value, search_text = read_catalog_filters_from_ui()
-    catalog_filter_state["city"] = city_value
-    catalog_filter_state["search"] = search_text
+    search_timer.stop()
+    catalog_filter_state.update(read_catalog_filters_from_ui())
 
     load_catalog()
 
@@ -476,7 +846,7 @@ def on_book_now():
         return
 
     table = getattr(main, "tblCatalog", None)
-    if table is None or table.rowCount() == 0:
+    if table is None or table_row_count(table) == 0:
         QMessageBox.information(main, "Запись", "Каталог пуст. Выберите услугу позже.")
         return
 
@@ -491,19 +861,33 @@ def on_book_now():
         return
 
     row = selected_rows[0].row()
-    item = table.item(row, 0)
-    payload = item.data(Qt.UserRole) if item is not None else None
+    payload = table.model().payload(row)
     if not payload:
         QMessageBox.warning(main, "Запись", "Не удалось определить выбранную услугу.")
         return
 
-    salon_id = payload.get("salon_id")
-    service_id = payload.get("service_id")
+    salon_id = payload.salon_id
+    service_id = payload.service_id
     if not salon_id or not service_id:
         QMessageBox.warning(main, "Запись", "Недостаточно данных для создания записи.")
         return
 
-    available_slots = fetch_available_slots(salon_id)
+    set_table_loading(table, True)
+    btn = getattr(main, "btnBookNow", None)
+    if btn is not None:
+        btn.setEnabled(False)
+
+    def on_slots_loaded(available_slots):
+        set_table_loading(table, False)
+        if btn is not None:
+            btn.setEnabled(current_role == "client")
+        if available_slots is not None:
+            book_selected_service(payload, available_slots)
+
+    fetch_available_slots(salon_id, service_id, on_slots_loaded)
+
+
+def book_selected_service(payload, available_slots):
     if not available_slots:
         QMessageBox.information(
             main,
@@ -512,51 +896,76 @@ def on_book_now():
         )
         return
 
-    slot_info = choose_slot_for_booking(
-        available_slots,
-        payload.get("salon_name"),
-        payload.get("service_name"),
-    )
+    slot_info = choose_slot_for_booking(available_slots, payload.salon_name, payload.service_name)
     if slot_info is None:
         return
 
-    query = QSqlQuery()
-    query.prepare("SELECT book_appointment(?, ?, ?, ?, ?)")
-    query.addBindValue(current_user["id"])
-    query.addBindValue(salon_id)
-    query.addBindValue(slot_info["master_id"])
-    query.addBindValue(service_id)
-    query.addBindValue(slot_info["slot_id"])
+    if slot_info == FIRST_AVAILABLE_SLOT:
+        sql = BOOK_FIRST_AVAILABLE_SQL
+        params = book_first_available_params(current_user.id, payload.salon_id, payload.service_id)
+    else:
+        sql = BOOK_APPOINTMENT_SQL
+        params = book_appointment_params(
+            current_user.id,
+            payload.salon_id,
+            slot_info.master_id,
+            payload.service_id,
+            slot_info.slot_id,
+            slot_info.start_ts,
+        )
 
-    if not query.exec():
-        show_db_error(query, "Создание записи")
-        return
+    btn = getattr(main, "btnBookNow", None)
+    if btn is not None:
+        btn.setEnabled(False)
 
-    appointment_id = None
-    if query.next():
-        appointment_id = query.value(0)
+    def on_booked(result_rows):
+        if btn is not None:
+            btn.setEnabled(current_role == "client")
+        if result_rows is None:
+            return
+        booked = make_rows(BookedSlotRow, result_rows)
+        if slot_info != FIRST_AVAILABLE_SLOT:
+            show_booking(payload, slot_info, booked)
+        elif booked:
+            show_booking(payload, booked[0], booked)
+        else:
+            QMessageBox.information(
+                main,
+                "Свободные слоты",
+                "Всё ближайшее время уже занято. Попробуйте выбрать другую услугу или салон.",
+            )
 
-    load_bookings(current_user["id"])
-    load_catalog()
+    submit_query("booking", sql, params, "Создание записи", on_booked, runner=run_booking)
+
+
+def show_booking(payload, slot_info, booked):
+    appointment_id = booked[0].appointment_id if booked else None
+
+    if appointment_id:
+        apply_booking_change(
+            BookingRow(
+                appointment_id, payload.salon_name, payload.service_name, slot_info.start_ts, BOOKED_STATUS
+            )
+        )
+    else:
+        load_bookings(current_user.id)
 
-    salon_name = payload.get("salon_name") or "салон"
-    service_name = payload.get("service_name") or "услуга"
-    start_text = format_cell(slot_info.get("start_ts"))
+    salon_name = payload.salon_name or "салон"
+    service_name = payload.service_name or "услуга"
+    start_text = format_cell(slot_info.start_ts)
 
     message = (
         f"Вы записаны на {service_name} в {salon_name}."
         f"\nВремя начала: {start_text or 'уточните у администратора.'}"
     )
-    end_text = format_cell(slot_info.get("end_ts"))
+    end_text = format_cell(slot_info.end_ts)
     if end_text and end_text != start_text:
         message += f"\nВремя окончания: {end_text}"
 
-    master_name = slot_info.get("master_name")
-    if master_name:
-        specialization = slot_info.get("specialization")
-        master_line = master_name
-        if specialization:
-            master_line += f" ({specialization})"
+    if slot_info.master_name:
+        master_line = slot_info.master_name
+        if slot_info.specialization:
+            master_line += f" ({slot_info.specialization})"
         message += f"\nМастер: {master_line}"
     if appointment_id:
         message = f"Запись №{appointment_id} создана.\n" + message
@@ -566,74 +975,383 @@ def on_book_now():
     bookings_tab = getattr(main, "tabBookings", None)
     if bookings_tab is not None:
         main.twMain.setCurrentWidget(bookings_tab)
+    upcoming_tab = getattr(main, "tabBookingsUpcoming", None)
+    if upcoming_tab is not None and hasattr(main, "twBookings"):
+        main.twBookings.setCurrentWidget(upcoming_tab)
+
+
+def on_data_change(change):
+    if change.get("op") == RESYNC:
+        invalidate_catalog_cache()
+        invalidate_tabs()
+        if main is not None and main.isVisible():
+            on_tab_changed(main.twMain.currentIndex())
+        return
+
+    table = change.get("table")
+    deleted = change.get("op") == "DELETE"
+    if table == "appointments":
+        if current_user is None or change.get("client_id") != current_user.id:
+            return
+        appointment_id = change.get("id")
+        if deleted:
+            forget_change("bookings", appointment_id)
+            for table_name in BOOKING_TABLES.values():
+                apply_row_change(table_name, appointment_id)
+        else:
+            queue_changes("bookings", [appointment_id])
+    elif table == "salon_services":
+        if table_model("tblServices") is None and table_model("tblCatalog") is None:
+            invalidate_catalog_cache()
+            return
+        key = (change.get("salon_id"), change.get("service_id"))
+        if deleted:
+            forget_change("salon_services", key)
+            apply_salon_service_change(key)
+        else:
+            queue_changes("salon_services", [key])
+    elif table == "salon_rating_stats" and not deleted:
+        queue_changes("ratings", [change.get("salon_id")])
+
+
+def queue_changes(kind, keys):
+    pending_changes[kind].update(keys)
+    if not change_flush_timer.isActive():
+        change_flush_timer.start()
+
+
+def forget_change(kind, key):
+    pending_changes[kind].discard(key)
+    requested_changes[kind].discard(key)
+
+
+def flush_data_changes():
+    for kind, loader in CHANGE_LOADERS.items():
+        if not pending_changes[kind]:
+            continue
+        requested_changes[kind].update(pending_changes[kind])
+        pending_changes[kind].clear()
+        loader(set(requested_changes[kind]))
+
+
+def take_requested_changes(kind, keys):
+    current = keys & requested_changes[kind]
+    requested_changes[kind] -= keys
+    return current
+
+
+def load_changed_bookings(appointment_ids):
+    if current_user is None:
+        requested_changes["bookings"].clear()
+        return
+
+    def apply_bookings(result_rows):
+        current = take_requested_changes("bookings", appointment_ids)
+        if result_rows is None:
+            return
+        bookings = {item.id: item for item in make_rows(BookingRow, result_rows)}
+        for appointment_id in current:
+            if appointment_id in bookings:
+                apply_booking_change(bookings[appointment_id])
+            else:
+                for table_name in BOOKING_TABLES.values():
+                    apply_row_change(table_name, appointment_id)
+
+    sql, params = build_client_bookings_query(current_user.id, appointment_ids)
+    submit_query("changed_bookings", sql, params, "Обновление записей", apply_bookings)
+
+
+def load_changed_salon_services(keys):
+    def apply_services(result_rows):
+        current = take_requested_changes("salon_services", keys)
+        if result_rows is None:
+            invalidate_catalog_cache()
+            return
+        services = {(item.salon_id, item.service_id): item for item in make_rows(SalonServiceRow, result_rows)}
+        for key in current:
+            apply_salon_service_change(key, services.get(key))
+
+    sql, params = build_salon_services_by_key_query(keys)
+    submit_query("changed_salon_services", sql, params, "Обновление услуг салонов", apply_services)
+
+
+def load_changed_ratings(salon_ids):
+    def apply_ratings(result_rows):
+        take_requested_changes("ratings", salon_ids)
+        if result_rows is None:
+            invalidate_catalog_cache()
+            return
+        apply_salon_ratings(make_rows(SalonRatingRow, result_rows))
+
+    sql, params = build_salon_ratings_query(salon_ids)
+    submit_query("changed_ratings", sql, params, "Обновление рейтингов салонов", apply_ratings)
+
+
+CHANGE_LOADERS = {
+    "bookings": load_changed_bookings,
+    "salon_services": load_changed_salon_services,
+    "ratings": load_changed_ratings,
+}
+
+
 def load_salon_services():
     table = getattr(main, "tblServices", None)
     headers = ["Салон", "Услуга", "Длительность (мин)", "Цена"]
+    if table is None:
+        return
+
+    def apply_services(result_rows):
+        set_table_loading(table, False)
+        services = make_rows(SalonServiceRow, result_rows or [])
+        rows = [salon_service_cells(item) for item in services]
+        populate_table(table, headers, rows, services)
+
+    set_table_loading(table, True)
+    submit_query("salon_services", SALON_SERVICES_SQL, None, "Загрузка услуг салона", apply_services)
+
+
+def salon_service_cells(item):
+    display_name = item.salon_name
+    if item.city and item.city not in (item.salon_name or ""):
+        display_name = f"{item.salon_name} ({item.city})"
+    return [display_name, item.service_name, item.duration_min, item.price]
+
 
-    sql = (
-        "SELECT salons.id AS salon_id, salons.name AS salon_name, salons.city AS city, "
-        "       srv.id AS service_id, srv.name AS service_name, "
-        "       srv.duration_min AS duration_min, COALESCE(ss.price, srv.base_price) AS price "
-        "FROM salon_services ss "
-        "JOIN salons ON salons.id = ss.salon_id "
-        "JOIN services srv ON srv.id = ss.service_id "
-        "ORDER BY salons.name, srv.name"
+def salon_service_sort_key(item):
+    return (item.salon_name or "", item.service_name or "")
+
+
+def apply_salon_service_change(key, item=None):
+    invalidate_catalog_cache()
+    if item is None:
+        apply_row_change("tblServices", key)
+        apply_row_change("tblCatalog", key)
+        update_catalog_total()
+        return
+
+    apply_row_change(
+        "tblServices",
+        key,
+        salon_service_cells(item),
+        item,
+        sorted_position("tblServices", item, salon_service_sort_key),
     )
-    query = execute_select(sql, context="Загрузка услуг салона")
-    rows = []
-    payloads = []
-    if query is not None:
-        while query.next():
-            salon_name = query.value("salon_name")
-            city = query.value("city")
-            display_name = salon_name
-            if city and city not in (salon_name or ""):
-                display_name = f"{salon_name} ({city})"
-            rows.append([
-                display_name,
-                query.value("service_name"),
-                query.value("duration_min"),
-                query.value("price"),
-            ])
-            payloads.append(
-                {
-                    "salon_id": query.value("salon_id"),
-                    "service_id": query.value("service_id"),
-                    "salon_name": salon_name,
-                    "city": city,
-                    "service_name": query.value("service_name"),
-                    "price": query.value("price"),
-                }
-            )
-    populate_table(table, headers, rows, payloads)
+    model = table_model("tblCatalog")
+    known = [
+        payload for payload in (model.payloads() if model is not None else [])
+        if payload is not None and payload.salon_id == item.salon_id
+    ]
+    current = next((payload for payload in known if payload.service_id == item.service_id), None)
+    entry = CatalogRow(
+        item.service_name,
+        item.salon_name,
+        item.city,
+        item.price,
+        item.salon_id,
+        item.service_id,
+        known[0].rating if known else None,
+        current.search_rank if current is not None else None,
+    )
+    if not catalog_row_visible(entry):
+        apply_row_change("tblCatalog", key)
+    else:
+        position = None
+        if catalog_page_state["rank"] is None:
+            position = sorted_position("tblCatalog", entry, catalog_sort_key)
+        apply_row_change("tblCatalog", key, catalog_cells(entry), entry, position)
+    update_catalog_total()
+
+
+def apply_salon_ratings(ratings):
+    if not ratings:
+        return
+    invalidate_catalog_cache()
+    for rating in ratings:
+        apply_catalog_rating(rating.salon_id, rating.avg_rating)
+        apply_review_salon_count(rating.salon_id, rating.pending_count)
 
 
-def load_users():
+def apply_catalog_rating(salon_id, avg_rating):
+    model = table_model("tblCatalog")
+    if model is None:
+        return
+    reorder = catalog_page_state["sort"] == CATALOG_SORT_RATING and catalog_page_state["rank"] is None
+    for payload in model.payloads():
+        if payload is None or payload.salon_id != salon_id or payload.rating == avg_rating:
+            continue
+        entry = payload._replace(rating=avg_rating)
+        key = (entry.salon_id, entry.service_id)
+        position = None
+        if reorder:
+            apply_row_change("tblCatalog", key)
+            position = sorted_position("tblCatalog", entry, catalog_sort_key)
+        apply_row_change("tblCatalog", key, catalog_cells(entry), entry, position)
+    update_catalog_total()
+
+
+def review_salon_title(item, pending_count):
+    title = item.salon_name or f"Салон №{item.salon_id}"
+    if item.city and item.city not in title:
+        title = f"{title} ({item.city})"
+    return f"{title} — {pending_count}"
+
+
+def load_review_salons(selected_salon=None):
+    combo = getattr(main, "cbReviewSalon", None)
+    if combo is None:
+        return
+
+    def apply_salons(result_rows):
+        salons = make_rows(ReviewSalonRow, result_rows or [])
+        review_page_state["salons"] = {item.salon_id: item for item in salons}
+
+        combo.blockSignals(True)
+        combo.clear()
+        for item in salons:
+            combo.addItem(review_salon_title(item, item.pending_count), item.salon_id)
+
+        index = 0
+        if selected_salon is not None:
+            found_index = combo.findData(selected_salon)
+            if found_index != -1:
+                index = found_index
+        combo.setCurrentIndex(index)
+        combo.blockSignals(False)
+        load_reviews_page(combo.currentData())
+
+    submit_query("review_salons", REVIEW_SALONS_SQL, None, "Загрузка салонов с отзывами", apply_salons)
+
+
+def apply_review_salon_count(salon_id, pending_count):
+    combo = getattr(main, "cbReviewSalon", None)
+    item = review_page_state["salons"].get(salon_id)
+    if combo is None or item is None:
+        return
+    index = combo.findData(salon_id)
+    if index == -1:
+        return
+    if pending_count:
+        combo.setItemText(index, review_salon_title(item, pending_count))
+    else:
+        del review_page_state["salons"][salon_id]
+        combo.removeItem(index)
+
+
+def load_reviews_page(salon_id, append=False):
+    table = getattr(main, "tblReviews", None)
+    headers = ["Номер", "Клиент", "Оценка", "Комментарий", "Дата"]
+    if table is None:
+        return
+
+    if not append:
+        review_page_state["salon_id"] = salon_id
+        review_page_state["cursor"] = None
+
+    if salon_id is None:
+        executor.cancel("reviews")
+        populate_table(table, headers, [])
+        return
+
+    cursor = review_page_state["cursor"]
+
+    def apply_page(result_rows):
+        set_table_loading(table, False)
+        if result_rows is None and append:
+            table.model().fail_page()
+            return
+        page, next_cursor, has_more = split_review_page(make_rows(ReviewRow, result_rows or []), cursor)
+        review_page_state["cursor"] = next_cursor
+        rows = [list(item) for item in page]
+        if append:
+            table.model().append_rows(rows, page, has_more)
+            return
+        populate_table(
+            table,
+            headers,
+            rows,
+            page,
+            page_loader=(lambda: load_reviews_page(salon_id, append=True)) if has_more else None,
+        )
+        table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+
+    set_table_loading(table, True)
+    sql, params = build_review_queue_query(salon_id, cursor)
+    retry = table.model().retry_page if append else None
+    submit_query("reviews", sql, params, "Загрузка отзывов на модерацию", apply_page, retry)
+
+
+def populate_user_role_filter(selected_role=None):
+    combo = getattr(main, "cbUserRole", None)
+    if combo is None:
+        return
+
+    def apply_roles(result_rows):
+        roles = make_rows(RoleRow, result_rows or [])
+
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItem("Все роли", None)
+        for role in roles:
+            combo.addItem(role.name, role.id)
+
+        index = 0
+        if selected_role is not None:
+            found_index = combo.findData(selected_role)
+            if found_index != -1:
+                index = found_index
+        combo.setCurrentIndex(index)
+        combo.blockSignals(False)
+
+    submit_query("roles", ROLES_SQL, None, "Загрузка списка ролей", apply_roles)
+
+
+def load_users(append=False):
     table = getattr(main, "tblUsers", None)
-    headers = ["ID", "ФИО", "Телефон", "Email", "Роль"]
+    headers = ["ID", "ФИО", "Телефон", "Email", "Роль", "Создан"]
+    if table is None:
+        return
+
+    if not append:
+        user_page_state["cursor"] = None
+    cursor = user_page_state["cursor"]
+    filters = {"search": user_page_state["search"], "role_id": user_page_state["role_id"]}
+
+    def apply_page(result_rows):
+        set_table_loading(table, False)
+        if result_rows is None and append:
+            table.model().fail_page()
+            return
+        page, next_cursor, has_more = split_user_page(make_rows(UserRow, result_rows or []), cursor)
+        user_page_state["cursor"] = next_cursor
+        rows = [list(item) for item in page]
+        if append:
+            table.model().append_rows(rows, page, has_more)
+            return
+        populate_table(
+            table,
+            headers,
+            rows,
+            page,
+            page_loader=(lambda: load_users(append=True)) if has_more else None,
+        )
+
+    set_table_loading(table, True)
+    sql, params = build_user_directory_query(filters, cursor)
+    retry = table.model().retry_page if append else None
+    submit_query("users", sql, params, "Загрузка пользователей", apply_page, retry)
 
-    sql = (
-        "SELECT u.id, u.full_name, u.phone, u.email, r.name AS role_name "
-        "FROM users u "
-        "JOIN roles r ON r.id = u.role_id "
-        "ORDER BY u.created_at DESC"
-    )
-    query = execute_select(sql, context="Загрузка пользователей")
-    rows = []
-    if query is not None:
-        while query.next():
-            rows.append([
-                query.value("id"),
-                query.value("full_name"),
-                query.value("phone"),
-                query.value("email"),
-                query.value("role_name"),
-            ])
-    populate_table(table, headers, rows)
+
+def on_apply_user_filter():
+    user_search_timer.stop()
+    search_edit = getattr(main, "leUserSearch", None)
+    role_combo = getattr(main, "cbUserRole", None)
+    user_page_state["search"] = search_edit.text() if search_edit is not None else ""
+    user_page_state["role_id"] = role_combo.currentData() if role_combo is not None else None
+    load_users()
 
 
 def get_selected_row_payload(table):
-    if table is None or table.rowCount() == 0:
+    if table is None or table_row_count(table) == 0:
         return None
 
     selection_model = table.selectionModel()
@@ -645,29 +1363,79 @@ def get_selected_row_payload(table):
         return None
 
     row = selected_rows[0].row()
-    item = table.item(row, 0)
-    if item is None:
-        return None
-    payload = item.data(Qt.UserRole)
+    payload = table.model().payload(row)
     if payload is None:
         return None
     return row, payload
 
 
-def load_data_for_role(role, user):
-    if role == "client":
-        load_catalog(update_filters=True)
-        load_bookings(user["id"] if user else None)
-    elif role == "salon":
-        load_catalog(update_filters=True)
-        load_salon_services()
-    elif role == "admin":
-        load_catalog(update_filters=True)
-        load_salon_services()
-        load_users()
-    else:
-        load_catalog(update_filters=True)
-        load_bookings(None)
+def load_catalog_tab():
+    load_catalog(update_filters=True)
+
+
+def load_bookings_tab():
+    load_bookings(current_user.id if current_user else None)
+
+
+def load_admin_tab():
+    populate_user_role_filter(user_page_state["role_id"])
+    load_users()
+    load_review_salons()
+
+
+TAB_LOADERS = {
+    "catalog": load_catalog_tab,
+    "book": load_bookings_tab,
+    "salon": load_salon_services,
+    "admin": load_admin_tab,
+}
+
+
+def tab_key(widget):
+    return next((key for key, tab in built_tabs.items() if tab is widget), None)
+
+
+def tab_is_fresh(key):
+    loaded_at = tab_loaded_at.get(key)
+    return loaded_at is not None and time.monotonic() - loaded_at < TAB_MAX_AGE_S
+
+
+def load_tab(key):
+    if key is None or tab_is_fresh(key):
+        return False
+    tab_loaded_at[key] = time.monotonic()
+    TAB_LOADERS[key]()
+    return True
+
+
+def invalidate_tabs(keys=None):
+    for key in list(tab_loaded_at) if keys is None else keys:
+        tab_loaded_at.pop(key, None)
+
+
+def on_tab_changed(index):
+    if main is None or index < 0:
+        return
+    load_tab(tab_key(main.twMain.widget(index)))
+    prefetch_timer.start()
+
+
+def prefetch_adjacent_tabs():
+    if main is None:
+        return
+    if executor.is_busy():
+        prefetch_timer.start()
+        return
+
+    tabs = main.twMain
+    visible = [index for index in range(tabs.count()) if tabs.isTabVisible(index)]
+    current = tabs.currentIndex()
+    if current not in visible:
+        return
+    position = visible.index(current)
+    for neighbour in (position + 1, position - 1):
+        if 0 <= neighbour < len(visible):
+            load_tab(tab_key(tabs.widget(visible[neighbour])))
 
 
 def configure_role_controls(role):
@@ -690,11 +1458,45 @@ def configure_role_controls(role):
         main.btnDeleteService.setEnabled(manage_services)
     if hasattr(main, "btnSaveService"):
         main.btnSaveService.setEnabled(manage_services)
+    if hasattr(main, "btnGenerateSchedule"):
+        main.btnGenerateSchedule.setEnabled(manage_services)
 
     if hasattr(main, "btnDeleteUser"):
         main.btnDeleteUser.setEnabled(is_admin)
     if hasattr(main, "btnApproveReview"):
-        main.btnApproveReview.setEnabled(False)
+        main.btnApproveReview.setEnabled(is_admin)
+    if hasattr(main, "btnRejectReview"):
+        main.btnRejectReview.setEnabled(is_admin)
+
+
+def build_main_window():
+    global main
+
+    if main is not None:
+        return main
+    main = load_form("MainWindow")
+    main.twMain.currentChanged.connect(on_tab_changed)
+    export_shortcut = QShortcut(QKeySequence("Ctrl+Shift+M"), main)
+    export_shortcut.activated.connect(export_metrics)
+    return main
+
+
+def build_tab(key):
+    widget = built_tabs.get(key)
+    if widget is not None:
+        return widget
+
+    widget = load_form(TAB_FORMS[key])
+    order = list(TAB_FORMS)
+    position = sum(1 for other in built_tabs if order.index(other) < order.index(key))
+    main.twMain.insertTab(position, widget, widget.windowTitle())
+    setattr(main, widget.objectName(), widget)
+    for name, child in vars(widget).items():
+        if isinstance(child, QObject) and child.objectName() == name:
+            setattr(main, name, child)
+    built_tabs[key] = widget
+    TAB_SIGNALS[key]()
+    return widget
 
 
 def setup_role(role, user=None):
@@ -703,55 +1505,48 @@ def setup_role(role, user=None):
     catalog_filters_initialized = False
     catalog_filter_state["city"] = None
     catalog_filter_state["search"] = ""
-
-    tabs = {
-        "catalog": getattr(main, "tabCatalog", None),
-        "book": getattr(main, "tabBookings", None),
-        "salon": getattr(main, "tabSalon", None),
-        "admin": getattr(main, "tabAdmin", None),
-    }
-
-    for widget in tabs.values():
-        if widget:
-            index = main.twMain.indexOf(widget)
-            if index != -1:
-                main.twMain.setTabVisible(index, False)
-
-    def show_tabs(keys, title):
-        first_visible = None
-        for key in keys:
-            widget = tabs.get(key)
-            if not widget:
-                continue
-            index = main.twMain.indexOf(widget)
-            if index == -1:
-                continue
-            main.twMain.setTabVisible(index, True)
-            if first_visible is None:
-                first_visible = widget
-
-        if first_visible is not None:
-            main.twMain.setCurrentWidget(first_visible)
-
-        window_title = title
-        if user and user.get("full_name"):
-            window_title = f"{title} ({user['full_name']})"
-        main.setWindowTitle(window_title)
+    catalog_filter_state["service_id"] = None
+    catalog_filter_state["price_min"] = None
+    catalog_filter_state["price_max"] = None
+    catalog_filter_state["sort"] = None
 
     role_key = (role or "").strip().casefold()
     canonical_role = ROLE_ALIASES.get(role_key)
 
     if canonical_role:
         config = ROLE_CONFIGS[canonical_role]
-        show_tabs(config["tabs"], config["title"])
+        keys, title = config["tabs"], config["title"]
     else:
-        available_tabs = tuple(key for key, widget in tabs.items() if widget)
-        title = f"Smart-SPA — {role or 'Пользователь'}"
-        show_tabs(available_tabs, title)
+        keys, title = tuple(TAB_FORMS), f"Smart-SPA — {role or 'Пользователь'}"
+
+    build_main_window()
+    invalidate_tabs()
+    main.twMain.blockSignals(True)
+    for key in keys:
+        build_tab(key)
+
+    for widget in built_tabs.values():
+        main.twMain.setTabVisible(main.twMain.indexOf(widget), False)
+
+    first_visible = None
+    for key in keys:
+        widget = built_tabs[key]
+        main.twMain.setTabVisible(main.twMain.indexOf(widget), True)
+        if first_visible is None:
+            first_visible = widget
+
+    if first_visible is not None:
+        main.twMain.setCurrentWidget(first_visible)
+    main.twMain.blockSignals(False)
+
+    window_title = title
+    if user and user.full_name:
+        window_title = f"{title} ({user.full_name})"
+    main.setWindowTitle(window_title)
 
     current_role = canonical_role
     configure_role_controls(canonical_role)
-    load_data_for_role(canonical_role, user)
+    on_tab_changed(main.twMain.currentIndex())
 
 
 def on_login():
@@ -763,6 +1558,8 @@ def on_login():
     if not username:
         QMessageBox.warning(login, "Ошибка", "Введите логин!")
         return
+    if not open_database():
+        return
 
     user = find_user(username)
     if user is None:
@@ -773,7 +1570,7 @@ def on_login():
         )
         resolved_role = role_text
     else:
-        resolved_role = user.get("role_code") or role_text
+        resolved_role = user.role_code or role_text
 
     current_user = user
     login.close()
@@ -783,13 +1580,18 @@ def on_login():
 
 app = QApplication(sys.argv)
 
-if not connect_db():
-    sys.exit(1)
-
-login = load_ui("ui/LoginWindow.ui")
-main = load_ui("ui/MainWindow.ui")
+configure(instrumentation=instrumentation, error_handler=show_db_error)
+executor = QueryExecutor(statement_cache=statement_cache, instrumentation=instrumentation)
+instrumentation.set_explainer(executor.submit_explain)
+executor.resultReady.connect(on_query_result)
+executor.queryFailed.connect(on_query_failed)
+app.aboutToQuit.connect(executor.shutdown)
+app.aboutToQuit.connect(lambda: export_metrics(quiet=True))
 
+login = load_form("LoginWindow")
+login_button_text = login.btnLogin.text()
 login.btnLogin.clicked.connect(on_login)
+
 def on_cancel_booking():
     if current_user is None:
         QMessageBox.information(
@@ -799,9 +1601,15 @@ def on_cancel_booking():
         )
         return
 
+    bookings_tabs = getattr(main, "twBookings", None)
+    history_tab = getattr(main, "tabBookingsHistory", None)
+    if bookings_tabs is not None and history_tab is not None and bookings_tabs.currentWidget() is history_tab:
+        QMessageBox.information(main, "Отмена записи", "Отменить можно только предстоящие записи.")
+        return
+
     table = getattr(main, "tblBookings", None)
-    if table is None or table.rowCount() == 0:
-        QMessageBox.information(main, "Отмена записи", "У вас пока нет записей.")
+    if table is None or table_row_count(table) == 0:
+        QMessageBox.information(main, "Отмена записи", "У вас нет предстоящих записей.")
         return
 
     selection_model = table.selectionModel()
@@ -823,26 +1631,18 @@ def on_cancel_booking():
         return
 
     row = selected_rows[0].row()
-    id_item = table.item(row, 0)
-    if id_item is None:
+    payload = table.model().payload(row)
+    if payload is None:
         QMessageBox.warning(main, "Отмена записи", "Не удалось определить выбранную запись.")
         return
 
     try:
-        appointment_id = int(id_item.text())
+        appointment_id = int(payload.id)
     except (TypeError, ValueError):
         QMessageBox.warning(main, "Отмена записи", "Некорректный идентификатор записи.")
         return
 
-    status_query = execute_select(
-        "SELECT status FROM appointments WHERE id = ?", [appointment_id], "Проверка статуса записи"
-    )
-    if status_query is None or not status_query.next():
-        QMessageBox.warning(main, "Отмена записи", "Запись не найдена в базе данных.")
-        return
-
-    current_status = status_query.value("status")
-    if current_status not in {"ожидает подтверждения", "подтверждена"}:
+    if payload.status not in CANCELLABLE_STATUSES:
         QMessageBox.information(
             main,
             "Отмена записи",
@@ -860,16 +1660,21 @@ def on_cancel_booking():
     if confirm != QMessageBox.Yes:
         return
 
-    query = QSqlQuery()
-    query.prepare("SELECT cancel_appointment(?)")
-    query.addBindValue(appointment_id)
-
-    if not query.exec():
-        show_db_error(query, "Отмена записи")
+    cancelled = cancel_appointment(appointment_id, payload.start_ts)
+    if cancelled is None:
+        return
+    if not cancelled:
+        current_status = fetch_appointment_status(appointment_id, payload.start_ts)
+        if current_status is not None:
+            apply_booking_change(payload._replace(status=current_status))
+        QMessageBox.information(
+            main,
+            "Отмена записи",
+            "Запись уже нельзя отменить: её статус изменился.",
+        )
         return
 
-    load_bookings(current_user.get("id"))
-    load_catalog()
+    apply_booking_change(payload._replace(status=CANCELLED_STATUS))
 
     QMessageBox.information(main, "Запись отменена", "Выбранная запись успешно отменена.")
 
@@ -888,7 +1693,7 @@ def on_add_booking():
         main.twMain.setCurrentWidget(catalog_tab)
 
     catalog_table = getattr(main, "tblCatalog", None)
-    if catalog_table is None or catalog_table.rowCount() == 0:
+    if catalog_table is None or table_row_count(catalog_table) == 0:
         QMessageBox.information(main, "Добавление записи", "Каталог пока пуст, выбирать нечего.")
         return
 
@@ -906,17 +1711,14 @@ def on_add_booking():
 
 
 def on_add_service():
-    salons = fetch_salons()
+    salons = fetch_salons() or []
     if not salons:
         QMessageBox.information(main, "Добавление услуги", "В базе пока нет салонов.")
         return
 
     salon = salons[0]
     if len(salons) > 1:
-        options = [
-            f"{item['name']} ({item['city']})" if item.get("city") else item["name"]
-            for item in salons
-        ]
+        options = [f"{item.name} ({item.city})" if item.city else item.name for item in salons]
         selection, accepted = QInputDialog.getItem(
             main,
             "Выбор салона",
@@ -932,7 +1734,7 @@ def on_add_service():
         except ValueError:
             return
 
-    available = fetch_available_services_for_salon(salon.get("id"))
+    available = fetch_available_services(salon.id) or []
     if not available:
         QMessageBox.information(
             main,
@@ -943,13 +1745,11 @@ def on_add_service():
 
     service_options = []
     for service in available:
-        details = [service.get("name") or "Услуга"]
-        duration = service.get("duration_min")
-        if duration:
-            details.append(f"{duration} мин")
-        base_price = service.get("base_price")
-        if base_price is not None:
-            details.append(format_price(base_price))
+        details = [service.name or "Услуга"]
+        if service.duration_min:
+            details.append(f"{service.duration_min} мин")
+        if service.base_price is not None:
+            details.append(format_price(service.base_price))
         service_options.append(" — ".join(details))
 
     selection, accepted = QInputDialog.getItem(
@@ -968,11 +1768,11 @@ def on_add_service():
     except ValueError:
         return
 
-    base_price = parse_decimal(service.get("base_price"), Decimal("0"))
+    base_price = parse_decimal(service.base_price, Decimal("0"))
     price_value, ok = QInputDialog.getDouble(
         main,
         "Цена услуги",
-        f"Укажите стоимость для «{service.get('name')}»:",
+        f"Укажите стоимость для «{service.name}»:",
         float(base_price),
         0.0,
         1_000_000.0,
@@ -981,20 +1781,16 @@ def on_add_service():
     if not ok:
         return
 
-    if not execute_action(
-        "INSERT INTO salon_services (salon_id, service_id, price) VALUES (?, ?, ?)",
-        [salon.get("id"), service.get("id"), round(price_value, 2)],
-        "Добавление услуги в салон",
-    ):
+    added = add_salon_service(salon.id, service.id, round(price_value, 2))
+    if not added:
         return
 
-    load_salon_services()
-    load_catalog()
+    apply_salon_service_change((salon.id, service.id), added[0])
 
     QMessageBox.information(
         main,
         "Услуга добавлена",
-        f"Услуга «{service.get('name')}» добавлена в салон «{salon.get('name')}».",
+        f"Услуга «{service.name}» добавлена в салон «{salon.name}».",
     )
 
 
@@ -1014,7 +1810,7 @@ def on_delete_service():
         main,
         "Удаление услуги",
         (
-            f"Удалить услугу «{payload.get('service_name')}» из салона «{payload.get('salon_name')}»?\n"
+            f"Удалить услугу «{payload.service_name}» из салона «{payload.salon_name}»?\n"
             "Записи клиентов, связанные с этой услугой, могут стать недоступны."
         ),
         QMessageBox.Yes | QMessageBox.No,
@@ -1023,15 +1819,10 @@ def on_delete_service():
     if confirm != QMessageBox.Yes:
         return
 
-    if not execute_action(
-        "DELETE FROM salon_services WHERE salon_id = ? AND service_id = ?",
-        [payload.get("salon_id"), payload.get("service_id")],
-        "Удаление услуги салона",
-    ):
+    if not delete_salon_service(payload.salon_id, payload.service_id):
         return
 
-    load_salon_services()
-    load_catalog()
+    apply_salon_service_change((payload.salon_id, payload.service_id))
 
     QMessageBox.information(main, "Услуга удалена", "Услуга успешно удалена из салона.")
 
@@ -1048,17 +1839,17 @@ def on_save_service():
         return
 
     row, payload = selection
-    price_item = table.item(row, 3) if table else None
-    current_price = parse_decimal(payload.get("price"), Decimal("0"))
-    if price_item is not None:
-        current_price = parse_decimal(price_item.text(), current_price)
+    current_price = parse_decimal(payload.price, Decimal("0"))
+    price_value = table.model().value(row, 3)
+    if price_value is not None:
+        current_price = parse_decimal(price_value, current_price)
 
     new_price, ok = QInputDialog.getDouble(
         main,
         "Изменение цены",
         (
-            f"Укажите новую цену для «{payload.get('service_name')}»\n"
-            f"в салоне «{payload.get('salon_name')}»."
+            f"Укажите новую цену для «{payload.service_name}»\n"
+            f"в салоне «{payload.salon_name}»."
         ),
         float(current_price),
         0.0,
@@ -1068,22 +1859,21 @@ def on_save_service():
     if not ok:
         return
 
-    if not execute_action(
-        "UPDATE salon_services SET price = ? WHERE salon_id = ? AND service_id = ?",
-        [round(new_price, 2), payload.get("salon_id"), payload.get("service_id")],
-        "Обновление цены услуги",
-    ):
+    updated = update_salon_service_price(payload.salon_id, payload.service_id, round(new_price, 2))
+    if updated is None:
         return
 
-    load_salon_services()
-    load_catalog()
+    apply_salon_service_change((payload.salon_id, payload.service_id), updated[0] if updated else None)
+    if not updated:
+        QMessageBox.information(main, "Изменение цены", "Услуга уже удалена из салона.")
+        return
 
     QMessageBox.information(main, "Цена обновлена", "Стоимость услуги успешно изменена.")
 
 
 def on_delete_user():
     table = getattr(main, "tblUsers", None)
-    if table is None or table.rowCount() == 0:
+    if table is None or table_row_count(table) == 0:
         QMessageBox.information(main, "Удаление пользователя", "Список пользователей пуст.")
         return
 
@@ -1097,19 +1887,18 @@ def on_delete_user():
         return
 
     row = selection_model.selectedRows()[0].row()
-    id_item = table.item(row, 0)
-    name_item = table.item(row, 1)
-    if id_item is None:
+    payload = table.model().payload(row)
+    if payload is None:
         QMessageBox.warning(main, "Удаление пользователя", "Не удалось определить пользователя.")
         return
 
     try:
-        user_id = int(id_item.text())
+        user_id = int(payload.id)
     except (TypeError, ValueError):
         QMessageBox.warning(main, "Удаление пользователя", "Некорректный идентификатор пользователя.")
         return
 
-    if current_user and current_user.get("id") == user_id:
+    if current_user and current_user.id == user_id:
         QMessageBox.warning(
             main,
             "Удаление пользователя",
@@ -1117,7 +1906,7 @@ def on_delete_user():
         )
         return
 
-    user_name = name_item.text() if name_item else "пользователь"
+    user_name = payload.full_name or "пользователь"
     confirm = QMessageBox.question(
         main,
         "Удаление пользователя",
@@ -1128,56 +1917,251 @@ def on_delete_user():
     if confirm != QMessageBox.Yes:
         return
 
-    if not execute_action(
-        "DELETE FROM users WHERE id = ?",
-        [user_id],
-        "Удаление пользователя",
-    ):
+    if not delete_user(user_id):
         return
 
-    load_users()
+    apply_row_change("tblUsers", user_id)
+    model = table.model()
+    if model.loaded_count() == 0 and model.has_more_pages():
+        load_users()
     QMessageBox.information(main, "Пользователь удалён", "Пользователь успешно удалён.")
 
 
-def on_approve_review():
+def on_generate_schedule():
+    masters = fetch_masters() or []
+    if not masters:
+        QMessageBox.information(main, "Расписание", "В базе пока нет активных мастеров.")
+        return
+
+    options = ["Все мастера"] + [
+        f"{item.full_name} ({item.salon_name})" for item in masters
+    ]
+    selection, accepted = QInputDialog.getItem(
+        main,
+        "Расписание",
+        "Для кого создать свободные слоты:",
+        options,
+        0,
+        False,
+    )
+    if not accepted:
+        return
+    try:
+        selected_index = options.index(selection)
+    except ValueError:
+        return
+    master_id = masters[selected_index - 1].id if selected_index > 0 else None
+
+    days, ok = QInputDialog.getInt(
+        main,
+        "Расписание",
+        "На сколько дней вперёд (начиная с завтра):",
+        14,
+        1,
+        180,
+    )
+    if not ok:
+        return
+
+    step_min, ok = QInputDialog.getInt(
+        main,
+        "Расписание",
+        "Длительность слота (мин):",
+        60,
+        15,
+        240,
+        15,
+    )
+    if not ok:
+        return
+
+    created = generate_schedule(master_id, days, step_min)
+    if created is None:
+        return
+
     QMessageBox.information(
         main,
-        "Отзывы",
-        "Функция модерации отзывов пока недоступна в клиентском приложении.",
+        "Расписание",
+        f"Создано свободных слотов: {created or 0}.\nУже занятое время мастеров пропущено.",
     )
 
 
-main.btnApply.clicked.connect(on_apply_filter)
-main.btnBookNow.clicked.connect(on_book_now)
+def export_metrics(quiet=False):
+    try:
+        path = instrumentation.export()
+    except OSError as error:
+        if not quiet:
+            QMessageBox.warning(main, "Метрики", f"Не удалось сохранить метрики:\n{error}")
+        return None
+    if path and not quiet:
+        QMessageBox.information(main, "Метрики", f"Сводка по запросам сохранена в {path}.")
+    return path
 
-if hasattr(main, "btnCancelBooking"):
-    main.btnCancelBooking.clicked.connect(on_cancel_booking)
 
-if hasattr(main, "btnAddBooking"):
-    main.btnAddBooking.clicked.connect(on_add_booking)
+def moderate_selected_reviews(moderate, title, done_text):
+    table = getattr(main, "tblReviews", None)
+    selection_model = table.selectionModel() if table is not None else None
+    if selection_model is None or not selection_model.hasSelection():
+        QMessageBox.information(main, title, "Выберите один или несколько отзывов в таблице.")
+        return
+
+    model = table.model()
+    review_ids = [
+        payload.id
+        for payload in (model.payload(index.row()) for index in selection_model.selectedRows())
+        if payload is not None
+    ]
+    if not review_ids:
+        QMessageBox.warning(main, title, "Не удалось определить выбранные отзывы.")
+        return
+
+    moderated = moderate(review_ids)
+    if moderated is None:
+        return
+
+    for review_id in review_ids:
+        apply_row_change("tblReviews", review_id)
+    salon_id = review_page_state["salon_id"]
+    salon_ids = {item.salon_id for item in moderated}
+    queue_changes("ratings", salon_ids)
+    if salon_id in review_page_state["salons"] and model.loaded_count() == 0 and model.has_more_pages():
+        load_reviews_page(salon_id)
+
+    message = f"{done_text}: {len(moderated)}."
+    skipped = len(review_ids) - len(moderated)
+    if skipped:
+        message += f"\nУже обработаны ранее: {skipped}."
+    QMessageBox.information(main, title, message)
+
+
+def on_approve_review():
+    moderate_selected_reviews(approve_reviews, "Одобрение отзывов", "Одобрено отзывов")
+
+
+def on_reject_review():
+    moderate_selected_reviews(reject_reviews, "Отклонение отзывов", "Отклонено отзывов")
+
+
+def probe_database():
+    login.btnLogin.setEnabled(False)
+    login.btnLogin.setText("Подключение к БД…")
+    submit_query("connection_probe", "SELECT 1", None, "Подключение к БД", on_database_probed)
+
+
+def on_database_probed(result_rows):
+    if result_rows is None:
+        app.exit(1)
+        return
+    if open_database():
+        login.btnLogin.setText(login_button_text)
+        login.btnLogin.setEnabled(True)
+
+
+def open_database():
+    if QSqlDatabase.contains():
+        return True
+    if not connect_db():
+        app.exit(1)
+        return False
+    change_feed.start()
+    change_timer.start()
+    return True
+
+
+def connect_catalog_tab():
+    if hasattr(main, "btnApply"):
+        main.btnApply.clicked.connect(on_apply_filter)
+
+    if hasattr(main, "btnBookNow"):
+        main.btnBookNow.clicked.connect(on_book_now)
+
+    if hasattr(main, "leSearch"):
+        main.leSearch.returnPressed.connect(on_apply_filter)
+        main.leSearch.textChanged.connect(lambda *_: search_timer.start())
 
-if hasattr(main, "btnAddService"):
-    main.btnAddService.clicked.connect(on_add_service)
+    for filter_combo in ("cbCity", "cbService", "cbCPriceMin", "cbPriceMax", "cbSort"):
+        if hasattr(main, filter_combo):
+            getattr(main, filter_combo).currentIndexChanged.connect(lambda *_: on_apply_filter())
 
-if hasattr(main, "btnDeleteService"):
-    main.btnDeleteService.clicked.connect(on_delete_service)
 
-if hasattr(main, "btnSaveService"):
-    main.btnSaveService.clicked.connect(on_save_service)
+def connect_bookings_tab():
+    if hasattr(main, "btnCancelBooking"):
+        main.btnCancelBooking.clicked.connect(on_cancel_booking)
+
+    if hasattr(main, "btnAddBooking"):
+        main.btnAddBooking.clicked.connect(on_add_booking)
+
+
+def connect_salon_tab():
+    if hasattr(main, "btnAddService"):
+        main.btnAddService.clicked.connect(on_add_service)
+
+    if hasattr(main, "btnDeleteService"):
+        main.btnDeleteService.clicked.connect(on_delete_service)
+
+    if hasattr(main, "btnSaveService"):
+        main.btnSaveService.clicked.connect(on_save_service)
+
+    if hasattr(main, "btnGenerateSchedule"):
+        main.btnGenerateSchedule.clicked.connect(on_generate_schedule)
+
+
+def connect_admin_tab():
+    if hasattr(main, "btnDeleteUser"):
+        main.btnDeleteUser.clicked.connect(on_delete_user)
+
+    if hasattr(main, "btnApproveReview"):
+        main.btnApproveReview.clicked.connect(on_approve_review)
+
+    if hasattr(main, "btnRejectReview"):
+        main.btnRejectReview.clicked.connect(on_reject_review)
+
+    if hasattr(main, "leUserSearch"):
+        main.leUserSearch.returnPressed.connect(on_apply_user_filter)
+        main.leUserSearch.textChanged.connect(lambda *_: user_search_timer.start())
+
+    if hasattr(main, "cbUserRole"):
+        main.cbUserRole.currentIndexChanged.connect(lambda *_: on_apply_user_filter())
+
+    if hasattr(main, "cbReviewSalon"):
+        main.cbReviewSalon.currentIndexChanged.connect(
+            lambda *_: load_reviews_page(main.cbReviewSalon.currentData())
+        )
+
+
+TAB_SIGNALS = {
+    "catalog": connect_catalog_tab,
+    "book": connect_bookings_tab,
+    "salon": connect_salon_tab,
+    "admin": connect_admin_tab,
+}
 
-if hasattr(main, "btnDeleteUser"):
-    main.btnDeleteUser.clicked.connect(on_delete_user)
+search_timer = QTimer()
+search_timer.setSingleShot(True)
+search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+search_timer.timeout.connect(on_apply_filter)
 
-if hasattr(main, "btnApproveReview"):
-    main.btnApproveReview.clicked.connect(on_approve_review)
+user_search_timer = QTimer()
+user_search_timer.setSingleShot(True)
+user_search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+user_search_timer.timeout.connect(on_apply_user_filter)
 
-if hasattr(main, "leSearch"):
-    main.leSearch.returnPressed.connect(on_apply_filter)
+prefetch_timer = QTimer()
+prefetch_timer.setSingleShot(True)
+prefetch_timer.setInterval(TAB_PREFETCH_DELAY_MS)
+prefetch_timer.timeout.connect(prefetch_adjacent_tabs)
 
-if hasattr(main, "cbCity"):
-    main.cbCity.currentIndexChanged.connect(lambda *_: on_apply_filter())
+change_flush_timer = QTimer()
+change_flush_timer.setSingleShot(True)
+change_flush_timer.setInterval(CHANGE_FLUSH_DELAY_MS)
+change_flush_timer.timeout.connect(flush_data_changes)
 
-configure_role_controls(None)
+change_feed = ChangeFeed(on_data_change)
+app.aboutToQuit.connect(change_feed.stop)
+change_timer = QTimer()
+change_timer.setInterval(int(DB_SETTINGS["health_check_interval"] * 1000))
+change_timer.timeout.connect(change_feed.check)
 
 login.show()
+probe_database()
 sys.exit(app.exec())
@@ -0,0 +1,33 @@
+import sys
+
+from PySide6.QtCore import QCoreApplication
+
+from db import DB_SETTINGS, create_connection
+from spa_data import DataError, maintain_partitions
+
+
+def main():
+    months_ahead = int(sys.argv[1]) if len(sys.argv) > 1 else DB_SETTINGS["partition_months_ahead"]
+    keep_months = int(sys.argv[2]) if len(sys.argv) > 2 else DB_SETTINGS["partition_keep_months"]
+
+    app = QCoreApplication(sys.argv[:1])
+    try:
+        db = create_connection("smart_spa_maintenance")
+    except ConnectionError as error:
+        raise SystemExit(str(error))
+    if not db.open():
+        raise SystemExit(f"Не удалось подключиться к БД: {db.lastError().text()}")
+    try:
+        result = maintain_partitions(months_ahead, keep_months or None, db)
+    except DataError as error:
+        raise SystemExit(str(error))
+    finally:
+        db.close()
+        app.quit()
+    if result is None:
+        raise SystemExit("Обслуживание секций не вернуло результата: проверьте функцию maintain_partitions в БД.")
+    print(f"Создано секций: {result.created}, перенесено в архив: {result.archived}")
+
+
+if __name__ == "__main__":
+    main()
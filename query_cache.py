@@ -0,0 +1,55 @@
+import time
+from collections import OrderedDict
+
+
+class QueryCache:
+    def __init__(self, max_entries=32, ttl=120.0):
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.peek(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self._ttl:
+            del self._entries[key]
+            return None
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def items(self):
+        now = time.monotonic()
+        expired = [key for key, (stored_at, _) in self._entries.items() if now - stored_at > self._ttl]
+        for key in expired:
+            del self._entries[key]
+        return [(key, value) for key, (_, value) in reversed(self._entries.items())]
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,253 @@
+import itertools
+import queue
+import threading
+import time
+
+from PySide6.QtCore import QObject, QThread, Signal
+from PySide6.QtSql import QSqlQuery
+
+from db import ConnectionPool, PoolExhausted, connection_lost
+from statement_cache import StatementCache
+
+
+EXPLAIN_TASK = object()
+
+
+class QueryWorker(QThread):
+    queryFinished = Signal(object, object, object)
+    queryFailed = Signal(object, object, str, str, str)
+
+    def __init__(self, executor):
+        super().__init__()
+        self._executor = executor
+
+    def run(self):
+        pool = self._executor.pool
+        self._warm_up(pool)
+        while True:
+            task = self._executor.next_task()
+            if task is None:
+                break
+            if task[0] is EXPLAIN_TASK:
+                self._run_explain(pool, *task[1:])
+            else:
+                self._run_task(pool, *task)
+        pool.close_thread_connection()
+
+    def _warm_up(self, pool):
+        try:
+            with pool.connection():
+                pass
+        except (ConnectionError, PoolExhausted):
+            pass
+
+    def _run_explain(self, pool, site, elapsed_ms, rows, sql, params):
+        try:
+            with pool.connection() as db:
+                self._executor.instrumentation.explain(db, site, elapsed_ms, rows, sql, params)
+        except (ConnectionError, PoolExhausted):
+            pass
+
+    def _run_task(self, pool, key, request_id, sql, params, context, runner):
+        try:
+            db = pool.acquire()
+        except (ConnectionError, PoolExhausted) as error:
+            self.queryFailed.emit(key, request_id, context, str(error), "")
+            return
+
+        try:
+            if not self._executor.start_task(key, request_id, pool.backend_pid(db)):
+                return
+            started = time.perf_counter()
+            try:
+                if runner is not None:
+                    rows, error = runner(db, sql, params)
+                else:
+                    rows, error = self._execute(db, sql, params)
+                    if error is not None and connection_lost(db, error) and pool.reconnect(db):
+                        rows, error = self._execute(db, sql, params)
+            finally:
+                self._executor.finish_task(key, request_id)
+            instrumentation = self._executor.instrumentation
+            if instrumentation is not None:
+                instrumentation.record_query(
+                    context,
+                    (time.perf_counter() - started) * 1000,
+                    len(rows) if rows else 0,
+                    error is not None,
+                    sql,
+                    params,
+                )
+        finally:
+            pool.release(db)
+
+        if error is not None:
+            self.queryFailed.emit(
+                key,
+                request_id,
+                context,
+                error.text() or "Ошибка выполнения запроса.",
+                error.nativeErrorCode(),
+            )
+        else:
+            self.queryFinished.emit(key, request_id, rows)
+
+    def _execute(self, db, sql, params):
+        query, ok = self._executor.statements.execute(db, sql, params)
+        if not ok:
+            return None, query.lastError()
+
+        record = query.record()
+        names = [record.fieldName(i) for i in range(record.count())]
+        rows = []
+        while query.next():
+            rows.append({name: query.value(i) for i, name in enumerate(names)})
+        return rows, None
+
+
+class QueryCanceller(QThread):
+    def __init__(self, executor):
+        super().__init__()
+        self._executor = executor
+
+    def run(self):
+        pool = self._executor.cancel_pool
+        while True:
+            task = self._executor.next_cancel()
+            if task is None:
+                break
+            self._cancel(pool, *task)
+        pool.close_thread_connection()
+
+    def _cancel(self, pool, key, request_id):
+        backend_pid = self._executor.begin_cancel(key, request_id)
+        if backend_pid is None:
+            return
+        try:
+            with pool.connection() as db:
+                query = QSqlQuery(db)
+                query.prepare("SELECT pg_cancel_backend(?)")
+                query.addBindValue(backend_pid)
+                query.exec()
+        except (ConnectionError, PoolExhausted):
+            pass
+        finally:
+            self._executor.end_cancel(request_id)
+
+
+class QueryExecutor(QObject):
+    resultReady = Signal(object, object, object)
+    queryFailed = Signal(object, object, str, str, str)
+
+    def __init__(self, worker_count=2, statement_cache=None, instrumentation=None, parent=None):
+        super().__init__(parent)
+        self.statements = statement_cache or StatementCache()
+        self.instrumentation = instrumentation
+        self._tasks = queue.Queue()
+        self._cancels = queue.Queue()
+        self._lock = threading.Lock()
+        self._cancelled = threading.Condition(self._lock)
+        self._ids = itertools.count(1)
+        self._latest = {}
+        self._running = {}
+        self._cancelling = set()
+        self.pool = ConnectionPool(
+            min_size=worker_count,
+            max_size=worker_count,
+            prefix="smart_spa_worker",
+        )
+        self._workers = []
+        for _ in range(worker_count):
+            worker = QueryWorker(self)
+            worker.queryFinished.connect(self._on_finished)
+            worker.queryFailed.connect(self._on_failed)
+            self._workers.append(worker)
+            worker.start()
+        self.cancel_pool = ConnectionPool(min_size=1, max_size=1, prefix="smart_spa_cancel")
+        self._canceller = QueryCanceller(self)
+        self._canceller.start()
+
+    def submit(self, key, sql, params=None, context="", runner=None):
+        request_id = next(self._ids)
+        with self._lock:
+            self._latest[key] = request_id
+            self._cancel_running(key)
+        self._tasks.put((key, request_id, sql, list(params or []), context, runner))
+        return request_id
+
+    def submit_explain(self, site, elapsed_ms, rows, sql, params=None):
+        self._tasks.put((EXPLAIN_TASK, site, elapsed_ms, rows, sql, list(params or [])))
+
+    def cancel(self, key):
+        with self._lock:
+            self._latest[key] = next(self._ids)
+            self._cancel_running(key)
+
+    def is_current(self, key, request_id):
+        with self._lock:
+            return self._latest.get(key) == request_id
+
+    def is_busy(self, key=None):
+        with self._lock:
+            if key is not None:
+                return key in self._running
+            return bool(self._running) or not self._tasks.empty()
+
+    def next_task(self):
+        return self._tasks.get()
+
+    def start_task(self, key, request_id, backend_pid):
+        with self._lock:
+            if self._latest.get(key) != request_id:
+                return False
+            self._running[key] = (request_id, backend_pid)
+            return True
+
+    def finish_task(self, key, request_id):
+        with self._lock:
+            while request_id in self._cancelling:
+                self._cancelled.wait()
+            running = self._running.get(key)
+            if running is not None and running[0] == request_id:
+                del self._running[key]
+
+    def shutdown(self):
+        with self._lock:
+            for key in list(self._running):
+                self._cancel_running(key)
+        for _ in self._workers:
+            self._tasks.put(None)
+        for worker in self._workers:
+            worker.wait()
+        self._cancels.put(None)
+        self._canceller.wait()
+
+    def next_cancel(self):
+        return self._cancels.get()
+
+    def begin_cancel(self, key, request_id):
+        with self._lock:
+            running = self._running.get(key)
+            if running is None or running[0] != request_id or request_id in self._cancelling:
+                return None
+            self._cancelling.add(request_id)
+            return running[1]
+
+    def end_cancel(self, request_id):
+        with self._lock:
+            self._cancelling.discard(request_id)
+            self._cancelled.notify_all()
+
+    def _cancel_running(self, key):
+        running = self._running.get(key)
+        if running is None or running[1] is None:
+            return
+        self._cancels.put((key, running[0]))
+
+    def _on_finished(self, key, request_id, rows):
+        if self.is_current(key, request_id):
+            self.resultReady.emit(key, request_id, rows)
+
+    def _on_failed(self, key, request_id, context, error_text, error_code):
+        if self.is_current(key, request_id):
+            self.queryFailed.emit(key, request_id, context, error_text, error_code)
@@ -4,6 +4,9 @@ SET datestyle TO 'ISO, DMY';
 CREATE SCHEMA IF NOT EXISTS smart_spa;
 SET search_path TO smart_spa, public;
 
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
 CREATE TABLE IF NOT EXISTS roles (
     id SERIAL PRIMARY KEY,
     code VARCHAR(32) UNIQUE NOT NULL,
@@ -19,6 +22,13 @@ CREATE TABLE IF NOT EXISTS users (
     role_id INTEGER NOT NULL REFERENCES roles(id),
     created_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
+DROP INDEX IF EXISTS idx_users_full_name_lower;
+DROP INDEX IF EXISTS idx_users_email_lower;
+CREATE INDEX IF NOT EXISTS idx_users_full_name_prefix ON users (lower(full_name) text_pattern_ops, id);
+CREATE INDEX IF NOT EXISTS idx_users_email_prefix ON users (lower(email) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_users_phone_prefix ON users (phone text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_users_created_at ON users (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_users_role_created_at ON users (role_id, created_at DESC, id DESC);
 
 CREATE TABLE IF NOT EXISTS salons (
     id BIGSERIAL PRIMARY KEY,
@@ -26,8 +36,13 @@ CREATE TABLE IF NOT EXISTS salons (
     city VARCHAR(120) NOT NULL,
     address VARCHAR(300) NOT NULL,
     phone VARCHAR(32),
-    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    search_tsv TSVECTOR
 );
+ALTER TABLE salons ADD COLUMN IF NOT EXISTS search_tsv TSVECTOR;
+CREATE INDEX IF NOT EXISTS idx_salons_city_name ON salons (city, name, id);
+CREATE INDEX IF NOT EXISTS idx_salons_search_tsv ON salons USING gin (search_tsv);
+CREATE INDEX IF NOT EXISTS idx_salons_name_trgm ON salons USING gin (name gin_trgm_ops);
 
 CREATE TABLE IF NOT EXISTS masters (
     id BIGSERIAL PRIMARY KEY,
@@ -42,86 +57,453 @@ CREATE TABLE IF NOT EXISTS services (
     name VARCHAR(200) NOT NULL,
     description TEXT,
     base_price NUMERIC(10,2) NOT NULL CHECK (base_price >= 0),
-    duration_min INTEGER NOT NULL CHECK (duration_min BETWEEN 15 AND 480)
+    duration_min INTEGER NOT NULL CHECK (duration_min BETWEEN 15 AND 480),
+    search_tsv TSVECTOR
 );
+ALTER TABLE services ADD COLUMN IF NOT EXISTS search_tsv TSVECTOR;
+CREATE INDEX IF NOT EXISTS idx_services_search_tsv ON services USING gin (search_tsv);
+CREATE INDEX IF NOT EXISTS idx_services_name_trgm ON services USING gin (name gin_trgm_ops);
 
 CREATE TABLE IF NOT EXISTS salon_services (
     salon_id BIGINT NOT NULL REFERENCES salons(id) ON DELETE CASCADE,
     service_id BIGINT NOT NULL REFERENCES services(id) ON DELETE CASCADE,
     price NUMERIC(10,2) CHECK (price >= 0),
+    effective_price NUMERIC(10,2),
     PRIMARY KEY (salon_id, service_id)
 );
+ALTER TABLE salon_services ADD COLUMN IF NOT EXISTS effective_price NUMERIC(10,2);
+DROP INDEX IF EXISTS idx_salon_services_service;
+DROP INDEX IF EXISTS idx_salon_services_effective_price;
+CREATE INDEX IF NOT EXISTS idx_salon_services_service_id ON salon_services (service_id);
+
+CREATE TABLE IF NOT EXISTS catalog_flat (
+    salon_id BIGINT NOT NULL,
+    service_id BIGINT NOT NULL,
+    salon_name VARCHAR(200) NOT NULL,
+    city VARCHAR(120) NOT NULL,
+    service_name VARCHAR(200) NOT NULL,
+    duration_min INTEGER NOT NULL,
+    price NUMERIC(10,2),
+    rating NUMERIC(3,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (salon_id, service_id)
+);
+ALTER TABLE catalog_flat ADD COLUMN IF NOT EXISTS rating NUMERIC(3,2) NOT NULL DEFAULT 0;
+CREATE INDEX IF NOT EXISTS idx_catalog_flat_keyset
+    ON catalog_flat (city, salon_name, salon_id, service_name, service_id);
+CREATE INDEX IF NOT EXISTS idx_catalog_flat_salon_name ON catalog_flat (salon_name, service_name);
+CREATE INDEX IF NOT EXISTS idx_catalog_flat_service_price ON catalog_flat (service_id, price);
+CREATE INDEX IF NOT EXISTS idx_catalog_flat_price ON catalog_flat (price);
+CREATE INDEX IF NOT EXISTS idx_catalog_flat_rating ON catalog_flat (rating, salon_id, service_id);
+
+CREATE SCHEMA IF NOT EXISTS smart_spa_archive;
+
+DO $$
+DECLARE
+  v_deleted BIGINT;
+  v_conflicts BIGINT;
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM pg_class
+     WHERE oid = to_regclass('schedule_slots') AND relkind = 'r'
+  ) THEN
+    IF NOT EXISTS (
+      SELECT 1 FROM pg_constraint
+       WHERE conname = 'schedule_slots_no_overlap'
+         AND conrelid = 'schedule_slots'::regclass
+    ) THEN
+      WITH slots AS (
+        SELECT s.id, s.master_id, s.start_ts, s.end_ts,
+               s.is_booked OR EXISTS (SELECT 1 FROM appointments a WHERE a.slot_id = s.id) AS taken
+          FROM schedule_slots s
+      ), neighbours AS (
+        SELECT id, start_ts, end_ts, taken,
+               max(end_ts) OVER earlier AS earlier_end,
+               min(start_ts) FILTER (WHERE taken) OVER later AS later_taken_start
+          FROM slots
+        WINDOW by_master AS (PARTITION BY master_id ORDER BY start_ts, taken DESC, id),
+               earlier AS (by_master ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING),
+               later AS (by_master ROWS BETWEEN 1 FOLLOWING AND UNBOUNDED FOLLOWING)
+      )
+      DELETE FROM schedule_slots s
+       USING neighbours n
+       WHERE s.id = n.id
+         AND NOT n.taken
+         AND (n.start_ts < n.earlier_end OR n.end_ts > n.later_taken_start);
+      GET DIAGNOSTICS v_deleted = ROW_COUNT;
+      IF v_deleted > 0 THEN
+        RAISE NOTICE 'Удалено свободных слотов, пересекавшихся с другими слотами мастера: %', v_deleted;
+      END IF;
+
+      SELECT count(*) INTO v_conflicts
+        FROM (
+          SELECT start_ts < max(end_ts) OVER (
+                   PARTITION BY master_id ORDER BY start_ts, id
+                   ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                 ) AS overlapping
+            FROM schedule_slots
+        ) c
+       WHERE overlapping;
+      IF v_conflicts > 0 THEN
+        RAISE EXCEPTION 'Ошибка: % пересекающихся занятых слотов, исправьте их вручную перед миграцией.', v_conflicts;
+      END IF;
+    END IF;
+
+    ALTER TABLE schedule_slots SET SCHEMA smart_spa_archive;
+    ALTER TABLE smart_spa_archive.schedule_slots RENAME TO schedule_slots_unpartitioned;
+  END IF;
+
+  IF EXISTS (
+    SELECT 1 FROM pg_class
+     WHERE oid = to_regclass('appointments') AND relkind = 'r'
+  ) THEN
+    ALTER TABLE appointments SET SCHEMA smart_spa_archive;
+    ALTER TABLE smart_spa_archive.appointments RENAME TO appointments_unpartitioned;
+  END IF;
+END;
+$$;
 
 CREATE TABLE IF NOT EXISTS schedule_slots (
-    id BIGSERIAL PRIMARY KEY,
+    id BIGSERIAL,
     master_id BIGINT NOT NULL REFERENCES masters(id) ON DELETE CASCADE,
     start_ts TIMESTAMPTZ NOT NULL,
     end_ts   TIMESTAMPTZ NOT NULL,
     is_booked BOOLEAN NOT NULL DEFAULT FALSE,
-    CHECK (end_ts > start_ts)
-);
+    CHECK (end_ts > start_ts),
+    PRIMARY KEY (id, start_ts)
+) PARTITION BY RANGE (start_ts);
 CREATE INDEX IF NOT EXISTS idx_schedule_master_start ON schedule_slots(master_id, start_ts);
+CREATE INDEX IF NOT EXISTS idx_schedule_free_master_start
+    ON schedule_slots (master_id, start_ts) INCLUDE (end_ts)
+    WHERE is_booked = FALSE;
 
 CREATE TABLE IF NOT EXISTS appointments (
-    id BIGSERIAL PRIMARY KEY,
+    id BIGSERIAL,
     client_id BIGINT NOT NULL REFERENCES users(id) ON DELETE RESTRICT,
     salon_id  BIGINT NOT NULL REFERENCES salons(id) ON DELETE RESTRICT,
     master_id BIGINT NOT NULL REFERENCES masters(id) ON DELETE RESTRICT,
     service_id BIGINT NOT NULL REFERENCES services(id) ON DELETE RESTRICT,
-    slot_id BIGINT NOT NULL UNIQUE REFERENCES schedule_slots(id) ON DELETE RESTRICT,
+    slot_id BIGINT NOT NULL,
+    slot_count SMALLINT NOT NULL DEFAULT 1 CHECK (slot_count >= 1),
     status VARCHAR(30) NOT NULL CHECK (status IN ('ожидает подтверждения','подтверждена','отменена','завершена')),
-    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
-);
+    slot_start_ts TIMESTAMPTZ NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (id, slot_start_ts),
+    FOREIGN KEY (slot_id, slot_start_ts) REFERENCES schedule_slots(id, start_ts)
+      ON UPDATE CASCADE ON DELETE RESTRICT
+) PARTITION BY RANGE (slot_start_ts);
+ALTER TABLE appointments ADD COLUMN IF NOT EXISTS slot_count SMALLINT NOT NULL DEFAULT 1 CHECK (slot_count >= 1);
+ALTER TABLE appointments DROP CONSTRAINT IF EXISTS appointments_slot_id_key;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_appointments_active_slot
+    ON appointments (slot_id, slot_start_ts) WHERE status <> 'отменена';
+CREATE INDEX IF NOT EXISTS idx_appointments_client_start
+    ON appointments (client_id, slot_start_ts, id) INCLUDE (salon_id, service_id, status);
+
+CREATE OR REPLACE FUNCTION create_schedule_partitions(p_from DATE, p_to DATE)
+RETURNS INTEGER AS $$
+DECLARE
+  v_month DATE := date_trunc('month', p_from)::DATE;
+  v_lower TIMESTAMPTZ;
+  v_upper TIMESTAMPTZ;
+  v_slots TEXT;
+  v_appointments TEXT;
+  v_count INTEGER := 0;
+BEGIN
+  WHILE v_month <= p_to LOOP
+    v_lower := v_month::TIMESTAMP AT TIME ZONE 'UTC';
+    v_upper := (v_month + INTERVAL '1 month')::TIMESTAMP AT TIME ZONE 'UTC';
+    v_slots := 'schedule_slots_' || to_char(v_month, '"y"YYYY"m"MM');
+    v_appointments := 'appointments_' || to_char(v_month, '"y"YYYY"m"MM');
+
+    IF to_regclass(v_slots) IS NULL THEN
+      EXECUTE format(
+        'CREATE TABLE %I PARTITION OF schedule_slots FOR VALUES FROM (%L) TO (%L)',
+        v_slots, v_lower, v_upper
+      );
+      EXECUTE format(
+        'ALTER TABLE %I ADD CONSTRAINT %I CHECK (end_ts <= %L), '
+        'ADD CONSTRAINT %I EXCLUDE USING gist (master_id WITH =, tstzrange(start_ts, end_ts, ''[)'') WITH &&)',
+        v_slots, v_slots || '_within_month', v_upper, v_slots || '_no_overlap'
+      );
+      v_count := v_count + 1;
+    END IF;
+
+    IF to_regclass(v_appointments) IS NULL THEN
+      EXECUTE format(
+        'CREATE TABLE %I PARTITION OF appointments FOR VALUES FROM (%L) TO (%L)',
+        v_appointments, v_lower, v_upper
+      );
+      v_count := v_count + 1;
+    END IF;
+
+    v_month := v_month + INTERVAL '1 month';
+  END LOOP;
+  RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION archive_schedule_partitions(p_before DATE)
+RETURNS INTEGER AS $$
+DECLARE
+  v_part RECORD;
+  v_fk RECORD;
+  v_count INTEGER := 0;
+BEGIN
+  FOR v_part IN
+    SELECT c.relname AS slots,
+           'appointments_' || right(c.relname, 8) AS appointments
+      FROM pg_inherits i
+      JOIN pg_class c ON c.oid = i.inhrelid
+     WHERE i.inhparent = 'schedule_slots'::regclass
+       AND c.relname ~ '_y[0-9]{4}m[0-9]{2}$'
+       AND to_date(right(c.relname, 8), '"y"YYYY"m"MM') + INTERVAL '1 month' <= date_trunc('month', p_before)
+     ORDER BY c.relname
+  LOOP
+    IF to_regclass(v_part.appointments) IS NOT NULL THEN
+      EXECUTE format(
+        'UPDATE reviews r SET appointment_id = NULL FROM %I a '
+        'WHERE r.appointment_id = a.id AND r.appointment_start_ts = a.slot_start_ts',
+        v_part.appointments
+      );
+      EXECUTE format('ALTER TABLE appointments DETACH PARTITION %I', v_part.appointments);
+      FOR v_fk IN
+        SELECT conname
+          FROM pg_constraint
+         WHERE conrelid = to_regclass(v_part.appointments)
+           AND contype = 'f'
+           AND conparentid = 0
+           AND confrelid IN (
+             SELECT 'schedule_slots'::regclass
+             UNION ALL
+             SELECT inhrelid FROM pg_inherits WHERE inhparent = 'schedule_slots'::regclass
+           )
+      LOOP
+        EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', v_part.appointments, v_fk.conname);
+      END LOOP;
+      EXECUTE format('ALTER TABLE %I SET SCHEMA smart_spa_archive', v_part.appointments);
+    END IF;
+
+    EXECUTE format('ALTER TABLE schedule_slots DETACH PARTITION %I', v_part.slots);
+    EXECUTE format('ALTER TABLE %I SET SCHEMA smart_spa_archive', v_part.slots);
+    v_count := v_count + 1;
+  END LOOP;
+  RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION maintain_schedule_partitions(
+  p_months_ahead INTEGER DEFAULT 3, p_keep_months INTEGER DEFAULT NULL
+) RETURNS TABLE (created INTEGER, archived INTEGER) AS $$
+BEGIN
+  created := create_schedule_partitions(
+    CURRENT_DATE, (date_trunc('month', CURRENT_DATE) + make_interval(months => p_months_ahead))::DATE
+  );
+  archived := 0;
+  IF p_keep_months IS NOT NULL THEN
+    archived := archive_schedule_partitions(
+      (date_trunc('month', CURRENT_DATE) - make_interval(months => p_keep_months))::DATE
+    );
+  END IF;
+  RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT create_schedule_partitions(CURRENT_DATE, (CURRENT_DATE + INTERVAL '3 months')::DATE);
+
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+    PERFORM cron.schedule(
+      'smart_spa_schedule_partitions', '0 3 * * *', 'SELECT smart_spa.maintain_schedule_partitions(3)'
+    );
+  END IF;
+END;
+$$;
 
 CREATE TABLE IF NOT EXISTS reviews (
     id BIGSERIAL PRIMARY KEY,
     salon_id BIGINT NOT NULL REFERENCES salons(id) ON DELETE CASCADE,
     client_id BIGINT REFERENCES users(id) ON DELETE SET NULL,
-    appointment_id BIGINT UNIQUE REFERENCES appointments(id) ON DELETE SET NULL,
+    appointment_id BIGINT UNIQUE,
+    appointment_start_ts TIMESTAMPTZ,
     rating SMALLINT NOT NULL CHECK (rating BETWEEN 1 AND 5),
     comment TEXT,
-    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    status VARCHAR(20) NOT NULL DEFAULT 'на модерации' CHECK (status IN ('на модерации','одобрен','отклонён')),
+    moderated_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    FOREIGN KEY (appointment_id, appointment_start_ts) REFERENCES appointments(id, slot_start_ts)
+      ON UPDATE CASCADE ON DELETE SET NULL (appointment_id)
 );
+ALTER TABLE reviews ADD COLUMN IF NOT EXISTS status VARCHAR(20) NOT NULL DEFAULT 'одобрен'
+    CHECK (status IN ('на модерации','одобрен','отклонён'));
+ALTER TABLE reviews ALTER COLUMN status SET DEFAULT 'на модерации';
+ALTER TABLE reviews ADD COLUMN IF NOT EXISTS moderated_at TIMESTAMPTZ;
+ALTER TABLE reviews ADD COLUMN IF NOT EXISTS appointment_start_ts TIMESTAMPTZ;
 CREATE INDEX IF NOT EXISTS idx_reviews_salon_created ON reviews (salon_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_reviews_moderation ON reviews (salon_id, status, created_at DESC, id DESC);
 
-CREATE OR REPLACE FUNCTION check_slot_overlap()
-RETURNS trigger AS $$
+CREATE TABLE IF NOT EXISTS salon_rating_stats (
+    salon_id BIGINT PRIMARY KEY REFERENCES salons(id) ON DELETE CASCADE,
+    rating_sum BIGINT NOT NULL DEFAULT 0,
+    rating_count INTEGER NOT NULL DEFAULT 0,
+    pending_count INTEGER NOT NULL DEFAULT 0,
+    avg_rating NUMERIC(3,2) GENERATED ALWAYS AS (
+      CASE WHEN rating_count > 0 THEN round(rating_sum::NUMERIC / rating_count, 2) ELSE 0 END
+    ) STORED
+);
+
+DO $$
+DECLARE v_fk RECORD;
 BEGIN
-  IF EXISTS (
-    SELECT 1 FROM schedule_slots s
-    WHERE s.master_id = NEW.master_id
-      AND tstzrange(s.start_ts, s.end_ts, '[)') && tstzrange(NEW.start_ts, NEW.end_ts, '[)')
-      AND s.id <> COALESCE(NEW.id, -1)
-  ) THEN
-    RAISE EXCEPTION 'Ошибка: слот пересекается с уже существующим временем мастера %', NEW.master_id;
+  IF to_regclass('smart_spa_archive.schedule_slots_unpartitioned') IS NULL
+     OR to_regclass('smart_spa_archive.appointments_unpartitioned') IS NULL THEN
+    RETURN;
   END IF;
-  RETURN NEW;
+
+  PERFORM create_schedule_partitions(
+    (min(start_ts) AT TIME ZONE 'UTC')::DATE, (max(start_ts) AT TIME ZONE 'UTC')::DATE
+  ) FROM smart_spa_archive.schedule_slots_unpartitioned;
+
+  INSERT INTO schedule_slots (id, master_id, start_ts, end_ts, is_booked)
+  SELECT id, master_id, start_ts, end_ts, is_booked
+    FROM smart_spa_archive.schedule_slots_unpartitioned;
+
+  INSERT INTO appointments (
+    id, client_id, salon_id, master_id, service_id, slot_id, slot_count, status, slot_start_ts, created_at
+  )
+  SELECT a.id, a.client_id, a.salon_id, a.master_id, a.service_id, a.slot_id,
+         COALESCE((to_jsonb(a) ->> 'slot_count')::SMALLINT, 1), a.status, s.start_ts, a.created_at
+    FROM smart_spa_archive.appointments_unpartitioned a
+    JOIN smart_spa_archive.schedule_slots_unpartitioned s ON s.id = a.slot_id;
+
+  PERFORM setval(pg_get_serial_sequence('schedule_slots', 'id'), max(id)) FROM schedule_slots;
+  PERFORM setval(pg_get_serial_sequence('appointments', 'id'), max(id)) FROM appointments;
+
+  UPDATE reviews r SET appointment_start_ts = a.slot_start_ts
+    FROM appointments a
+   WHERE a.id = r.appointment_id
+     AND r.appointment_start_ts IS DISTINCT FROM a.slot_start_ts;
+
+  FOR v_fk IN
+    SELECT conname
+      FROM pg_constraint
+     WHERE conrelid = 'reviews'::regclass
+       AND contype = 'f'
+       AND confrelid = 'smart_spa_archive.appointments_unpartitioned'::regclass
+  LOOP
+    EXECUTE format('ALTER TABLE reviews DROP CONSTRAINT %I', v_fk.conname);
+  END LOOP;
+  ALTER TABLE reviews
+    ADD CONSTRAINT reviews_appointment_id_appointment_start_ts_fkey
+    FOREIGN KEY (appointment_id, appointment_start_ts) REFERENCES appointments(id, slot_start_ts)
+    ON UPDATE CASCADE ON DELETE SET NULL (appointment_id);
+
+  DROP TABLE smart_spa_archive.appointments_unpartitioned;
+  DROP TABLE smart_spa_archive.schedule_slots_unpartitioned;
 END;
-$$ LANGUAGE plpgsql;
+$$;
 
 DROP TRIGGER IF EXISTS trg_check_slot_overlap ON schedule_slots;
-CREATE TRIGGER trg_check_slot_overlap
-BEFORE INSERT OR UPDATE ON schedule_slots
-FOR EACH ROW EXECUTE FUNCTION check_slot_overlap();
+DROP TRIGGER IF EXISTS trg_check_slot_overlap_insert ON schedule_slots;
+DROP TRIGGER IF EXISTS trg_check_slot_overlap_update ON schedule_slots;
+DROP FUNCTION IF EXISTS check_slot_overlap();
+
+CREATE OR REPLACE FUNCTION generate_schedule(
+  p_master BIGINT,
+  p_from DATE,
+  p_to DATE,
+  p_step INTERVAL DEFAULT INTERVAL '60 minutes',
+  p_day_start TIME DEFAULT TIME '10:00',
+  p_day_end TIME DEFAULT TIME '18:00'
+) RETURNS INTEGER AS $$
+DECLARE v_count INTEGER;
+BEGIN
+  IF p_to < p_from THEN
+    RAISE EXCEPTION 'Ошибка: дата окончания раньше даты начала.';
+  END IF;
+  IF p_step <= INTERVAL '0' OR p_day_start + p_step > p_day_end THEN
+    RAISE EXCEPTION 'Ошибка: рабочий день короче одного слота.';
+  END IF;
+
+  PERFORM create_schedule_partitions(p_from, p_to + 1);
 
+  INSERT INTO schedule_slots(master_id, start_ts, end_ts)
+  SELECT c.master_id, c.start_ts, c.end_ts
+    FROM (
+      SELECT m.id AS master_id,
+             (d.day + t.start_time::time)::timestamptz AS start_ts,
+             (d.day + t.start_time::time + p_step)::timestamptz AS end_ts
+        FROM masters m
+       CROSS JOIN generate_series(p_from::timestamp, p_to::timestamp, INTERVAL '1 day') AS d(day)
+       CROSS JOIN generate_series(
+               TIMESTAMP '2000-01-01' + p_day_start,
+               TIMESTAMP '2000-01-01' + p_day_end - p_step,
+               p_step
+             ) AS t(start_time)
+       WHERE m.active AND (p_master IS NULL OR m.id = p_master)
+    ) c
+  ON CONFLICT DO NOTHING;
+
+  GET DIAGNOSTICS v_count = ROW_COUNT;
+  RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP FUNCTION IF EXISTS book_appointment(BIGINT, BIGINT, BIGINT, BIGINT, BIGINT);
 CREATE OR REPLACE FUNCTION book_appointment(
-  p_client BIGINT, p_salon BIGINT, p_master BIGINT, p_service BIGINT, p_slot BIGINT
+  p_client BIGINT, p_salon BIGINT, p_master BIGINT, p_service BIGINT, p_slot BIGINT,
+  p_slot_start TIMESTAMPTZ DEFAULT NULL
 ) RETURNS BIGINT AS $$
-DECLARE v_id BIGINT;
+DECLARE
+  v_id BIGINT;
+  v_duration INTERVAL;
+  v_start TIMESTAMPTZ;
+  v_end TIMESTAMPTZ;
+  v_slot RECORD;
+  v_slots BIGINT[] := '{}';
 BEGIN
-  PERFORM 1 FROM schedule_slots WHERE id = p_slot AND master_id = p_master FOR UPDATE;
+  SELECT make_interval(mins => duration_min) INTO v_duration FROM services WHERE id = p_service;
+  IF NOT FOUND THEN
+    RAISE EXCEPTION 'Ошибка: услуга не найдена.';
+  END IF;
+
+  IF p_slot_start IS NULL THEN
+    SELECT start_ts INTO v_start FROM schedule_slots WHERE id = p_slot AND master_id = p_master;
+  ELSE
+    SELECT start_ts INTO v_start
+      FROM schedule_slots
+     WHERE id = p_slot AND master_id = p_master AND start_ts = p_slot_start;
+  END IF;
   IF NOT FOUND THEN
     RAISE EXCEPTION 'Ошибка: слот не найден или не принадлежит мастеру.';
   END IF;
 
-  IF EXISTS (SELECT 1 FROM schedule_slots WHERE id = p_slot AND is_booked) THEN
-    RAISE EXCEPTION 'Ошибка: слот уже занят.';
+  v_end := v_start;
+  FOR v_slot IN
+    SELECT id, start_ts, end_ts, is_booked
+      FROM schedule_slots
+     WHERE master_id = p_master AND start_ts >= v_start AND start_ts < v_start + v_duration
+     ORDER BY start_ts
+       FOR UPDATE
+  LOOP
+    IF v_slot.is_booked THEN
+      RAISE EXCEPTION 'Ошибка: слот уже занят.';
+    END IF;
+    IF v_slot.start_ts <> v_end THEN
+      EXIT;
+    END IF;
+    v_slots := v_slots || v_slot.id;
+    v_end := v_slot.end_ts;
+  END LOOP;
+
+  IF v_end < v_start + v_duration THEN
+    RAISE EXCEPTION 'Ошибка: у мастера недостаточно свободного времени подряд для этой услуги.';
   END IF;
 
-  UPDATE schedule_slots SET is_booked = TRUE WHERE id = p_slot;
+  UPDATE schedule_slots SET is_booked = TRUE
+   WHERE master_id = p_master AND start_ts >= v_start AND start_ts < v_end AND id = ANY (v_slots);
 
-  INSERT INTO appointments(client_id, salon_id, master_id, service_id, slot_id, status)
-  VALUES (p_client, p_salon, p_master, p_service, p_slot, 'подтверждена')
+  INSERT INTO appointments(client_id, salon_id, master_id, service_id, slot_id, slot_count, status, slot_start_ts)
+  VALUES (p_client, p_salon, p_master, p_service, p_slot, array_length(v_slots, 1), 'подтверждена', v_start)
   RETURNING id INTO v_id;
 
   RAISE NOTICE 'Запись создана №%', v_id;
@@ -129,32 +511,249 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
-CREATE OR REPLACE FUNCTION cancel_appointment(p_id BIGINT)
-RETURNS void AS $$
-DECLARE v_slot BIGINT;
+DROP FUNCTION IF EXISTS cancel_appointment(BIGINT);
+CREATE OR REPLACE FUNCTION cancel_appointment(p_id BIGINT, p_slot_start TIMESTAMPTZ DEFAULT NULL)
+RETURNS BOOLEAN AS $$
+DECLARE
+  v_start TIMESTAMPTZ;
+  v_count SMALLINT;
+  v_master BIGINT;
 BEGIN
-  UPDATE appointments
-     SET status = 'отменена'
-   WHERE id = p_id AND status IN ('ожидает подтверждения','подтверждена')
-  RETURNING slot_id INTO v_slot;
+  IF p_slot_start IS NULL THEN
+    UPDATE appointments
+       SET status = 'отменена'
+     WHERE id = p_id AND status IN ('ожидает подтверждения','подтверждена')
+    RETURNING slot_start_ts, slot_count, master_id INTO v_start, v_count, v_master;
+  ELSE
+    UPDATE appointments
+       SET status = 'отменена'
+     WHERE id = p_id AND slot_start_ts = p_slot_start
+       AND status IN ('ожидает подтверждения','подтверждена')
+    RETURNING slot_start_ts, slot_count, master_id INTO v_start, v_count, v_master;
+  END IF;
+
+  IF NOT FOUND THEN
+    RETURN FALSE;
+  END IF;
+
+  UPDATE schedule_slots SET is_booked = FALSE
+   WHERE (id, start_ts) IN (
+     SELECT s.id, s.start_ts
+       FROM schedule_slots s
+      WHERE s.master_id = v_master
+        AND s.start_ts >= v_start
+      ORDER BY s.start_ts
+      LIMIT v_count
+   );
+  RAISE NOTICE 'Запись отменена и слот освобождён.';
+  RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION next_free_slots(
+  p_salon BIGINT, p_service BIGINT, p_per_master INTEGER DEFAULT 10, p_from TIMESTAMPTZ DEFAULT now()
+) RETURNS TABLE (
+  slot_id BIGINT, slot_count INTEGER, start_ts TIMESTAMPTZ, end_ts TIMESTAMPTZ,
+  master_id BIGINT, master_name VARCHAR, specialization VARCHAR
+) AS $$
+DECLARE
+  v_duration INTERVAL;
+  v_master RECORD;
+  v_slot RECORD;
+  v_ids BIGINT[];
+  v_starts TIMESTAMPTZ[];
+  v_end TIMESTAMPTZ;
+  v_found INTEGER;
+BEGIN
+  SELECT make_interval(mins => duration_min) INTO v_duration FROM services WHERE id = p_service;
+  IF NOT FOUND THEN
+    RETURN;
+  END IF;
+
+  FOR v_master IN
+    SELECT m.id, m.full_name, m.specialization
+      FROM masters m
+     WHERE m.salon_id = p_salon AND m.active
+     ORDER BY m.id
+  LOOP
+    v_ids := '{}';
+    v_starts := '{}';
+    v_end := NULL;
+    v_found := 0;
+
+    FOR v_slot IN
+      SELECT s.id, s.start_ts, s.end_ts
+        FROM schedule_slots s
+       WHERE s.master_id = v_master.id AND s.is_booked = FALSE AND s.start_ts >= p_from
+       ORDER BY s.start_ts
+    LOOP
+      IF v_end IS DISTINCT FROM v_slot.start_ts THEN
+        v_ids := '{}';
+        v_starts := '{}';
+      END IF;
+      v_ids := v_ids || v_slot.id;
+      v_starts := v_starts || v_slot.start_ts;
+      v_end := v_slot.end_ts;
+
+      WHILE cardinality(v_ids) > 0 AND v_end - v_starts[1] >= v_duration AND v_found < p_per_master LOOP
+        slot_id := v_ids[1];
+        slot_count := cardinality(v_ids);
+        start_ts := v_starts[1];
+        end_ts := v_starts[1] + v_duration;
+        master_id := v_master.id;
+        master_name := v_master.full_name;
+        specialization := v_master.specialization;
+        RETURN NEXT;
+        v_found := v_found + 1;
+        v_ids := v_ids[2:];
+        v_starts := v_starts[2:];
+      END LOOP;
+
+      EXIT WHEN v_found >= p_per_master;
+    END LOOP;
+  END LOOP;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+CREATE OR REPLACE FUNCTION book_first_available(
+  p_client BIGINT, p_salon BIGINT, p_service BIGINT,
+  p_from TIMESTAMPTZ DEFAULT now(), p_to TIMESTAMPTZ DEFAULT now() + INTERVAL '14 days'
+) RETURNS TABLE (
+  appointment_id BIGINT, slot_id BIGINT, start_ts TIMESTAMPTZ, end_ts TIMESTAMPTZ,
+  master_id BIGINT, master_name VARCHAR, specialization VARCHAR
+) AS $$
+DECLARE
+  v_duration INTERVAL;
+  v_candidate RECORD;
+  v_locked INTEGER;
+  v_covered INTERVAL;
+  v_end TIMESTAMPTZ;
+BEGIN
+  SELECT make_interval(mins => duration_min) INTO v_duration FROM services WHERE id = p_service;
+  IF NOT FOUND THEN
+    RAISE EXCEPTION 'Ошибка: услуга не найдена.';
+  END IF;
+
+  FOR v_candidate IN
+    SELECT s.id, s.start_ts, s.master_id, m.full_name, m.specialization
+      FROM masters m
+      JOIN schedule_slots s ON s.master_id = m.id
+     WHERE m.salon_id = p_salon AND m.active
+       AND s.is_booked = FALSE
+       AND s.start_ts >= GREATEST(p_from, now())
+       AND s.start_ts + v_duration <= p_to
+     ORDER BY s.start_ts, s.master_id
+  LOOP
+    SELECT sum(ss.end_ts - ss.start_ts), max(ss.end_ts)
+      INTO v_covered, v_end
+      FROM schedule_slots ss
+     WHERE ss.master_id = v_candidate.master_id
+       AND ss.start_ts >= v_candidate.start_ts
+       AND ss.start_ts < v_candidate.start_ts + v_duration
+       AND ss.is_booked = FALSE;
+    CONTINUE WHEN v_end IS NULL
+               OR v_end < v_candidate.start_ts + v_duration
+               OR v_covered <> v_end - v_candidate.start_ts;
+
+    BEGIN
+      SELECT count(*), sum(l.end_ts - l.start_ts), max(l.end_ts)
+        INTO v_locked, v_covered, v_end
+        FROM (
+          SELECT ss.start_ts, ss.end_ts
+            FROM schedule_slots ss
+           WHERE ss.master_id = v_candidate.master_id
+             AND ss.start_ts >= v_candidate.start_ts
+             AND ss.start_ts < v_candidate.start_ts + v_duration
+             AND ss.is_booked = FALSE
+           ORDER BY ss.start_ts
+             FOR UPDATE SKIP LOCKED
+        ) l;
+
+      IF v_locked = 0
+         OR v_end < v_candidate.start_ts + v_duration
+         OR v_covered <> v_end - v_candidate.start_ts THEN
+        RAISE EXCEPTION 'Ошибка: слоты заняты другой записью.' USING ERRCODE = 'lock_not_available';
+      END IF;
+
+      appointment_id := book_appointment(
+        p_client, p_salon, v_candidate.master_id, p_service, v_candidate.id, v_candidate.start_ts
+      );
+    EXCEPTION WHEN lock_not_available THEN
+      CONTINUE;
+    END;
+
+    slot_id := v_candidate.id;
+    start_ts := v_candidate.start_ts;
+    end_ts := v_candidate.start_ts + v_duration;
+    master_id := v_candidate.master_id;
+    master_name := v_candidate.full_name;
+    specialization := v_candidate.specialization;
+    RETURN NEXT;
+    RETURN;
+  END LOOP;
+END;
+$$ LANGUAGE plpgsql;
 
-  IF FOUND THEN
-    UPDATE schedule_slots SET is_booked = FALSE WHERE id = v_slot;
-    RAISE NOTICE 'Запись отменена и слот освобождён.';
+DROP FUNCTION IF EXISTS count_estimate(TEXT, TEXT[]);
+
+CREATE OR REPLACE FUNCTION catalog_estimate(
+  p_city TEXT DEFAULT NULL,
+  p_service_id BIGINT DEFAULT NULL,
+  p_price_min NUMERIC DEFAULT NULL,
+  p_price_max NUMERIC DEFAULT NULL,
+  p_ts_query TEXT DEFAULT NULL,
+  p_like TEXT DEFAULT NULL
+) RETURNS BIGINT AS $$
+DECLARE
+  v_conditions TEXT[] := '{}';
+  v_sql TEXT := 'EXPLAIN (FORMAT JSON) SELECT 1 FROM catalog_flat cf';
+  v_plan JSON;
+BEGIN
+  IF p_city IS NOT NULL THEN
+    v_conditions := array_append(v_conditions, 'cf.city = $1');
+  END IF;
+  IF p_service_id IS NOT NULL THEN
+    v_conditions := array_append(v_conditions, 'cf.service_id = $2');
+  END IF;
+  IF p_price_min IS NOT NULL THEN
+    v_conditions := array_append(v_conditions, 'cf.price >= $3');
+  END IF;
+  IF p_price_max IS NOT NULL THEN
+    v_conditions := array_append(v_conditions, 'cf.price <= $4');
+  END IF;
+  IF p_like IS NOT NULL THEN
+    v_conditions := array_append(v_conditions,
+      '(cf.service_id = ANY (ARRAY('
+      '    SELECT id FROM services'
+      '    WHERE search_tsv @@ to_tsquery(''russian'', $5) OR name ILIKE $6'
+      ')) OR cf.salon_id = ANY (ARRAY('
+      '    SELECT id FROM salons'
+      '    WHERE search_tsv @@ to_tsquery(''russian'', $5) OR name ILIKE $6'
+      ')))');
   END IF;
+  IF cardinality(v_conditions) > 0 THEN
+    v_sql := v_sql || ' WHERE ' || array_to_string(v_conditions, ' AND ');
+  END IF;
+
+  EXECUTE v_sql INTO v_plan
+    USING p_city, p_service_id, p_price_min, p_price_max, COALESCE(p_ts_query, ''), p_like;
+  RETURN (v_plan -> 0 -> 'Plan' ->> 'Plan Rows')::BIGINT;
 END;
 $$ LANGUAGE plpgsql;
 
 CREATE OR REPLACE FUNCTION check_review_after_visit()
 RETURNS trigger AS $$
 BEGIN
-  IF NOT EXISTS (
-    SELECT 1 FROM appointments a
-    WHERE a.id = NEW.appointment_id
-      AND a.client_id = NEW.client_id
-      AND a.salon_id  = NEW.salon_id
-      AND a.status    = 'завершена'
-  ) THEN
+  IF TG_OP = 'UPDATE' AND NEW.appointment_id IS NULL THEN
+    RETURN NEW;
+  END IF;
+  SELECT a.slot_start_ts INTO NEW.appointment_start_ts
+    FROM appointments a
+   WHERE a.id = NEW.appointment_id
+     AND a.client_id = NEW.client_id
+     AND a.salon_id  = NEW.salon_id
+     AND a.status    = 'завершена';
+  IF NOT FOUND THEN
     RAISE EXCEPTION 'Ошибка: отзыв можно оставить только после завершённого визита.';
   END IF;
   RETURN NEW;
@@ -163,9 +762,318 @@ $$ LANGUAGE plpgsql;
 
 DROP TRIGGER IF EXISTS trg_check_review_after_visit ON reviews;
 CREATE TRIGGER trg_check_review_after_visit
-BEFORE INSERT OR UPDATE ON reviews
+BEFORE INSERT OR UPDATE OF salon_id, client_id, appointment_id ON reviews
 FOR EACH ROW EXECUTE FUNCTION check_review_after_visit();
 
+CREATE OR REPLACE FUNCTION reviews_rating_stats()
+RETURNS trigger AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    INSERT INTO salon_rating_stats AS st (salon_id, rating_sum, rating_count, pending_count)
+    SELECT salon_id,
+           COALESCE(sum(rating) FILTER (WHERE status = 'одобрен'), 0),
+           count(*) FILTER (WHERE status = 'одобрен'),
+           count(*) FILTER (WHERE status = 'на модерации')
+      FROM new_reviews
+     GROUP BY salon_id
+    ON CONFLICT (salon_id) DO UPDATE
+       SET rating_sum = st.rating_sum + EXCLUDED.rating_sum,
+           rating_count = st.rating_count + EXCLUDED.rating_count,
+           pending_count = st.pending_count + EXCLUDED.pending_count;
+  ELSIF TG_OP = 'DELETE' THEN
+    INSERT INTO salon_rating_stats AS st (salon_id, rating_sum, rating_count, pending_count)
+    SELECT salon_id,
+           -COALESCE(sum(rating) FILTER (WHERE status = 'одобрен'), 0),
+           -count(*) FILTER (WHERE status = 'одобрен'),
+           -count(*) FILTER (WHERE status = 'на модерации')
+      FROM old_reviews
+     GROUP BY salon_id
+    ON CONFLICT (salon_id) DO UPDATE
+       SET rating_sum = st.rating_sum + EXCLUDED.rating_sum,
+           rating_count = st.rating_count + EXCLUDED.rating_count,
+           pending_count = st.pending_count + EXCLUDED.pending_count;
+  ELSE
+    INSERT INTO salon_rating_stats AS st (salon_id, rating_sum, rating_count, pending_count)
+    SELECT salon_id,
+           COALESCE(sum(sign * rating) FILTER (WHERE status = 'одобрен'), 0),
+           COALESCE(sum(sign) FILTER (WHERE status = 'одобрен'), 0),
+           COALESCE(sum(sign) FILTER (WHERE status = 'на модерации'), 0)
+      FROM (
+        SELECT salon_id, rating, status, 1 AS sign FROM new_reviews
+        UNION ALL
+        SELECT salon_id, rating, status, -1 AS sign FROM old_reviews
+      ) d
+     GROUP BY salon_id
+    HAVING sum(sign * rating) FILTER (WHERE status = 'одобрен') <> 0
+        OR sum(sign) FILTER (WHERE status = 'одобрен') <> 0
+        OR sum(sign) FILTER (WHERE status = 'на модерации') <> 0
+    ON CONFLICT (salon_id) DO UPDATE
+       SET rating_sum = st.rating_sum + EXCLUDED.rating_sum,
+           rating_count = st.rating_count + EXCLUDED.rating_count,
+           pending_count = st.pending_count + EXCLUDED.pending_count;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_reviews_rating_stats ON reviews;
+DROP TRIGGER IF EXISTS trg_reviews_rating_stats_insert ON reviews;
+CREATE TRIGGER trg_reviews_rating_stats_insert
+AFTER INSERT ON reviews
+REFERENCING NEW TABLE AS new_reviews
+FOR EACH STATEMENT EXECUTE FUNCTION reviews_rating_stats();
+
+DROP TRIGGER IF EXISTS trg_reviews_rating_stats_update ON reviews;
+CREATE TRIGGER trg_reviews_rating_stats_update
+AFTER UPDATE ON reviews
+REFERENCING OLD TABLE AS old_reviews NEW TABLE AS new_reviews
+FOR EACH STATEMENT EXECUTE FUNCTION reviews_rating_stats();
+
+DROP TRIGGER IF EXISTS trg_reviews_rating_stats_delete ON reviews;
+CREATE TRIGGER trg_reviews_rating_stats_delete
+AFTER DELETE ON reviews
+REFERENCING OLD TABLE AS old_reviews
+FOR EACH STATEMENT EXECUTE FUNCTION reviews_rating_stats();
+
+CREATE OR REPLACE FUNCTION catalog_flat_sync_rating()
+RETURNS trigger AS $$
+BEGIN
+  UPDATE catalog_flat
+     SET rating = NEW.avg_rating
+   WHERE salon_id = NEW.salon_id AND rating IS DISTINCT FROM NEW.avg_rating;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_catalog_flat_rating ON salon_rating_stats;
+CREATE TRIGGER trg_catalog_flat_rating
+AFTER INSERT OR UPDATE OF rating_sum, rating_count ON salon_rating_stats
+FOR EACH ROW EXECUTE FUNCTION catalog_flat_sync_rating();
+
+CREATE OR REPLACE FUNCTION normalize_phone(p_phone TEXT)
+RETURNS TEXT AS $$
+  SELECT CASE
+    WHEN d ~ '^8[0-9]{10}$' THEN '+7' || substr(d, 2)
+    WHEN d ~ '^[0-9]{10}$' THEN '+7' || d
+    WHEN d <> '' THEN '+' || d
+    ELSE p_phone
+  END
+  FROM regexp_replace(COALESCE(p_phone, ''), '[^0-9]', '', 'g') AS d
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION users_normalize_phone()
+RETURNS trigger AS $$
+BEGIN
+  NEW.phone := normalize_phone(NEW.phone);
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_users_normalize_phone ON users;
+CREATE TRIGGER trg_users_normalize_phone
+BEFORE INSERT OR UPDATE OF phone ON users
+FOR EACH ROW EXECUTE FUNCTION users_normalize_phone();
+
+CREATE OR REPLACE FUNCTION services_search_tsv_update()
+RETURNS trigger AS $$
+BEGIN
+  NEW.search_tsv :=
+    setweight(to_tsvector('russian', COALESCE(NEW.name, '')), 'A') ||
+    setweight(to_tsvector('russian', COALESCE(NEW.description, '')), 'B');
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_services_search_tsv ON services;
+CREATE TRIGGER trg_services_search_tsv
+BEFORE INSERT OR UPDATE OF name, description ON services
+FOR EACH ROW EXECUTE FUNCTION services_search_tsv_update();
+
+CREATE OR REPLACE FUNCTION salons_search_tsv_update()
+RETURNS trigger AS $$
+BEGIN
+  NEW.search_tsv :=
+    setweight(to_tsvector('russian', COALESCE(NEW.name, '')), 'A') ||
+    setweight(to_tsvector('russian', COALESCE(NEW.city, '')), 'B');
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_salons_search_tsv ON salons;
+CREATE TRIGGER trg_salons_search_tsv
+BEFORE INSERT OR UPDATE OF name, city ON salons
+FOR EACH ROW EXECUTE FUNCTION salons_search_tsv_update();
+
+CREATE OR REPLACE FUNCTION salon_services_effective_price()
+RETURNS trigger AS $$
+BEGIN
+  NEW.effective_price := COALESCE(
+    NEW.price,
+    (SELECT base_price FROM services WHERE id = NEW.service_id)
+  );
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_salon_services_effective_price ON salon_services;
+CREATE TRIGGER trg_salon_services_effective_price
+BEFORE INSERT OR UPDATE OF price, service_id ON salon_services
+FOR EACH ROW EXECUTE FUNCTION salon_services_effective_price();
+
+DROP TRIGGER IF EXISTS trg_appointments_slot_start ON appointments;
+DROP FUNCTION IF EXISTS appointments_slot_start();
+DROP TRIGGER IF EXISTS trg_schedule_slots_start_changed ON schedule_slots;
+DROP FUNCTION IF EXISTS schedule_slots_start_changed();
+
+CREATE OR REPLACE FUNCTION services_base_price_changed()
+RETURNS trigger AS $$
+BEGIN
+  UPDATE salon_services
+     SET effective_price = NEW.base_price
+   WHERE service_id = NEW.id AND price IS NULL;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_services_base_price_changed ON services;
+CREATE TRIGGER trg_services_base_price_changed
+AFTER UPDATE OF base_price ON services
+FOR EACH ROW WHEN (OLD.base_price IS DISTINCT FROM NEW.base_price)
+EXECUTE FUNCTION services_base_price_changed();
+
+CREATE OR REPLACE FUNCTION catalog_flat_sync_salon_service()
+RETURNS trigger AS $$
+BEGIN
+  IF TG_OP = 'DELETE'
+     OR (TG_OP = 'UPDATE' AND (OLD.salon_id, OLD.service_id) <> (NEW.salon_id, NEW.service_id)) THEN
+    DELETE FROM catalog_flat
+     WHERE salon_id = OLD.salon_id AND service_id = OLD.service_id;
+  END IF;
+
+  IF TG_OP <> 'DELETE' THEN
+    INSERT INTO catalog_flat(salon_id, service_id, salon_name, city, service_name, duration_min, price, rating)
+    SELECT sl.id, srv.id, sl.name, sl.city, srv.name, srv.duration_min, NEW.effective_price,
+           COALESCE(st.avg_rating, 0)
+      FROM salons sl
+      JOIN services srv ON srv.id = NEW.service_id
+      LEFT JOIN salon_rating_stats st ON st.salon_id = sl.id
+     WHERE sl.id = NEW.salon_id
+    ON CONFLICT (salon_id, service_id) DO UPDATE
+       SET salon_name = EXCLUDED.salon_name,
+           city = EXCLUDED.city,
+           service_name = EXCLUDED.service_name,
+           duration_min = EXCLUDED.duration_min,
+           price = EXCLUDED.price;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_catalog_flat_salon_service ON salon_services;
+CREATE TRIGGER trg_catalog_flat_salon_service
+AFTER INSERT OR UPDATE OR DELETE ON salon_services
+FOR EACH ROW EXECUTE FUNCTION catalog_flat_sync_salon_service();
+
+CREATE OR REPLACE FUNCTION catalog_flat_sync_service()
+RETURNS trigger AS $$
+BEGIN
+  UPDATE catalog_flat
+     SET service_name = NEW.name,
+         duration_min = NEW.duration_min
+   WHERE service_id = NEW.id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_catalog_flat_service ON services;
+CREATE TRIGGER trg_catalog_flat_service
+AFTER UPDATE OF name, duration_min ON services
+FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name OR OLD.duration_min IS DISTINCT FROM NEW.duration_min)
+EXECUTE FUNCTION catalog_flat_sync_service();
+
+CREATE OR REPLACE FUNCTION catalog_flat_sync_salon()
+RETURNS trigger AS $$
+BEGIN
+  UPDATE catalog_flat
+     SET salon_name = NEW.name,
+         city = NEW.city
+   WHERE salon_id = NEW.id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_catalog_flat_salon ON salons;
+CREATE TRIGGER trg_catalog_flat_salon
+AFTER UPDATE OF name, city ON salons
+FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name OR OLD.city IS DISTINCT FROM NEW.city)
+EXECUTE FUNCTION catalog_flat_sync_salon();
+
+CREATE OR REPLACE FUNCTION notify_row_change()
+RETURNS trigger AS $$
+DECLARE
+  v_row JSONB;
+  v_payload JSONB := jsonb_build_object(
+    'table', (SELECT relname FROM pg_class WHERE oid = COALESCE(pg_partition_root(TG_RELID), TG_RELID)),
+    'op', TG_OP
+  );
+  v_key TEXT;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    v_row := to_jsonb(OLD);
+  ELSE
+    v_row := to_jsonb(NEW);
+  END IF;
+  FOREACH v_key IN ARRAY TG_ARGV LOOP
+    v_payload := v_payload || jsonb_build_object(v_key, v_row -> v_key);
+  END LOOP;
+  PERFORM pg_notify('smart_spa_changes', v_payload::TEXT);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_notify_appointments ON appointments;
+CREATE TRIGGER trg_notify_appointments
+AFTER INSERT OR DELETE OR UPDATE OF status, slot_start_ts ON appointments
+FOR EACH ROW EXECUTE FUNCTION notify_row_change('id', 'client_id', 'slot_start_ts');
+
+DROP TRIGGER IF EXISTS trg_notify_schedule_slots ON schedule_slots;
+
+DROP TRIGGER IF EXISTS trg_notify_salon_services ON salon_services;
+CREATE TRIGGER trg_notify_salon_services
+AFTER INSERT OR UPDATE OR DELETE ON salon_services
+FOR EACH ROW EXECUTE FUNCTION notify_row_change('salon_id', 'service_id');
+
+DROP TRIGGER IF EXISTS trg_notify_salon_rating_stats ON salon_rating_stats;
+CREATE TRIGGER trg_notify_salon_rating_stats
+AFTER INSERT OR UPDATE OF rating_sum, rating_count ON salon_rating_stats
+FOR EACH ROW EXECUTE FUNCTION notify_row_change('salon_id');
+
+UPDATE salon_services SET price = price WHERE effective_price IS NULL;
+INSERT INTO salon_rating_stats(salon_id, rating_sum, rating_count, pending_count)
+SELECT salon_id,
+       COALESCE(sum(rating) FILTER (WHERE status = 'одобрен'), 0),
+       count(*) FILTER (WHERE status = 'одобрен'),
+       count(*) FILTER (WHERE status = 'на модерации')
+  FROM reviews
+ GROUP BY salon_id
+ON CONFLICT (salon_id) DO NOTHING;
+INSERT INTO catalog_flat(salon_id, service_id, salon_name, city, service_name, duration_min, price, rating)
+SELECT ss.salon_id, ss.service_id, sl.name, sl.city, srv.name, srv.duration_min, ss.effective_price,
+       COALESCE(st.avg_rating, 0)
+  FROM salon_services ss
+  JOIN salons sl ON sl.id = ss.salon_id
+  JOIN services srv ON srv.id = ss.service_id
+  LEFT JOIN salon_rating_stats st ON st.salon_id = ss.salon_id
+ON CONFLICT (salon_id, service_id) DO NOTHING;
+UPDATE catalog_flat cf SET rating = st.avg_rating
+  FROM salon_rating_stats st
+ WHERE st.salon_id = cf.salon_id AND cf.rating IS DISTINCT FROM st.avg_rating;
+UPDATE services SET name = name WHERE search_tsv IS NULL;
+UPDATE users u SET phone = phone
+ WHERE phone IS DISTINCT FROM normalize_phone(phone)
+   AND NOT EXISTS (SELECT 1 FROM users o WHERE o.phone = normalize_phone(u.phone) AND o.id <> u.id);
+UPDATE salons SET name = name WHERE search_tsv IS NULL;
+
 SET search_path TO smart_spa, public;
 
 INSERT INTO roles(code, name) VALUES
@@ -180,19 +1088,18 @@ VALUES ('Иван Петров', '+79990000001', 'ivan@example.com', 'hash',
 ON CONFLICT DO NOTHING;
 
 INSERT INTO salons(name, city, address, phone)
-VALUES ('SPA «Лотос»','Москва','ул. Примерная, 1','+7 (499) 000-00-00')
-ON CONFLICT DO NOTHING;
+SELECT 'SPA «Лотос»','Москва','ул. Примерная, 1','+7 (499) 000-00-00'
+ WHERE NOT EXISTS (SELECT 1 FROM salons WHERE name='SPA «Лотос»');
 
 INSERT INTO masters(salon_id, full_name, specialization)
-VALUES (
-  (SELECT id FROM salons WHERE name='SPA «Лотос»'),
-  'Мария Смирнова','Массаж'
-)
-ON CONFLICT DO NOTHING;
+SELECT id, 'Мария Смирнова','Массаж'
+  FROM salons sl
+ WHERE sl.name='SPA «Лотос»'
+   AND NOT EXISTS (SELECT 1 FROM masters m WHERE m.salon_id = sl.id AND m.full_name='Мария Смирнова');
 
 INSERT INTO services(name, description, base_price, duration_min)
-VALUES ('Классический массаж','Расслабляющий массаж', 2500, 60)
-ON CONFLICT DO NOTHING;
+SELECT 'Классический массаж','Расслабляющий массаж', 2500, 60
+ WHERE NOT EXISTS (SELECT 1 FROM services WHERE name='Классический массаж');
 
 INSERT INTO salon_services(salon_id, service_id, price)
 VALUES (
@@ -202,21 +1109,12 @@ VALUES (
 )
 ON CONFLICT DO NOTHING;
 
-WITH params AS (
-  SELECT 
-    (SELECT id FROM masters WHERE full_name='Мария Смирнова') AS master_id,
-    (now()::date + 1) AS start_day,
-    5 AS days,
-    60 AS step_min
-)
-INSERT INTO schedule_slots(master_id, start_ts, end_ts)
-SELECT p.master_id,
-       ((p.start_day + d.dn) + t.ti::time)::timestamptz AS start_ts,
-       ((p.start_day + d.dn) + (t.ti + (p.step_min || ' minutes')::interval)::time)::timestamptz AS end_ts
-FROM params p,
-     generate_series(0, p.days-1) AS d(dn),
-     generate_series(
-         TIMESTAMP '2025-01-01 10:00:00',
-         TIMESTAMP '2025-01-01 17:00:00',
-         (p.step_min || ' minutes')::interval
-     ) AS t(ti);
\ No newline at end of file
+SELECT generate_schedule(
+  (SELECT m.id FROM masters m JOIN salons sl ON sl.id = m.salon_id
+    WHERE sl.name='SPA «Лотос»' AND m.full_name='Мария Смирнова'),
+  now()::date + 1,
+  now()::date + 5,
+  INTERVAL '60 minutes',
+  TIME '10:00',
+  TIME '18:00'
+);
\ No newline at end of file
@@ -0,0 +1,134 @@
+from spa_data.bookings import (
+    BOOKING_WINDOW_DAYS,
+    BOOKINGS_PAGE_SIZE,
+    book_appointment,
+    book_first_available,
+    cancel_appointment,
+    fetch_appointment_status,
+    fetch_available_slots,
+    fetch_booking,
+    fetch_bookings,
+)
+from spa_data.catalog import (
+    CATALOG_PAGE_SIZE,
+    CATALOG_SORT_RATING,
+    fetch_catalog_estimate,
+    fetch_catalog_page,
+    fetch_cities,
+    fetch_services,
+)
+from spa_data.changes import CHANGES_CHANNEL, RESYNC, ChangeFeed
+from spa_data.directory import (
+    USERS_PAGE_SIZE,
+    add_salon_service,
+    delete_salon_service,
+    delete_user,
+    fetch_available_services,
+    fetch_masters,
+    fetch_roles,
+    fetch_salon_service,
+    fetch_salon_services,
+    fetch_salons,
+    fetch_user_directory,
+    find_user,
+    generate_schedule,
+    maintain_partitions,
+    update_salon_service_price,
+)
+from spa_data.reviews import (
+    REVIEW_APPROVED,
+    REVIEW_PENDING,
+    REVIEW_REJECTED,
+    REVIEWS_PAGE_SIZE,
+    approve_reviews,
+    fetch_review_queue,
+    fetch_review_salons,
+    fetch_salon_ratings,
+    reject_reviews,
+)
+from spa_data.rows import (
+    BookedSlotRow,
+    BookingRow,
+    CatalogRow,
+    MasterRow,
+    ModeratedReviewRow,
+    PartitionMaintenanceRow,
+    ReviewRow,
+    ReviewSalonRow,
+    RoleRow,
+    SalonRatingRow,
+    SalonRow,
+    SalonServiceRow,
+    ServiceRow,
+    SlotRow,
+    UserIdentity,
+    UserRow,
+    make_rows,
+)
+from spa_data.session import DataError, configure, execute_action, execute_select
+
+__all__ = [
+    "BOOKING_WINDOW_DAYS",
+    "BOOKINGS_PAGE_SIZE",
+    "book_appointment",
+    "book_first_available",
+    "cancel_appointment",
+    "fetch_appointment_status",
+    "fetch_available_slots",
+    "fetch_booking",
+    "fetch_bookings",
+    "CATALOG_PAGE_SIZE",
+    "CATALOG_SORT_RATING",
+    "fetch_catalog_estimate",
+    "fetch_catalog_page",
+    "fetch_cities",
+    "fetch_services",
+    "CHANGES_CHANNEL",
+    "RESYNC",
+    "ChangeFeed",
+    "USERS_PAGE_SIZE",
+    "add_salon_service",
+    "delete_salon_service",
+    "delete_user",
+    "fetch_available_services",
+    "fetch_masters",
+    "fetch_roles",
+    "fetch_salon_service",
+    "fetch_salon_services",
+    "fetch_salons",
+    "fetch_user_directory",
+    "find_user",
+    "generate_schedule",
+    "maintain_partitions",
+    "update_salon_service_price",
+    "REVIEW_APPROVED",
+    "REVIEW_PENDING",
+    "REVIEW_REJECTED",
+    "REVIEWS_PAGE_SIZE",
+    "approve_reviews",
+    "fetch_review_queue",
+    "fetch_review_salons",
+    "fetch_salon_ratings",
+    "reject_reviews",
+    "BookedSlotRow",
+    "BookingRow",
+    "CatalogRow",
+    "MasterRow",
+    "ModeratedReviewRow",
+    "PartitionMaintenanceRow",
+    "ReviewRow",
+    "ReviewSalonRow",
+    "RoleRow",
+    "SalonRatingRow",
+    "SalonRow",
+    "SalonServiceRow",
+    "ServiceRow",
+    "SlotRow",
+    "UserIdentity",
+    "UserRow",
+    "make_rows",
+    "DataError",
+    "configure",
+    "execute_action",
+    "execute_select",
+]
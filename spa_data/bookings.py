@@ -0,0 +1,168 @@
+from spa_data.rows import BookedSlotRow, BookingRow, SlotRow
+from spa_data.session import execute_booking, execute_write, fetch_rows, fetch_value, id_array
+
+BOOKING_WINDOW_DAYS = 14
+BOOKINGS_PAGE_SIZE = 50
+BOOKED_STATUS = "подтверждена"
+CANCELLED_STATUS = "отменена"
+CANCELLABLE_STATUSES = {"ожидает подтверждения", "подтверждена"}
+BOOKING_VIEWS = {
+    "upcoming": ("slot_start_ts >= now()", "ASC", ">"),
+    "history": ("slot_start_ts < now()", "DESC", "<"),
+}
+
+BOOKINGS_PAGE_SQL = (
+    "SELECT a.id, salons.name AS salon_name, srv.name AS service_name, "
+    "       a.slot_start_ts AS start_ts, a.status AS status "
+    "FROM ("
+    "    SELECT id, salon_id, service_id, slot_start_ts, status "
+    "    FROM appointments "
+    "    WHERE {conditions} "
+    "    ORDER BY slot_start_ts {direction}, id {direction} "
+    "    LIMIT ?"
+    ") a "
+    "JOIN salons ON salons.id = a.salon_id "
+    "JOIN services srv ON srv.id = a.service_id "
+    "ORDER BY a.slot_start_ts {direction}, a.id {direction}"
+)
+BOOKING_SQL = (
+    "SELECT a.id, salons.name AS salon_name, srv.name AS service_name, "
+    "       a.slot_start_ts AS start_ts, a.status AS status "
+    "FROM appointments a "
+    "JOIN salons ON salons.id = a.salon_id "
+    "JOIN services srv ON srv.id = a.service_id "
+    "WHERE {conditions}"
+)
+AVAILABLE_SLOTS_SQL = (
+    "SELECT slot_id, slot_count, start_ts, end_ts, master_id, master_name, specialization "
+    "FROM next_free_slots(?, ?, ?) "
+    "ORDER BY start_ts, master_id "
+    "LIMIT ?"
+)
+BOOK_FIRST_AVAILABLE_SQL = (
+    "SELECT appointment_id, slot_id, start_ts, end_ts, master_id, master_name, specialization "
+    "FROM book_first_available(?, ?, ?, now(), now() + make_interval(days => ?))"
+)
+BOOK_APPOINTMENT_SQL = "SELECT book_appointment(?, ?, ?, ?, ?, ?) AS appointment_id"
+APPOINTMENT_STATUS_SQL = "SELECT status FROM appointments a WHERE {conditions}"
+CANCEL_APPOINTMENT_SQL = "SELECT cancel_appointment(?, ?) AS cancelled"
+
+
+def appointment_conditions(appointment_id, slot_start=None):
+    conditions = ["a.id = ?"]
+    params = [appointment_id]
+    if slot_start is not None:
+        conditions.append("a.slot_start_ts = ?")
+        params.append(slot_start)
+    return " AND ".join(conditions), params
+
+
+def build_client_bookings_query(client_id, appointment_ids):
+    conditions = "a.client_id = ? AND a.id = ANY (?::BIGINT[])"
+    return BOOKING_SQL.format(conditions=conditions), [client_id, id_array(appointment_ids)]
+
+
+def build_bookings_page_query(user_id, view, cursor=None, limit=BOOKINGS_PAGE_SIZE):
+    boundary, direction, comparison = BOOKING_VIEWS[view]
+    conditions = ["client_id = ?", boundary]
+    params = [user_id]
+    if cursor is not None:
+        conditions.append(f"(slot_start_ts, id) {comparison} (?, ?)")
+        params.extend(cursor)
+    params.append(limit + 1)
+    sql = BOOKINGS_PAGE_SQL.format(conditions=" AND ".join(conditions), direction=direction)
+    return sql, params
+
+
+def split_bookings_page(rows, cursor, limit=BOOKINGS_PAGE_SIZE):
+    page = rows[:limit]
+    has_more = len(rows) > limit
+    if not page:
+        return page, cursor, has_more
+    return page, (page[-1].start_ts, page[-1].id), has_more
+
+
+def booking_in_view(booking, view, now):
+    if view == "upcoming":
+        return booking.start_ts >= now
+    return booking.start_ts < now
+
+
+def booking_sort_key(booking):
+    return booking.start_ts, booking.id
+
+
+def booking_descending(view):
+    return BOOKING_VIEWS[view][1] == "DESC"
+
+
+def available_slots_params(salon_id, service_id, limit=20):
+    return [salon_id, service_id, limit, limit]
+
+
+def fetch_bookings(user_id, view="upcoming", cursor=None, limit=BOOKINGS_PAGE_SIZE, db=None):
+    sql, params = build_bookings_page_query(user_id, view, cursor, limit)
+    rows = fetch_rows(BookingRow, sql, params, "Загрузка записей клиента", db)
+    if rows is None:
+        return None
+    return split_bookings_page(rows, cursor, limit)
+
+
+def fetch_booking(appointment_id, slot_start=None, db=None):
+    conditions, params = appointment_conditions(appointment_id, slot_start)
+    rows = fetch_rows(BookingRow, BOOKING_SQL.format(conditions=conditions), params, "Загрузка записи", db)
+    if not rows:
+        return None
+    return rows[0]
+
+
+def fetch_available_slots(salon_id, service_id, limit=20, db=None):
+    return fetch_rows(
+        SlotRow,
+        AVAILABLE_SLOTS_SQL,
+        available_slots_params(salon_id, service_id, limit),
+        "Поиск свободных слотов",
+        db,
+    )
+
+
+def book_first_available_params(client_id, salon_id, service_id, window_days=BOOKING_WINDOW_DAYS):
+    return [client_id, salon_id, service_id, window_days]
+
+
+def book_appointment_params(client_id, salon_id, master_id, service_id, slot_id, slot_start=None):
+    return [client_id, salon_id, master_id, service_id, slot_id, slot_start]
+
+
+def book_first_available(client_id, salon_id, service_id, window_days=BOOKING_WINDOW_DAYS, db=None):
+    return execute_booking(
+        BOOK_FIRST_AVAILABLE_SQL,
+        book_first_available_params(client_id, salon_id, service_id, window_days),
+        BookedSlotRow,
+        "Создание записи",
+        db,
+    )
+
+
+def book_appointment(client_id, salon_id, master_id, service_id, slot_id, slot_start=None, db=None):
+    return execute_booking(
+        BOOK_APPOINTMENT_SQL,
+        book_appointment_params(client_id, salon_id, master_id, service_id, slot_id, slot_start),
+        BookedSlotRow,
+        "Создание записи",
+        db,
+    )
+
+
+def fetch_appointment_status(appointment_id, slot_start=None, db=None):
+    conditions, params = appointment_conditions(appointment_id, slot_start)
+    return fetch_value(
+        APPOINTMENT_STATUS_SQL.format(conditions=conditions), params, "Проверка статуса записи", db
+    )
+
+
+def cancel_appointment(appointment_id, slot_start=None, db=None):
+    query = execute_write(CANCEL_APPOINTMENT_SQL, [appointment_id, slot_start], "Отмена записи", db)
+    if query is None:
+        return None
+    return bool(query.value(0)) if query.next() else False
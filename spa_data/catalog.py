@@ -0,0 +1,191 @@
+import re
+
+from spa_data.rows import CatalogRow, ServiceRow
+from spa_data.session import execute_select, fetch_rows, fetch_value
+
+CATALOG_PAGE_SIZE = 100
+CATALOG_FROM = "FROM catalog_flat cf"
+CATALOG_KEYSET = "cf.city, cf.salon_name, cf.salon_id, cf.service_name, cf.service_id"
+CATALOG_SORT_RATING = "rating"
+CATALOG_RATING_KEYSET = "cf.rating, cf.salon_id, cf.service_id"
+CATALOG_ESTIMATE_SQL = (
+    "SELECT catalog_estimate(?::TEXT, ?::BIGINT, ?::NUMERIC, ?::NUMERIC, ?::TEXT, ?::TEXT) AS estimate"
+)
+CATALOG_RANK = "GREATEST(COALESCE(srv_rank.rank, 0), COALESCE(salon_rank.rank, 0))"
+CATALOG_RANK_JOINS = (
+    "LEFT JOIN ("
+    "    SELECT id, GREATEST(ts_rank(search_tsv, to_tsquery('russian', ?)), "
+    "                        similarity(name, ?))::FLOAT8 AS rank "
+    "    FROM services WHERE search_tsv @@ to_tsquery('russian', ?) OR name ILIKE ?"
+    ") srv_rank ON srv_rank.id = cf.service_id "
+    "LEFT JOIN ("
+    "    SELECT id, GREATEST(ts_rank(search_tsv, to_tsquery('russian', ?)), "
+    "                        similarity(name, ?))::FLOAT8 AS rank "
+    "    FROM salons WHERE search_tsv @@ to_tsquery('russian', ?) OR name ILIKE ?"
+    ") salon_rank ON salon_rank.id = cf.salon_id"
+)
+
+CITIES_SQL = "SELECT DISTINCT city FROM salons ORDER BY city"
+SERVICES_SQL = "SELECT id, name FROM services ORDER BY name"
+
+
+def build_catalog_conditions(filters):
+    params = []
+    conditions = []
+    selected_city = filters.get("city")
+    search_text = (filters.get("search", "") or "").strip()
+    service_id = filters.get("service_id")
+    price_min = filters.get("price_min")
+    price_max = filters.get("price_max")
+
+    if selected_city:
+        conditions.append("cf.city = ?")
+        params.append(selected_city)
+
+    if service_id:
+        conditions.append("cf.service_id = ?")
+        params.append(service_id)
+
+    if price_min is not None:
+        conditions.append("cf.price >= ?")
+        params.append(price_min)
+
+    if price_max is not None:
+        conditions.append("cf.price <= ?")
+        params.append(price_max)
+
+    if search_text:
+        ts_query = build_prefix_tsquery(search_text)
+        like_pattern = f"%{escape_like(search_text)}%"
+        conditions.append(
+            "(cf.service_id = ANY (ARRAY("
+            "    SELECT id FROM services "
+            "    WHERE search_tsv @@ to_tsquery('russian', ?) OR name ILIKE ?"
+            ")) OR cf.salon_id = ANY (ARRAY("
+            "    SELECT id FROM salons "
+            "    WHERE search_tsv @@ to_tsquery('russian', ?) OR name ILIKE ?"
+            ")))"
+        )
+        params.extend([ts_query, like_pattern, ts_query, like_pattern])
+
+    return conditions, params
+
+
+def build_catalog_rank(filters):
+    search_text = (filters.get("search", "") or "").strip()
+    if not search_text:
+        return None
+    ts_query = build_prefix_tsquery(search_text)
+    like_pattern = f"%{escape_like(search_text)}%"
+    params = [ts_query, search_text, ts_query, like_pattern]
+    return CATALOG_RANK_JOINS, params + params
+
+
+def build_prefix_tsquery(text):
+    words = re.findall(r"\w+", text.casefold())
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def escape_like(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_catalog_page_query(conditions, params, cursor=None, rank=None, limit=CATALOG_PAGE_SIZE, sort=None):
+    conditions = list(conditions)
+    params = list(params)
+    from_sql = CATALOG_FROM
+    from_params = []
+    rank_column = ""
+    order_by = CATALOG_KEYSET
+
+    if rank is not None:
+        rank_joins, rank_params = rank
+        from_sql += " " + rank_joins
+        from_params = list(rank_params)
+        rank_column = f", {CATALOG_RANK} AS search_rank"
+        order_by = "search_rank DESC, cf.salon_id, cf.service_id"
+        if cursor is not None:
+            conditions.append(f"(-{CATALOG_RANK}, cf.salon_id, cf.service_id) > (?, ?, ?)")
+            params.extend(cursor)
+    elif sort == CATALOG_SORT_RATING:
+        order_by = "cf.rating DESC, cf.salon_id DESC, cf.service_id DESC"
+        if cursor is not None:
+            conditions.append(f"({CATALOG_RATING_KEYSET}) < (?, ?, ?)")
+            params.extend(cursor)
+    elif cursor is not None:
+        conditions.append("(cf.city, cf.salon_name, cf.salon_id) >= (?, ?, ?)")
+        params.extend(cursor[:3])
+        conditions.append(f"({CATALOG_KEYSET}) > (?, ?, ?, ?, ?)")
+        params.extend(cursor)
+
+    sql = (
+        "SELECT cf.service_name, cf.salon_name, cf.city, cf.price, "
+        "       cf.salon_id, cf.service_id, cf.rating"
+        + rank_column + " "
+        + from_sql
+    )
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += f" ORDER BY {order_by} LIMIT ?"
+    params.append(limit + 1)
+    return sql, from_params + params
+
+
+def build_estimate_query(filters):
+    search_text = (filters.get("search", "") or "").strip()
+    ts_query = build_prefix_tsquery(search_text) if search_text else None
+    like_pattern = f"%{escape_like(search_text)}%" if search_text else None
+    return CATALOG_ESTIMATE_SQL, [
+        filters.get("city") or None,
+        filters.get("service_id") or None,
+        filters.get("price_min"),
+        filters.get("price_max"),
+        ts_query,
+        like_pattern,
+    ]
+
+
+def split_catalog_page(rows, cursor, limit=CATALOG_PAGE_SIZE, sort=None):
+    page = rows[:limit]
+    has_more = len(rows) > limit
+    if not page:
+        return page, cursor, has_more
+    last = page[-1]
+    if last.search_rank is not None:
+        return page, (-last.search_rank, last.salon_id, last.service_id), has_more
+    if sort == CATALOG_SORT_RATING:
+        return page, (last.rating, last.salon_id, last.service_id), has_more
+    return page, (last.city, last.salon_name, last.salon_id, last.service_name, last.service_id), has_more
+
+
+def fetch_catalog_page(filters, cursor=None, limit=CATALOG_PAGE_SIZE, db=None):
+    conditions, params = build_catalog_conditions(filters)
+    sort = filters.get("sort")
+    sql, page_params = build_catalog_page_query(
+        conditions, params, cursor, build_catalog_rank(filters), limit, sort
+    )
+    rows = fetch_rows(CatalogRow, sql, page_params, "Загрузка каталога услуг", db)
+    if rows is None:
+        return None
+    return split_catalog_page(rows, cursor, limit, sort)
+
+
+def fetch_catalog_estimate(filters, db=None):
+    sql, params = build_estimate_query(filters)
+    return fetch_value(sql, params, "Оценка размера каталога", db)
+
+
+def fetch_cities(db=None):
+    query = execute_select(CITIES_SQL, context="Загрузка списка городов", db=db)
+    if query is None:
+        return None
+    cities = []
+    while query.next():
+        city = query.value(0)
+        if city:
+            cities.append(city)
+    return cities
+
+
+def fetch_services(db=None):
+    return fetch_rows(ServiceRow, SERVICES_SQL, context="Загрузка списка услуг", db=db)
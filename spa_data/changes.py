@@ -0,0 +1,64 @@
+import json
+
+from PySide6.QtSql import QSqlDatabase, QSqlDriver, QSqlQuery
+
+from db import ensure_connection
+
+CHANGES_CHANNEL = "smart_spa_changes"
+RESYNC = "RESYNC"
+
+
+class ChangeFeed:
+    def __init__(self, handler, channel=CHANGES_CHANNEL):
+        self._handler = handler
+        self._channel = channel
+        self._db = None
+        self._backend_pid = None
+
+    def start(self, db=None):
+        self._db = db or QSqlDatabase.database()
+        driver = self._db.driver()
+        if not driver.hasFeature(QSqlDriver.EventNotifications):
+            return False
+        driver.notification.connect(self._on_notification)
+        self._backend_pid = self._current_pid()
+        return driver.subscribeToNotification(self._channel)
+
+    def stop(self):
+        if self._db is None:
+            return
+        driver = self._db.driver()
+        if self._channel in driver.subscribedToNotifications():
+            driver.unsubscribeFromNotification(self._channel)
+        driver.notification.disconnect(self._on_notification)
+        self._db = None
+
+    def check(self):
+        if self._db is None:
+            return
+        ensure_connection(self._db)
+        backend_pid = self._current_pid()
+        if backend_pid is None or backend_pid == self._backend_pid:
+            return
+        self._backend_pid = backend_pid
+        driver = self._db.driver()
+        if self._channel in driver.subscribedToNotifications():
+            driver.unsubscribeFromNotification(self._channel)
+        if driver.subscribeToNotification(self._channel):
+            self._handler({"op": RESYNC})
+
+    def _current_pid(self):
+        query = QSqlQuery(self._db)
+        if query.exec("SELECT pg_backend_pid()") and query.next():
+            return query.value(0)
+        return None
+
+    def _on_notification(self, name, source, payload):
+        if name != self._channel or source == QSqlDriver.NotificationSource.SelfSource:
+            return
+        try:
+            change = json.loads(payload)
+        except (TypeError, ValueError):
+            return
+        if isinstance(change, dict):
+            self._handler(change)
@@ -0,0 +1,266 @@
+import re
+
+from spa_data.catalog import escape_like
+from spa_data.rows import (
+    MasterRow,
+    PartitionMaintenanceRow,
+    RoleRow,
+    SalonRow,
+    SalonServiceRow,
+    ServiceRow,
+    UserIdentity,
+    UserRow,
+)
+from spa_data.session import execute_action, execute_returning, fetch_rows, fetch_value, id_array
+
+FIND_USER_SQL = (
+    "SELECT u.id, u.full_name, r.code AS role_code, r.name AS role_name "
+    "FROM users u "
+    "JOIN roles r ON r.id = u.role_id "
+    "WHERE {condition} "
+    "ORDER BY u.id "
+    "LIMIT 1"
+)
+LOGIN_CONDITIONS = {
+    "phone": "u.phone = ?",
+    "email": "lower(u.email) = lower(?)",
+    "name": "lower(u.full_name) = lower(?)",
+}
+PHONE_PATTERN = re.compile(r"\+?[\d\s().-]+")
+USERS_PAGE_SIZE = 100
+USER_DIRECTORY_SQL = (
+    "SELECT u.id, u.full_name, u.phone, u.email, r.name AS role_name, u.created_at, "
+    "       u.created_at::TEXT AS created_key "
+    "FROM users u "
+    "JOIN roles r ON r.id = u.role_id "
+    "WHERE {conditions} "
+    "ORDER BY u.created_at DESC, u.id DESC "
+    "LIMIT ?"
+)
+USER_SEARCH_CONDITIONS = {
+    "phone": "u.phone LIKE ?",
+    "email": "lower(u.email) LIKE lower(?)",
+    "name": "lower(u.full_name) LIKE lower(?)",
+}
+ROLES_SQL = "SELECT id, code, name FROM roles ORDER BY id"
+SALONS_SQL = "SELECT id, name, city FROM salons ORDER BY name"
+MASTERS_SQL = (
+    "SELECT m.id, m.full_name, salons.name AS salon_name "
+    "FROM masters m "
+    "JOIN salons ON salons.id = m.salon_id "
+    "WHERE m.active = TRUE "
+    "ORDER BY salons.name, m.full_name"
+)
+AVAILABLE_SERVICES_SQL = (
+    "SELECT s.id, s.name, s.duration_min, s.base_price "
+    "FROM services s "
+    "WHERE NOT EXISTS ("
+    "    SELECT 1 FROM salon_services ss "
+    "    WHERE ss.salon_id = ? AND ss.service_id = s.id"
+    ") "
+    "ORDER BY s.name"
+)
+SALON_SERVICES_SQL = (
+    "SELECT salon_id, salon_name, city, service_id, service_name, duration_min, price "
+    "FROM catalog_flat "
+    "ORDER BY salon_name, service_name"
+)
+SALON_SERVICE_SQL = (
+    "SELECT salon_id, salon_name, city, service_id, service_name, duration_min, price "
+    "FROM catalog_flat "
+    "WHERE salon_id = ? AND service_id = ?"
+)
+SALON_SERVICES_BY_KEY_SQL = (
+    "SELECT salon_id, salon_name, city, service_id, service_name, duration_min, price "
+    "FROM catalog_flat "
+    "WHERE (salon_id, service_id) IN (SELECT * FROM unnest(?::BIGINT[], ?::BIGINT[]))"
+)
+SALON_SERVICE_RETURNING_SQL = (
+    "WITH changed AS ({statement} RETURNING salon_id, service_id, effective_price) "
+    "SELECT changed.salon_id, sl.name AS salon_name, sl.city, changed.service_id, "
+    "       srv.name AS service_name, srv.duration_min, changed.effective_price AS price "
+    "FROM changed "
+    "JOIN salons sl ON sl.id = changed.salon_id "
+    "JOIN services srv ON srv.id = changed.service_id"
+)
+ADD_SALON_SERVICE_SQL = SALON_SERVICE_RETURNING_SQL.format(
+    statement="INSERT INTO salon_services (salon_id, service_id, price) VALUES (?, ?, ?)"
+)
+UPDATE_SALON_SERVICE_PRICE_SQL = SALON_SERVICE_RETURNING_SQL.format(
+    statement="UPDATE salon_services SET price = ? WHERE salon_id = ? AND service_id = ?"
+)
+GENERATE_SCHEDULE_SQL = (
+    "SELECT generate_schedule(?::BIGINT, CURRENT_DATE + 1, CURRENT_DATE + ?::INTEGER, "
+    "make_interval(mins => ?::INTEGER))"
+)
+MAINTAIN_PARTITIONS_SQL = "SELECT created, archived FROM maintain_schedule_partitions(?::INTEGER, ?::INTEGER)"
+
+
+def normalize_phone(text):
+    digits = re.sub(r"\D", "", text or "")
+    if len(digits) == 11 and digits.startswith("8"):
+        digits = "7" + digits[1:]
+    elif len(digits) == 10:
+        digits = "7" + digits
+    return "+" + digits if digits else text
+
+
+def classify_login(login_text):
+    login_text = (login_text or "").strip()
+    if not login_text:
+        return None, None
+    if "@" in login_text:
+        return "email", login_text
+    if PHONE_PATTERN.fullmatch(login_text) and len(re.sub(r"\D", "", login_text)) >= 10:
+        return "phone", normalize_phone(login_text)
+    return "name", " ".join(login_text.split())
+
+
+def normalize_phone_prefix(text):
+    digits = re.sub(r"\D", "", text or "")
+    if digits.startswith("8"):
+        digits = "7" + digits[1:]
+    elif digits.startswith("9"):
+        digits = "7" + digits
+    return "+" + digits
+
+
+def classify_user_search(search_text):
+    search_text = " ".join((search_text or "").split())
+    if not search_text:
+        return None, None
+    if "@" in search_text:
+        return "email", search_text
+    if PHONE_PATTERN.fullmatch(search_text) and re.search(r"\d", search_text):
+        return "phone", normalize_phone_prefix(search_text)
+    return "name", search_text
+
+
+def find_user(login_text, db=None):
+    kind, value = classify_login(login_text)
+    if kind is None:
+        return None
+    sql = FIND_USER_SQL.format(condition=LOGIN_CONDITIONS[kind])
+    rows = fetch_rows(UserIdentity, sql, [value], "Поиск пользователя", db)
+    return rows[0] if rows else None
+
+
+def build_user_directory_query(filters, cursor=None, limit=USERS_PAGE_SIZE):
+    conditions = []
+    params = []
+    kind, value = classify_user_search(filters.get("search"))
+    if kind is not None:
+        conditions.append(USER_SEARCH_CONDITIONS[kind])
+        params.append(escape_like(value) + "%")
+    role_id = filters.get("role_id")
+    if role_id:
+        conditions.append("u.role_id = ?")
+        params.append(role_id)
+    if cursor is not None:
+        conditions.append("(u.created_at, u.id) < (?::TIMESTAMPTZ, ?)")
+        params.extend(cursor)
+    params.append(limit + 1)
+    return USER_DIRECTORY_SQL.format(conditions=" AND ".join(conditions) or "TRUE"), params
+
+
+def split_user_page(rows, cursor, limit=USERS_PAGE_SIZE):
+    page = rows[:limit]
+    has_more = len(rows) > limit
+    if not page:
+        return page, cursor, has_more
+    return page, (page[-1].created_key, page[-1].id), has_more
+
+
+def fetch_user_directory(filters, cursor=None, limit=USERS_PAGE_SIZE, db=None):
+    sql, params = build_user_directory_query(filters, cursor, limit)
+    rows = fetch_rows(UserRow, sql, params, "Загрузка пользователей", db)
+    if rows is None:
+        return None
+    return split_user_page(rows, cursor, limit)
+
+
+def fetch_roles(db=None):
+    return fetch_rows(RoleRow, ROLES_SQL, context="Загрузка списка ролей", db=db)
+
+
+def delete_user(user_id, db=None):
+    return execute_action("DELETE FROM users WHERE id = ?", [user_id], "Удаление пользователя", db)
+
+
+def fetch_salons(db=None):
+    return fetch_rows(SalonRow, SALONS_SQL, context="Загрузка списка салонов", db=db)
+
+
+def fetch_masters(db=None):
+    return fetch_rows(MasterRow, MASTERS_SQL, context="Загрузка списка мастеров", db=db)
+
+
+def fetch_available_services(salon_id, db=None):
+    if salon_id is None:
+        return []
+    return fetch_rows(ServiceRow, AVAILABLE_SERVICES_SQL, [salon_id], "Доступные услуги для салона", db)
+
+
+def fetch_salon_services(db=None):
+    return fetch_rows(SalonServiceRow, SALON_SERVICES_SQL, context="Загрузка услуг салона", db=db)
+
+
+def build_salon_services_by_key_query(keys):
+    keys = list(keys)
+    return SALON_SERVICES_BY_KEY_SQL, [
+        id_array(salon_id for salon_id, _ in keys),
+        id_array(service_id for _, service_id in keys),
+    ]
+
+
+def fetch_salon_service(salon_id, service_id, db=None):
+    rows = fetch_rows(SalonServiceRow, SALON_SERVICE_SQL, [salon_id, service_id], "Загрузка услуги салона", db)
+    if not rows:
+        return None
+    return rows[0]
+
+
+def add_salon_service(salon_id, service_id, price, db=None):
+    return execute_returning(
+        SalonServiceRow,
+        ADD_SALON_SERVICE_SQL,
+        [salon_id, service_id, price],
+        "Добавление услуги в салон",
+        db,
+    )
+
+
+def delete_salon_service(salon_id, service_id, db=None):
+    return execute_action(
+        "DELETE FROM salon_services WHERE salon_id = ? AND service_id = ?",
+        [salon_id, service_id],
+        "Удаление услуги салона",
+        db,
+    )
+
+
+def update_salon_service_price(salon_id, service_id, price, db=None):
+    return execute_returning(
+        SalonServiceRow,
+        UPDATE_SALON_SERVICE_PRICE_SQL,
+        [price, salon_id, service_id],
+        "Обновление цены услуги",
+        db,
+    )
+
+
+def generate_schedule(master_id, days, step_min, db=None):
+    return fetch_value(GENERATE_SCHEDULE_SQL, [master_id, days, step_min], "Генерация расписания", db)
+
+
+def maintain_partitions(months_ahead, keep_months=None, db=None):
+    rows = fetch_rows(
+        PartitionMaintenanceRow,
+        MAINTAIN_PARTITIONS_SQL,
+        [months_ahead, keep_months],
+        "Обслуживание секций расписания",
+        db,
+    )
+    if not rows:
+        return None
+    return rows[0]
@@ -0,0 +1,99 @@
+from spa_data.rows import ModeratedReviewRow, ReviewRow, ReviewSalonRow, SalonRatingRow
+from spa_data.session import execute_returning, fetch_rows, id_array
+
+REVIEWS_PAGE_SIZE = 50
+REVIEW_PENDING = "на модерации"
+REVIEW_APPROVED = "одобрен"
+REVIEW_REJECTED = "отклонён"
+
+REVIEW_QUEUE_SQL = (
+    "SELECT r.id, u.full_name AS client_name, r.rating, r.comment, r.created_at, "
+    "       r.created_at::TEXT AS created_key "
+    "FROM ("
+    "    SELECT id, client_id, rating, comment, created_at "
+    "    FROM reviews "
+    "    WHERE {conditions} "
+    "    ORDER BY created_at DESC, id DESC "
+    "    LIMIT ?"
+    ") r "
+    "LEFT JOIN users u ON u.id = r.client_id "
+    "ORDER BY r.created_at DESC, r.id DESC"
+)
+REVIEW_SALONS_SQL = (
+    "SELECT st.salon_id, sl.name AS salon_name, sl.city, st.pending_count "
+    "FROM salon_rating_stats st "
+    "JOIN salons sl ON sl.id = st.salon_id "
+    "WHERE st.pending_count > 0 "
+    "ORDER BY st.pending_count DESC, sl.name"
+)
+MODERATE_REVIEWS_SQL = (
+    "UPDATE reviews SET status = ?, moderated_at = now() "
+    "WHERE id = ANY (?::BIGINT[]) AND status = ? "
+    "RETURNING id, salon_id, status"
+)
+SALON_RATINGS_SQL = (
+    "SELECT salon_id, avg_rating, rating_count, pending_count "
+    "FROM salon_rating_stats "
+    "WHERE salon_id = ANY (?::BIGINT[])"
+)
+
+
+def build_review_queue_query(salon_id, cursor=None, limit=REVIEWS_PAGE_SIZE):
+    conditions = ["salon_id = ?", "status = ?"]
+    params = [salon_id, REVIEW_PENDING]
+    if cursor is not None:
+        conditions.append("(created_at, id) < (?::TIMESTAMPTZ, ?)")
+        params.extend(cursor)
+    params.append(limit + 1)
+    return REVIEW_QUEUE_SQL.format(conditions=" AND ".join(conditions)), params
+
+
+def split_review_page(rows, cursor, limit=REVIEWS_PAGE_SIZE):
+    page = rows[:limit]
+    has_more = len(rows) > limit
+    if not page:
+        return page, cursor, has_more
+    return page, (page[-1].created_key, page[-1].id), has_more
+
+
+def fetch_review_queue(salon_id, cursor=None, limit=REVIEWS_PAGE_SIZE, db=None):
+    sql, params = build_review_queue_query(salon_id, cursor, limit)
+    rows = fetch_rows(ReviewRow, sql, params, "Загрузка отзывов на модерацию", db)
+    if rows is None:
+        return None
+    return split_review_page(rows, cursor, limit)
+
+
+def fetch_review_salons(db=None):
+    return fetch_rows(ReviewSalonRow, REVIEW_SALONS_SQL, context="Загрузка салонов с отзывами", db=db)
+
+
+def moderate_reviews(review_ids, status, db=None):
+    if not review_ids:
+        return []
+    return execute_returning(
+        ModeratedReviewRow,
+        MODERATE_REVIEWS_SQL,
+        [status, id_array(review_ids), REVIEW_PENDING],
+        "Модерация отзывов",
+        db,
+    )
+
+
+def approve_reviews(review_ids, db=None):
+    return moderate_reviews(review_ids, REVIEW_APPROVED, db)
+
+
+def reject_reviews(review_ids, db=None):
+    return moderate_reviews(review_ids, REVIEW_REJECTED, db)
+
+
+def build_salon_ratings_query(salon_ids):
+    return SALON_RATINGS_SQL, [id_array(salon_ids)]
+
+
+def fetch_salon_ratings(salon_ids, db=None):
+    if not salon_ids:
+        return []
+    sql, params = build_salon_ratings_query(salon_ids)
+    return fetch_rows(SalonRatingRow, sql, params, "Загрузка рейтингов салонов", db)
@@ -0,0 +1,53 @@
+from collections import namedtuple
+
+CatalogRow = namedtuple(
+    "CatalogRow",
+    ["service_name", "salon_name", "city", "price", "salon_id", "service_id", "rating", "search_rank"],
+    defaults=[None, None],
+)
+BookingRow = namedtuple("BookingRow", ["id", "salon_name", "service_name", "start_ts", "status"])
+SlotRow = namedtuple(
+    "SlotRow",
+    ["slot_id", "slot_count", "start_ts", "end_ts", "master_id", "master_name", "specialization"],
+)
+BookedSlotRow = namedtuple(
+    "BookedSlotRow",
+    ["appointment_id", "slot_id", "start_ts", "end_ts", "master_id", "master_name", "specialization"],
+)
+SalonRow = namedtuple("SalonRow", ["id", "name", "city"])
+MasterRow = namedtuple("MasterRow", ["id", "full_name", "salon_name"])
+ServiceRow = namedtuple("ServiceRow", ["id", "name", "duration_min", "base_price"], defaults=[None, None])
+SalonServiceRow = namedtuple(
+    "SalonServiceRow",
+    ["salon_id", "salon_name", "city", "service_id", "service_name", "duration_min", "price"],
+)
+UserRow = namedtuple("UserRow", ["id", "full_name", "phone", "email", "role_name", "created_at", "created_key"])
+RoleRow = namedtuple("RoleRow", ["id", "code", "name"])
+PartitionMaintenanceRow = namedtuple("PartitionMaintenanceRow", ["created", "archived"])
+UserIdentity = namedtuple("UserIdentity", ["id", "full_name", "role_code", "role_name"])
+ReviewRow = namedtuple("ReviewRow", ["id", "client_name", "rating", "comment", "created_at", "created_key"])
+ReviewSalonRow = namedtuple("ReviewSalonRow", ["salon_id", "salon_name", "city", "pending_count"])
+ModeratedReviewRow = namedtuple("ModeratedReviewRow", ["id", "salon_id", "status"])
+SalonRatingRow = namedtuple("SalonRatingRow", ["salon_id", "avg_rating", "rating_count", "pending_count"])
+
+
+def make_rows(row_type, records):
+    return [row_type._make(record.get(name) for name in row_type._fields) for record in records]
+
+
+def read_rows(row_type, query):
+    record = query.record()
+    indexes = [record.indexOf(name) for name in row_type._fields]
+    rows = []
+    while query.next():
+        rows.append(row_type._make(query.value(i) if i >= 0 else None for i in indexes))
+    return rows
+
+
+def read_records(query):
+    record = query.record()
+    names = [record.fieldName(i) for i in range(record.count())]
+    records = []
+    while query.next():
+        records.append({name: query.value(i) for i, name in enumerate(names)})
+    return records
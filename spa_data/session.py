@@ -0,0 +1,148 @@
+import time
+
+from PySide6.QtSql import QSqlDatabase, QSqlQuery
+
+from db import connection_lost, ensure_connection
+from spa_data.rows import make_rows, read_records, read_rows
+from statement_cache import StatementCache
+
+BOOKING_RETRY_SQLSTATES = {"40001", "40P01", "55P03"}
+BOOKING_RETRY_LIMIT = 3
+BOOKING_RETRY_DELAY = 0.05
+BOOKING_LOCK_TIMEOUT = "2s"
+
+
+class DataError(RuntimeError):
+    def __init__(self, context, error):
+        self.context = context
+        self.code = error.nativeErrorCode() if error.isValid() else ""
+        self.text = error.text() if error.isValid() else ""
+        super().__init__(f"{context}: {self.text}" if context else self.text)
+
+
+def id_array(ids):
+    return "{" + ",".join(str(int(value)) for value in ids) + "}"
+
+
+def raise_data_error(error, context):
+    raise DataError(context, error)
+
+
+statement_cache = StatementCache(max_entries=64)
+_state = {"instrumentation": None, "error_handler": raise_data_error}
+
+
+def configure(instrumentation=None, error_handler=None):
+    if instrumentation is not None:
+        _state["instrumentation"] = instrumentation
+    if error_handler is not None:
+        _state["error_handler"] = error_handler
+
+
+def report_error(error, context):
+    _state["error_handler"](error, context)
+
+
+def run_query(sql, params=None, db=None):
+    db = db or QSqlDatabase.database()
+    ensure_connection(db)
+    return statement_cache.execute(db, sql, params)
+
+
+def record_query(context, started, query, ok, sql=None, params=None):
+    rows = max(query.size(), query.numRowsAffected(), 0) if ok else 0
+    record_rows(context, started, rows, not ok, sql, params)
+
+
+def record_rows(context, started, rows, failed, sql=None, params=None):
+    instrumentation = _state["instrumentation"]
+    if instrumentation is None:
+        return
+    instrumentation.record_query(
+        context or sql, (time.perf_counter() - started) * 1000, rows, failed, sql, params
+    )
+
+
+def execute_select(sql, params=None, context="", db=None):
+    db = db or QSqlDatabase.database()
+    started = time.perf_counter()
+    query, ok = run_query(sql, params, db)
+    if not ok and connection_lost(db, query.lastError()) and ensure_connection(db, force=True):
+        query, ok = run_query(sql, params, db)
+    record_query(context, started, query, ok, sql, params)
+    if not ok:
+        report_error(query.lastError(), context)
+        return None
+    return query
+
+
+def execute_write(sql, params=None, context="", db=None):
+    db = db or QSqlDatabase.database()
+    started = time.perf_counter()
+    query, ok = run_query(sql, params, db)
+    record_query(context, started, query, ok, sql, params)
+    if not ok:
+        ensure_connection(db, force=True)
+        report_error(query.lastError(), context)
+        return None
+    return query
+
+
+def execute_action(sql, params=None, context="", db=None):
+    return execute_write(sql, params, context, db) is not None
+
+
+def execute_returning(row_type, sql, params=None, context="", db=None):
+    query = execute_write(sql, params, context, db)
+    if query is None:
+        return None
+    return read_rows(row_type, query)
+
+
+def fetch_rows(row_type, sql, params=None, context="", db=None):
+    query = execute_select(sql, params, context, db)
+    if query is None:
+        return None
+    return read_rows(row_type, query)
+
+
+def fetch_value(sql, params=None, context="", db=None):
+    query = execute_select(sql, params, context, db)
+    if query is None:
+        return None
+    return query.value(0) if query.next() else None
+
+
+def run_booking(db, sql, params):
+    for attempt in range(1, BOOKING_RETRY_LIMIT + 1):
+        if not db.transaction():
+            return None, db.lastError()
+        query = QSqlQuery(db)
+        query.exec(f"SET LOCAL lock_timeout = '{BOOKING_LOCK_TIMEOUT}'")
+        query.prepare(sql)
+        for value in params:
+            query.addBindValue(value)
+
+        if query.exec():
+            records = read_records(query)
+            if db.commit():
+                return records, None
+            error = db.lastError()
+        else:
+            error = query.lastError()
+        db.rollback()
+        if error.nativeErrorCode() not in BOOKING_RETRY_SQLSTATES or attempt == BOOKING_RETRY_LIMIT:
+            return None, error
+        time.sleep(BOOKING_RETRY_DELAY * attempt)
+
+
+def execute_booking(sql, params, row_type, context="", db=None):
+    db = db or QSqlDatabase.database()
+    ensure_connection(db)
+    started = time.perf_counter()
+    records, error = run_booking(db, sql, params)
+    record_rows(context, started, len(records or []), error is not None, sql, params)
+    if error is not None:
+        report_error(error, context)
+        return None
+    return make_rows(row_type, records)
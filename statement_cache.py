@@ -0,0 +1,86 @@
+import threading
+from collections import OrderedDict
+
+from PySide6.QtSql import QSqlQuery
+
+from db import add_close_listener
+
+STALE_STATEMENT_SQLSTATES = {"", "26000"}
+
+
+class StatementCache:
+    def __init__(self, max_entries=64):
+        self._connections = {}
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        add_close_listener(self.invalidate)
+
+    def execute(self, db, sql, params=None):
+        query, ok = self._execute_once(db, sql, params)
+        if not ok and query.lastError().nativeErrorCode() in STALE_STATEMENT_SQLSTATES:
+            self.invalidate(db.connectionName())
+            query, ok = self._execute_once(db, sql, params)
+        return query, ok
+
+    def invalidate(self, connection_name=None):
+        with self._lock:
+            if connection_name is None:
+                dropped = list(self._connections.values())
+                self._connections.clear()
+            else:
+                entries = self._connections.pop(connection_name, None)
+                dropped = [entries] if entries is not None else []
+        for entries in dropped:
+            for query in entries.values():
+                query.finish()
+
+    def stats(self):
+        total = self.hits + self.misses
+        with self._lock:
+            statements = sum(len(entries) for entries in self._connections.values())
+        return {
+            "statements": statements,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _execute_once(self, db, sql, params):
+        query, prepared = self._prepared(db, sql)
+        if not prepared:
+            return query, False
+        for index, value in enumerate(params or []):
+            query.bindValue(index, value)
+        return query, query.exec()
+
+    def _prepared(self, db, sql):
+        name = db.connectionName()
+        with self._lock:
+            entries = self._connections.setdefault(name, OrderedDict())
+            query = entries.get(sql)
+            if query is not None:
+                entries.move_to_end(sql)
+                self.hits += 1
+        if query is not None:
+            query.finish()
+            return query, True
+
+        query = QSqlQuery(db)
+        if not query.prepare(sql):
+            return query, False
+
+        evicted = []
+        with self._lock:
+            self.misses += 1
+            entries = self._connections.setdefault(name, OrderedDict())
+            entries[sql] = query
+            while len(entries) > self._max_entries:
+                evicted.append(entries.popitem(last=False)[1])
+                self.evictions += 1
+        for old_query in evicted:
+            old_query.finish()
+        return query, True
@@ -0,0 +1,263 @@
+from decimal import Decimal
+
+from PySide6.QtCore import QAbstractTableModel, QDate, QDateTime, QModelIndex, QTime, Qt
+
+
+def format_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, QDateTime):
+        return value.toString("dd.MM.yyyy HH:mm")
+    if isinstance(value, QDate):
+        return value.toString("dd.MM.yyyy")
+    if isinstance(value, QTime):
+        return value.toString("HH:mm")
+    if isinstance(value, Decimal):
+        return f"{value:.2f}"
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+def sort_key(value):
+    if value is None:
+        return (2, 0)
+    if isinstance(value, QDateTime):
+        return (0, value.toMSecsSinceEpoch())
+    if isinstance(value, QDate):
+        return (0, value.toJulianDay())
+    if isinstance(value, QTime):
+        return (0, value.msecsSinceStartOfDay())
+    if isinstance(value, (int, float, Decimal)):
+        return (0, float(value))
+    return (1, str(value).casefold())
+
+
+class RowTableModel(QAbstractTableModel):
+    def __init__(self, headers=None, batch_size=200, parent=None):
+        super().__init__(parent)
+        self._headers = list(headers or [])
+        self._columns = [[] for _ in self._headers]
+        self._payloads = []
+        self._order = []
+        self._visible = 0
+        self._batch_size = batch_size
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+        self._page_loader = None
+        self._page_pending = False
+        self._page_failed = False
+
+    def set_rows(self, headers, rows, payloads=None, page_loader=None):
+        self.beginResetModel()
+        self._page_loader = page_loader
+        self._page_pending = False
+        self._page_failed = False
+        self._headers = list(headers)
+        self._columns = [[] for _ in self._headers]
+        self._payloads = []
+        self._order = []
+        self._store(rows, payloads)
+        self._apply_sort()
+        self._visible = min(len(self._payloads), self._batch_size)
+        self.endResetModel()
+
+    def append_rows(self, rows, payloads=None, has_more=False):
+        self._page_pending = False
+        self._page_failed = False
+        if not has_more:
+            self._page_loader = None
+        if not rows:
+            return
+
+        first = self._visible
+        self._store(rows, payloads)
+        self.beginInsertRows(QModelIndex(), first, len(self._payloads) - 1)
+        self._visible = len(self._payloads)
+        self.endInsertRows()
+        if self._sort_column >= 0:
+            self.sort(self._sort_column, self._sort_order)
+
+    def fail_page(self):
+        self._page_pending = False
+        self._page_failed = True
+
+    def retry_page(self):
+        if not self._page_failed or self._page_loader is None:
+            return
+        self._page_failed = False
+        self._page_pending = True
+        self._page_loader()
+
+    def insert_row(self, row, payload=None, position=None):
+        if position is None or position > len(self._payloads):
+            position = len(self._payloads)
+        self._order = [index + 1 if index >= position else index for index in self._order]
+        display = position if self._sort_column < 0 else len(self._payloads)
+        shown = display < self._visible or self._visible == len(self._payloads)
+
+        if shown:
+            self.beginInsertRows(QModelIndex(), display, display)
+        for col_idx, column in enumerate(self._columns):
+            column.insert(display, row[col_idx] if col_idx < len(row) else None)
+        self._payloads.insert(display, payload)
+        self._order.insert(display, position)
+        if shown:
+            self._visible += 1
+            self.endInsertRows()
+        if self._sort_column >= 0:
+            self.sort(self._sort_column, self._sort_order)
+
+    def update_row(self, row_idx, row, payload=None):
+        if not 0 <= row_idx < len(self._payloads):
+            return
+        for col_idx, column in enumerate(self._columns):
+            column[row_idx] = row[col_idx] if col_idx < len(row) else None
+        self._payloads[row_idx] = payload
+        if row_idx < self._visible:
+            self.dataChanged.emit(
+                self.index(row_idx, 0), self.index(row_idx, max(len(self._columns) - 1, 0))
+            )
+        if self._sort_column >= 0:
+            self.sort(self._sort_column, self._sort_order)
+
+    def remove_row(self, row_idx):
+        if not 0 <= row_idx < len(self._payloads):
+            return
+        shown = row_idx < self._visible
+        if shown:
+            self.beginRemoveRows(QModelIndex(), row_idx, row_idx)
+        position = self._order.pop(row_idx)
+        for column in self._columns:
+            del column[row_idx]
+        del self._payloads[row_idx]
+        self._order = [index - 1 if index > position else index for index in self._order]
+        if shown:
+            self._visible -= 1
+            self.endRemoveRows()
+
+    def find_row(self, predicate):
+        for row_idx, payload in enumerate(self._payloads):
+            if payload is not None and predicate(payload):
+                return row_idx
+        return -1
+
+    def payloads(self):
+        return list(self._payloads)
+
+    def has_more_pages(self):
+        return self._page_loader is not None
+
+    def _store(self, rows, payloads):
+        start = len(self._order)
+        for row_idx, row in enumerate(rows):
+            for col_idx, column in enumerate(self._columns):
+                column.append(row[col_idx] if col_idx < len(row) else None)
+            payload = None
+            if payloads and row_idx < len(payloads):
+                payload = payloads[row_idx]
+            self._payloads.append(payload)
+            self._order.append(start + row_idx)
+
+    def loaded_count(self):
+        return len(self._payloads)
+
+    def value(self, row, column):
+        if 0 <= row < self._visible and 0 <= column < len(self._columns):
+            return self._columns[column][row]
+        return None
+
+    def payload(self, row):
+        if 0 <= row < self._visible:
+            return self._payloads[row]
+        return None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._visible
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return format_cell(self._columns[column][row])
+        if role == Qt.UserRole:
+            return self._payloads[row]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            if 0 <= section < len(self._headers):
+                return self._headers[section]
+            return None
+        return str(section + 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        if self._visible < len(self._payloads):
+            return True
+        return self._page_ready()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        remaining = len(self._payloads) - self._visible
+        count = min(remaining, self._batch_size)
+        if count <= 0:
+            if self._page_ready():
+                self._page_pending = True
+                self._page_loader()
+            return
+        self.beginInsertRows(QModelIndex(), self._visible, self._visible + count - 1)
+        self._visible += count
+        self.endInsertRows()
+
+    def _page_ready(self):
+        return self._page_loader is not None and not self._page_pending and not self._page_failed
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_positions = [self._order[index.row()] for index in old_indexes]
+        self._apply_sort()
+        new_rows = {position: row for row, position in enumerate(self._order)}
+        new_indexes = []
+        for index, position in zip(old_indexes, old_positions):
+            new_row = new_rows[position]
+            if new_row < self._visible:
+                new_indexes.append(self.index(new_row, index.column()))
+            else:
+                new_indexes.append(QModelIndex())
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def _apply_sort(self):
+        if self._sort_column < 0 or self._sort_column >= len(self._columns):
+            keys = self._order
+            reverse = False
+        else:
+            values = self._columns[self._sort_column]
+            keys = [sort_key(value) for value in values]
+            reverse = self._sort_order == Qt.DescendingOrder
+        permutation = sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+        self._columns = [[column[i] for i in permutation] for column in self._columns]
+        self._payloads = [self._payloads[i] for i in permutation]
+        self._order = [self._order[i] for i in permutation]
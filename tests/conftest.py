@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from PySide6.QtCore import QCoreApplication
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    return QCoreApplication.instance() or QCoreApplication([])
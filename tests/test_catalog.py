@@ -0,0 +1,47 @@
+from spa_data.catalog import (
+    CATALOG_ESTIMATE_SQL,
+    build_catalog_conditions,
+    build_estimate_query,
+    build_prefix_tsquery,
+    escape_like,
+)
+
+
+def test_build_catalog_conditions_without_filters():
+    assert build_catalog_conditions({}) == ([], [])
+
+
+def test_build_catalog_conditions_orders_params_with_placeholders():
+    conditions, params = build_catalog_conditions(
+        {"city": "Москва", "service_id": 7, "price_min": 1000, "price_max": 5000}
+    )
+    assert conditions == ["cf.city = ?", "cf.service_id = ?", "cf.price >= ?", "cf.price <= ?"]
+    assert params == ["Москва", 7, 1000, 5000]
+    assert sum(condition.count("?") for condition in conditions) == len(params)
+
+
+def test_build_catalog_conditions_search():
+    conditions, params = build_catalog_conditions({"search": "  Масс 50% "})
+    assert len(conditions) == 1
+    assert conditions[0].count("?") == len(params) == 4
+    assert params == ["масс:* & 50:*", "%Масс 50\\%%", "масс:* & 50:*", "%Масс 50\\%%"]
+
+
+def test_build_prefix_tsquery_and_escape_like():
+    assert build_prefix_tsquery("Классический, массаж!") == "классический:* & массаж:*"
+    assert build_prefix_tsquery("  ") == ""
+    assert escape_like("a\\b%c_d") == "a\\\\b\\%c\\_d"
+
+
+def test_build_estimate_query_passes_typed_filters():
+    sql, params = build_estimate_query(
+        {"city": "Москва'; --", "service_id": 7, "price_min": 1000, "price_max": None, "search": " $2 массаж "}
+    )
+    assert sql == CATALOG_ESTIMATE_SQL
+    assert sql.startswith("SELECT catalog_estimate(")
+    assert sql.count("?") == len(params)
+    assert params == ["Москва'; --", 7, 1000, None, "2:* & массаж:*", "%$2 массаж%"]
+
+
+def test_build_estimate_query_without_filters():
+    assert build_estimate_query({}) == (CATALOG_ESTIMATE_SQL, [None] * 6)
@@ -0,0 +1,38 @@
+import pytest
+
+from spa_data.directory import classify_login, classify_user_search, normalize_phone
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("8 (999) 000-00-01", "+79990000001"),
+        ("+7 999 000 00 01", "+79990000001"),
+        ("9990000001", "+79990000001"),
+        ("79990000001", "+79990000001"),
+        ("", ""),
+    ],
+)
+def test_normalize_phone(text, expected):
+    assert normalize_phone(text) == expected
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("  ivan@example.com ", ("email", "ivan@example.com")),
+        ("8 999 000-00-01", ("phone", "+79990000001")),
+        ("Иван   Петров", ("name", "Иван Петров")),
+        ("12-34", ("name", "12-34")),
+        ("   ", (None, None)),
+        (None, (None, None)),
+    ],
+)
+def test_classify_login(text, expected):
+    assert classify_login(text) == expected
+
+
+def test_classify_user_search_keeps_phone_prefix():
+    assert classify_user_search("8 999") == ("phone", "+7999")
+    assert classify_user_search("dir77@") == ("email", "dir77@")
+    assert classify_user_search(" Мария  ") == ("name", "Мария")
@@ -0,0 +1,41 @@
+import query_cache
+from query_cache import QueryCache
+
+
+def test_get_counts_hits_and_misses():
+    cache = QueryCache()
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_put_evicts_least_recently_used():
+    cache = QueryCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.peek("b") is None
+    assert cache.peek("a") == 1
+    assert [key for key, _ in cache.items()] == ["c", "a"]
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(query_cache.time, "monotonic", lambda: now[0])
+    cache = QueryCache(ttl=10.0)
+    cache.put("a", 1)
+    now[0] += 5
+    assert cache.peek("a") == 1
+    now[0] += 6
+    assert cache.get("a") is None
+    assert cache.items() == []
+
+
+def test_clear():
+    cache = QueryCache()
+    cache.put("a", 1)
+    cache.clear()
+    assert cache.peek("a") is None
+    assert cache.stats()["entries"] == 0
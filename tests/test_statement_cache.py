@@ -0,0 +1,53 @@
+import pytest
+from PySide6.QtSql import QSqlDatabase
+
+from db import close_connection
+from statement_cache import StatementCache
+
+
+@pytest.fixture
+def sqlite_db(qapp):
+    db = QSqlDatabase.addDatabase("QSQLITE", "statement_cache_test")
+    db.setDatabaseName(":memory:")
+    assert db.open()
+    yield db
+    close_connection(db)
+    del db
+    QSqlDatabase.removeDatabase("statement_cache_test")
+
+
+def fetch_one(cache, db, sql, params=None):
+    query, ok = cache.execute(db, sql, params)
+    assert ok, query.lastError().text()
+    assert query.next()
+    return query.value(0)
+
+
+def test_reuses_prepared_statement(sqlite_db):
+    cache = StatementCache(max_entries=4)
+    assert fetch_one(cache, sqlite_db, "SELECT ? + 1", [1]) == 2
+    assert fetch_one(cache, sqlite_db, "SELECT ? + 1", [41]) == 42
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["statements"]) == (1, 1, 1)
+
+
+def test_evicts_least_recently_used_statement(sqlite_db):
+    cache = StatementCache(max_entries=2)
+    fetch_one(cache, sqlite_db, "SELECT 1")
+    fetch_one(cache, sqlite_db, "SELECT 2")
+    fetch_one(cache, sqlite_db, "SELECT 1")
+    fetch_one(cache, sqlite_db, "SELECT 3")
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["statements"] == 2
+
+    fetch_one(cache, sqlite_db, "SELECT 1")
+    assert cache.stats()["hits"] == 2
+    fetch_one(cache, sqlite_db, "SELECT 2")
+    assert cache.stats()["misses"] == 4
+
+
+def test_closing_connection_drops_its_statements(sqlite_db):
+    cache = StatementCache()
+    fetch_one(cache, sqlite_db, "SELECT 1")
+    cache.invalidate(sqlite_db.connectionName())
+    assert cache.stats()["statements"] == 0
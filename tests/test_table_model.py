@@ -0,0 +1,61 @@
+from PySide6.QtCore import Qt
+
+from table_model import RowTableModel
+
+
+def column(model, index):
+    return [model.value(row, index) for row in range(model.rowCount())]
+
+
+def test_set_rows_shows_first_batch_and_fetches_the_rest(qapp):
+    model = RowTableModel(batch_size=2)
+    model.set_rows(["ID"], [[1], [2], [3], [4], [5]], payloads=["a", "b", "c", "d", "e"])
+    assert model.rowCount() == 2
+    assert model.canFetchMore()
+    model.fetchMore()
+    model.fetchMore()
+    assert model.rowCount() == 5
+    assert not model.canFetchMore()
+    assert model.payload(4) == "e"
+
+
+def test_sort_keeps_none_last_and_payloads_aligned(qapp):
+    model = RowTableModel()
+    model.set_rows(["Имя", "Цена"], [["б", 20], ["А", None], ["в", 10]], payloads=[1, 2, 3])
+    model.sort(1, Qt.AscendingOrder)
+    assert column(model, 1) == [10, 20, None]
+    assert model.payloads() == [3, 1, 2]
+    model.sort(0, Qt.DescendingOrder)
+    assert column(model, 0) == ["в", "б", "А"]
+    model.sort(0, Qt.AscendingOrder)
+    assert column(model, 0) == ["А", "б", "в"]
+
+
+def test_page_loader_requests_next_page_once(qapp):
+    calls = []
+    model = RowTableModel()
+    model.set_rows(["ID"], [[1]], page_loader=lambda: calls.append(len(calls)))
+    assert model.canFetchMore()
+    model.fetchMore()
+    assert not model.canFetchMore()
+    model.fetchMore()
+    assert calls == [0]
+
+    model.append_rows([[2]], has_more=False)
+    assert column(model, 0) == [1, 2]
+    assert not model.has_more_pages()
+
+
+def test_failed_page_waits_for_explicit_retry(qapp):
+    calls = []
+    model = RowTableModel()
+    model.set_rows(["ID"], [[1]], page_loader=lambda: calls.append(len(calls)))
+    model.fetchMore()
+    model.fail_page()
+    assert not model.canFetchMore()
+    model.fetchMore()
+    assert calls == [0]
+    model.retry_page()
+    assert calls == [0, 1]
+    model.append_rows([[2]], has_more=True)
+    assert model.canFetchMore()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'AdminTab.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import QCoreApplication, QMetaObject
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QComboBox, QGridLayout, QHBoxLayout, QLineEdit, QPushButton, QTabWidget, QTableView, QWidget
+
+class Ui_AdminTab(object):
+    def setupUi(self, tabAdmin):
+        if not tabAdmin.objectName():
+            tabAdmin.setObjectName(u"tabAdmin")
+        self.gridLayout_5 = QGridLayout(tabAdmin)
+        self.gridLayout_5.setObjectName(u"gridLayout_5")
+        self.twAdmin = QTabWidget(tabAdmin)
+        self.twAdmin.setObjectName(u"twAdmin")
+        font = QFont()
+        font.setPointSize(14)
+        self.twAdmin.setFont(font)
+        self.tabAdminUsers = QWidget()
+        self.tabAdminUsers.setObjectName(u"tabAdminUsers")
+        self.gridLayout_8 = QGridLayout(self.tabAdminUsers)
+        self.gridLayout_8.setObjectName(u"gridLayout_8")
+        self.horizontalLayout_6 = QHBoxLayout()
+        self.horizontalLayout_6.setObjectName(u"horizontalLayout_6")
+        self.leUserSearch = QLineEdit(self.tabAdminUsers)
+        self.leUserSearch.setObjectName(u"leUserSearch")
+        self.leUserSearch.setFont(font)
+
+        self.horizontalLayout_6.addWidget(self.leUserSearch)
+
+        self.cbUserRole = QComboBox(self.tabAdminUsers)
+        self.cbUserRole.setObjectName(u"cbUserRole")
+        self.cbUserRole.setFont(font)
+
+        self.horizontalLayout_6.addWidget(self.cbUserRole)
+
+
+        self.gridLayout_8.addLayout(self.horizontalLayout_6, 0, 0, 1, 1)
+
+        self.tblUsers = QTableView(self.tabAdminUsers)
+        self.tblUsers.setObjectName(u"tblUsers")
+        self.tblUsers.setFont(font)
+
+        self.gridLayout_8.addWidget(self.tblUsers, 1, 0, 1, 1)
+
+        self.horizontalLayout_3 = QHBoxLayout()
+        self.horizontalLayout_3.setObjectName(u"horizontalLayout_3")
+        self.btnDeleteUser = QPushButton(self.tabAdminUsers)
+        self.btnDeleteUser.setObjectName(u"btnDeleteUser")
+        self.btnDeleteUser.setFont(font)
+
+        self.horizontalLayout_3.addWidget(self.btnDeleteUser)
+
+
+        self.gridLayout_8.addLayout(self.horizontalLayout_3, 2, 0, 1, 1)
+
+        self.twAdmin.addTab(self.tabAdminUsers, "")
+        self.tabAdminReviews = QWidget()
+        self.tabAdminReviews.setObjectName(u"tabAdminReviews")
+        self.gridLayout_9 = QGridLayout(self.tabAdminReviews)
+        self.gridLayout_9.setObjectName(u"gridLayout_9")
+        self.cbReviewSalon = QComboBox(self.tabAdminReviews)
+        self.cbReviewSalon.setObjectName(u"cbReviewSalon")
+        self.cbReviewSalon.setFont(font)
+
+        self.gridLayout_9.addWidget(self.cbReviewSalon, 0, 0, 1, 1)
+
+        self.tblReviews = QTableView(self.tabAdminReviews)
+        self.tblReviews.setObjectName(u"tblReviews")
+        self.tblReviews.setFont(font)
+
+        self.gridLayout_9.addWidget(self.tblReviews, 1, 0, 1, 1)
+
+        self.horizontalLayout_5 = QHBoxLayout()
+        self.horizontalLayout_5.setObjectName(u"horizontalLayout_5")
+        self.btnApproveReview = QPushButton(self.tabAdminReviews)
+        self.btnApproveReview.setObjectName(u"btnApproveReview")
+        self.btnApproveReview.setFont(font)
+
+        self.horizontalLayout_5.addWidget(self.btnApproveReview)
+
+        self.btnRejectReview = QPushButton(self.tabAdminReviews)
+        self.btnRejectReview.setObjectName(u"btnRejectReview")
+        self.btnRejectReview.setFont(font)
+
+        self.horizontalLayout_5.addWidget(self.btnRejectReview)
+
+
+        self.gridLayout_9.addLayout(self.horizontalLayout_5, 2, 0, 1, 1)
+
+        self.twAdmin.addTab(self.tabAdminReviews, "")
+
+        self.gridLayout_5.addWidget(self.twAdmin, 0, 0, 1, 1)
+
+
+        self.retranslateUi(tabAdmin)
+
+        self.twAdmin.setCurrentIndex(0)
+
+
+        QMetaObject.connectSlotsByName(tabAdmin)
+    # setupUi
+
+    def retranslateUi(self, tabAdmin):
+        tabAdmin.setWindowTitle(QCoreApplication.translate("AdminTab", u"\u0410\u0434\u043c\u0438\u043d", None))
+        self.leUserSearch.setPlaceholderText(QCoreApplication.translate("AdminTab", u"\u0422\u0435\u043b\u0435\u0444\u043e\u043d, email \u0438\u043b\u0438 \u043d\u0430\u0447\u0430\u043b\u043e \u0438\u043c\u0435\u043d\u0438", None))
+        self.btnDeleteUser.setText(QCoreApplication.translate("AdminTab", u"\u0423\u0434\u0430\u043b\u0438\u0442\u044c \u043f\u043e\u043b\u044c\u0437\u043e\u0432\u0430\u0442\u0435\u043b\u044f", None))
+        self.twAdmin.setTabText(self.twAdmin.indexOf(self.tabAdminUsers), QCoreApplication.translate("AdminTab", u"\u041f\u043e\u043b\u044c\u0437\u043e\u0432\u0430\u0442\u0435\u043b\u0438", None))
+        self.btnApproveReview.setText(QCoreApplication.translate("AdminTab", u"\u041e\u0434\u043e\u0431\u0440\u0438\u0442\u044c \u043e\u0442\u0437\u044b\u0432\u044b", None))
+        self.btnRejectReview.setText(QCoreApplication.translate("AdminTab", u"\u041e\u0442\u043a\u043b\u043e\u043d\u0438\u0442\u044c \u043e\u0442\u0437\u044b\u0432\u044b", None))
+        self.twAdmin.setTabText(self.twAdmin.indexOf(self.tabAdminReviews), QCoreApplication.translate("AdminTab", u"\u041e\u0442\u0437\u044b\u0432\u044b", None))
+    # retranslateUi
+
+FORM_BASE = "QWidget"
+SOURCE_DIGEST = "b087e80d162b8aff65fe1558924bf9a67ab27df8"
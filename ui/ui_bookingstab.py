@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'BookingsTab.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import QCoreApplication, QMetaObject
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QGridLayout, QHBoxLayout, QPushButton, QTabWidget, QTableView, QWidget
+
+class Ui_BookingsTab(object):
+    def setupUi(self, tabBookings):
+        if not tabBookings.objectName():
+            tabBookings.setObjectName(u"tabBookings")
+        self.gridLayout_3 = QGridLayout(tabBookings)
+        self.gridLayout_3.setObjectName(u"gridLayout_3")
+        self.twBookings = QTabWidget(tabBookings)
+        self.twBookings.setObjectName(u"twBookings")
+        font = QFont()
+        font.setPointSize(14)
+        self.twBookings.setFont(font)
+        self.tabBookingsUpcoming = QWidget()
+        self.tabBookingsUpcoming.setObjectName(u"tabBookingsUpcoming")
+        self.gridLayout_6 = QGridLayout(self.tabBookingsUpcoming)
+        self.gridLayout_6.setObjectName(u"gridLayout_6")
+        self.tblBookings = QTableView(self.tabBookingsUpcoming)
+        self.tblBookings.setObjectName(u"tblBookings")
+        self.tblBookings.setFont(font)
+
+        self.gridLayout_6.addWidget(self.tblBookings, 0, 0, 1, 1)
+
+        self.twBookings.addTab(self.tabBookingsUpcoming, "")
+        self.tabBookingsHistory = QWidget()
+        self.tabBookingsHistory.setObjectName(u"tabBookingsHistory")
+        self.gridLayout_7 = QGridLayout(self.tabBookingsHistory)
+        self.gridLayout_7.setObjectName(u"gridLayout_7")
+        self.tblBookingsHistory = QTableView(self.tabBookingsHistory)
+        self.tblBookingsHistory.setObjectName(u"tblBookingsHistory")
+        self.tblBookingsHistory.setFont(font)
+
+        self.gridLayout_7.addWidget(self.tblBookingsHistory, 0, 0, 1, 1)
+
+        self.twBookings.addTab(self.tabBookingsHistory, "")
+
+        self.gridLayout_3.addWidget(self.twBookings, 0, 0, 1, 1)
+
+        self.horizontalLayout_2 = QHBoxLayout()
+        self.horizontalLayout_2.setObjectName(u"horizontalLayout_2")
+        self.btnAddBooking = QPushButton(tabBookings)
+        self.btnAddBooking.setObjectName(u"btnAddBooking")
+        self.btnAddBooking.setFont(font)
+
+        self.horizontalLayout_2.addWidget(self.btnAddBooking)
+
+        self.btnCancelBooking = QPushButton(tabBookings)
+        self.btnCancelBooking.setObjectName(u"btnCancelBooking")
+        self.btnCancelBooking.setFont(font)
+
+        self.horizontalLayout_2.addWidget(self.btnCancelBooking)
+
+
+        self.gridLayout_3.addLayout(self.horizontalLayout_2, 1, 0, 1, 1)
+
+
+        self.retranslateUi(tabBookings)
+
+        self.twBookings.setCurrentIndex(0)
+
+
+        QMetaObject.connectSlotsByName(tabBookings)
+    # setupUi
+
+    def retranslateUi(self, tabBookings):
+        tabBookings.setWindowTitle(QCoreApplication.translate("BookingsTab", u"\u041c\u043e\u0438 \u0437\u0430\u043f\u0438\u0441\u0438", None))
+        self.twBookings.setTabText(self.twBookings.indexOf(self.tabBookingsUpcoming), QCoreApplication.translate("BookingsTab", u"\u041f\u0440\u0435\u0434\u0441\u0442\u043e\u044f\u0449\u0438\u0435", None))
+        self.twBookings.setTabText(self.twBookings.indexOf(self.tabBookingsHistory), QCoreApplication.translate("BookingsTab", u"\u0418\u0441\u0442\u043e\u0440\u0438\u044f", None))
+        self.btnAddBooking.setText(QCoreApplication.translate("BookingsTab", u"\u0414\u043e\u0431\u0430\u0432\u0438\u0442\u044c", None))
+        self.btnCancelBooking.setText(QCoreApplication.translate("BookingsTab", u"\u041e\u0442\u043c\u0435\u043d\u0438\u0442\u044c", None))
+    # retranslateUi
+
+FORM_BASE = "QWidget"
+SOURCE_DIGEST = "e1af4da6fa2d280faae26afe2181441b9a147d02"
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'CatalogTab.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import QCoreApplication, QMetaObject, QRect
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QComboBox, QGridLayout, QLabel, QLineEdit, QPushButton, QTableView, QWidget
+
+class Ui_CatalogTab(object):
+    def setupUi(self, tabCatalog):
+        if not tabCatalog.objectName():
+            tabCatalog.setObjectName(u"tabCatalog")
+        self.widget = QWidget(tabCatalog)
+        self.widget.setObjectName(u"widget")
+        self.widget.setGeometry(QRect(9, 20, 741, 481))
+        self.gridLayout_2 = QGridLayout(self.widget)
+        self.gridLayout_2.setObjectName(u"gridLayout_2")
+        self.gridLayout_2.setContentsMargins(0, 0, 0, 0)
+        self.gridLayout = QGridLayout()
+        self.gridLayout.setObjectName(u"gridLayout")
+        self.lblCity = QLabel(self.widget)
+        self.lblCity.setObjectName(u"lblCity")
+        font = QFont()
+        font.setPointSize(14)
+        self.lblCity.setFont(font)
+
+        self.gridLayout.addWidget(self.lblCity, 0, 0, 1, 1)
+
+        self.cbCity = QComboBox(self.widget)
+        self.cbCity.setObjectName(u"cbCity")
+        self.cbCity.setFont(font)
+
+        self.gridLayout.addWidget(self.cbCity, 0, 1, 1, 1)
+
+        self.lblPricemin = QLabel(self.widget)
+        self.lblPricemin.setObjectName(u"lblPricemin")
+        self.lblPricemin.setFont(font)
+
+        self.gridLayout.addWidget(self.lblPricemin, 1, 0, 1, 1)
+
+        self.cbCPriceMin = QComboBox(self.widget)
+        self.cbCPriceMin.setObjectName(u"cbCPriceMin")
+        self.cbCPriceMin.setFont(font)
+
+        self.gridLayout.addWidget(self.cbCPriceMin, 1, 1, 1, 1)
+
+        self.lblPriceMax = QLabel(self.widget)
+        self.lblPriceMax.setObjectName(u"lblPriceMax")
+        self.lblPriceMax.setFont(font)
+
+        self.gridLayout.addWidget(self.lblPriceMax, 2, 0, 1, 1)
+
+        self.cbPriceMax = QComboBox(self.widget)
+        self.cbPriceMax.setObjectName(u"cbPriceMax")
+        self.cbPriceMax.setFont(font)
+
+        self.gridLayout.addWidget(self.cbPriceMax, 2, 1, 1, 1)
+
+        self.lblService = QLabel(self.widget)
+        self.lblService.setObjectName(u"lblService")
+        self.lblService.setFont(font)
+
+        self.gridLayout.addWidget(self.lblService, 3, 0, 1, 1)
+
+        self.cbService = QComboBox(self.widget)
+        self.cbService.setObjectName(u"cbService")
+        self.cbService.setFont(font)
+
+        self.gridLayout.addWidget(self.cbService, 3, 1, 1, 1)
+
+        self.lblSearch = QLabel(self.widget)
+        self.lblSearch.setObjectName(u"lblSearch")
+        self.lblSearch.setFont(font)
+
+        self.gridLayout.addWidget(self.lblSearch, 4, 0, 1, 1)
+
+        self.leSearch = QLineEdit(self.widget)
+        self.leSearch.setObjectName(u"leSearch")
+        self.leSearch.setFont(font)
+
+        self.gridLayout.addWidget(self.leSearch, 4, 1, 1, 1)
+
+        self.lblSort = QLabel(self.widget)
+        self.lblSort.setObjectName(u"lblSort")
+        self.lblSort.setFont(font)
+
+        self.gridLayout.addWidget(self.lblSort, 5, 0, 1, 1)
+
+        self.cbSort = QComboBox(self.widget)
+        self.cbSort.setObjectName(u"cbSort")
+        self.cbSort.setFont(font)
+
+        self.gridLayout.addWidget(self.cbSort, 5, 1, 1, 1)
+
+        self.btnApply = QPushButton(self.widget)
+        self.btnApply.setObjectName(u"btnApply")
+        self.btnApply.setFont(font)
+
+        self.gridLayout.addWidget(self.btnApply, 6, 1, 1, 1)
+
+
+        self.gridLayout_2.addLayout(self.gridLayout, 0, 0, 1, 1)
+
+        self.tblCatalog = QTableView(self.widget)
+        self.tblCatalog.setObjectName(u"tblCatalog")
+        self.tblCatalog.setFont(font)
+
+        self.gridLayout_2.addWidget(self.tblCatalog, 0, 1, 1, 1)
+
+        self.btnBookNow = QPushButton(self.widget)
+        self.btnBookNow.setObjectName(u"btnBookNow")
+        self.btnBookNow.setFont(font)
+
+        self.gridLayout_2.addWidget(self.btnBookNow, 1, 0, 1, 1)
+
+        self.lblCatalogTotal = QLabel(self.widget)
+        self.lblCatalogTotal.setObjectName(u"lblCatalogTotal")
+        self.lblCatalogTotal.setFont(font)
+
+        self.gridLayout_2.addWidget(self.lblCatalogTotal, 1, 1, 1, 1)
+
+
+        self.retranslateUi(tabCatalog)
+
+        QMetaObject.connectSlotsByName(tabCatalog)
+    # setupUi
+
+    def retranslateUi(self, tabCatalog):
+        tabCatalog.setWindowTitle(QCoreApplication.translate("CatalogTab", u"\u041a\u0430\u0442\u0430\u043b\u043e\u0433", None))
+        self.lblCity.setText(QCoreApplication.translate("CatalogTab", u"\u0413\u043e\u0440\u043e\u0434:", None))
+        self.lblPricemin.setText(QCoreApplication.translate("CatalogTab", u"\u0426\u0435\u043d\u0430 \u043e\u0442:", None))
+        self.lblPriceMax.setText(QCoreApplication.translate("CatalogTab", u"\u0426\u0435\u043d\u0430 \u0434\u043e:", None))
+        self.lblService.setText(QCoreApplication.translate("CatalogTab", u"\u0423\u0441\u043b\u0443\u0433\u0430:", None))
+        self.lblSearch.setText(QCoreApplication.translate("CatalogTab", u"\u041f\u043e\u0438\u0441\u043a:", None))
+        self.leSearch.setPlaceholderText(QCoreApplication.translate("CatalogTab", u"\u0423\u0441\u043b\u0443\u0433\u0430 \u0438\u043b\u0438 \u0441\u0430\u043b\u043e\u043d", None))
+        self.lblSort.setText(QCoreApplication.translate("CatalogTab", u"\u0421\u043e\u0440\u0442\u0438\u0440\u043e\u0432\u043a\u0430:", None))
+        self.btnApply.setText(QCoreApplication.translate("CatalogTab", u"\u041d\u0430\u0439\u0442\u0438", None))
+        self.btnBookNow.setText(QCoreApplication.translate("CatalogTab", u"\u0417\u0430\u043f\u0438\u0441\u0430\u0442\u044c\u0441\u044f", None))
+        self.lblCatalogTotal.setText("")
+    # retranslateUi
+
+FORM_BASE = "QWidget"
+SOURCE_DIGEST = "df2911ebe29242b35e67e175e87a0c8a212062e9"
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'LoginWindow.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import QCoreApplication, QMetaObject
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QComboBox, QGridLayout, QLabel, QLineEdit, QPushButton
+
+class Ui_LoginWindow(object):
+    def setupUi(self, LoginWindow):
+        if not LoginWindow.objectName():
+            LoginWindow.setObjectName(u"LoginWindow")
+        LoginWindow.resize(347, 260)
+        self.gridLayout = QGridLayout(LoginWindow)
+        self.gridLayout.setObjectName(u"gridLayout")
+        self.UserName = QLabel(LoginWindow)
+        self.UserName.setObjectName(u"UserName")
+        font = QFont()
+        font.setPointSize(14)
+        self.UserName.setFont(font)
+
+        self.gridLayout.addWidget(self.UserName, 0, 0, 1, 1)
+
+        self.leUsername = QLineEdit(LoginWindow)
+        self.leUsername.setObjectName(u"leUsername")
+        self.leUsername.setFont(font)
+
+        self.gridLayout.addWidget(self.leUsername, 0, 1, 1, 1)
+
+        self.Password = QLabel(LoginWindow)
+        self.Password.setObjectName(u"Password")
+        self.Password.setFont(font)
+
+        self.gridLayout.addWidget(self.Password, 1, 0, 1, 1)
+
+        self.lePassword = QLineEdit(LoginWindow)
+        self.lePassword.setObjectName(u"lePassword")
+        self.lePassword.setFont(font)
+        self.lePassword.setEchoMode(QLineEdit.Password)
+
+        self.gridLayout.addWidget(self.lePassword, 1, 1, 1, 1)
+
+        self.cbRole = QComboBox(LoginWindow)
+        self.cbRole.addItem("")
+        self.cbRole.addItem("")
+        self.cbRole.addItem("")
+        self.cbRole.setObjectName(u"cbRole")
+        self.cbRole.setFont(font)
+        self.cbRole.setEditable(False)
+
+        self.gridLayout.addWidget(self.cbRole, 2, 1, 1, 1)
+
+        self.btnLogin = QPushButton(LoginWindow)
+        self.btnLogin.setObjectName(u"btnLogin")
+        self.btnLogin.setFont(font)
+
+        self.gridLayout.addWidget(self.btnLogin, 3, 1, 1, 1)
+
+
+        self.retranslateUi(LoginWindow)
+
+        QMetaObject.connectSlotsByName(LoginWindow)
+    # setupUi
+
+    def retranslateUi(self, LoginWindow):
+        LoginWindow.setWindowTitle(QCoreApplication.translate("LoginWindow", u"\u0410\u0432\u0442\u043e\u0440\u0438\u0437\u0430\u0446\u0438\u044f", None))
+        self.UserName.setText(QCoreApplication.translate("LoginWindow", u"\u041b\u043e\u0433\u0438\u043d:", None))
+        self.Password.setText(QCoreApplication.translate("LoginWindow", u"\u041f\u0430\u0440\u043e\u043b\u044c:", None))
+        self.cbRole.setItemText(0, QCoreApplication.translate("LoginWindow", u"\u041a\u043b\u0438\u0435\u043d\u0442", None))
+        self.cbRole.setItemText(1, QCoreApplication.translate("LoginWindow", u"\u0421\u0430\u043b\u043e\u043d", None))
+        self.cbRole.setItemText(2, QCoreApplication.translate("LoginWindow", u"\u0410\u0434\u043c\u0438\u043d", None))
+
+        self.btnLogin.setText(QCoreApplication.translate("LoginWindow", u"\u0412\u043e\u0439\u0442\u0438", None))
+    # retranslateUi
+
+FORM_BASE = "QDialog"
+SOURCE_DIGEST = "65b31376cd53b09bd328d8b69abb957402262840"
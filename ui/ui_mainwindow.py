@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'MainWindow.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import QCoreApplication, QMetaObject, QRect
+from PySide6.QtWidgets import QTabWidget
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        if not MainWindow.objectName():
+            MainWindow.setObjectName(u"MainWindow")
+        MainWindow.resize(814, 597)
+        self.twMain = QTabWidget(MainWindow)
+        self.twMain.setObjectName(u"twMain")
+        self.twMain.setGeometry(QRect(10, 20, 781, 561))
+
+        self.retranslateUi(MainWindow)
+
+        QMetaObject.connectSlotsByName(MainWindow)
+    # setupUi
+
+    def retranslateUi(self, MainWindow):
+        MainWindow.setWindowTitle(QCoreApplication.translate("MainWindow", u"Smart-SPA", None))
+    # retranslateUi
+
+FORM_BASE = "QWidget"
+SOURCE_DIGEST = "c297ffd1894428e17875746acc070f4076056b1b"
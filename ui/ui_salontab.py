@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'SalonTab.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import QCoreApplication, QMetaObject
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QGridLayout, QHBoxLayout, QPushButton, QTableView
+
+class Ui_SalonTab(object):
+    def setupUi(self, tabSalon):
+        if not tabSalon.objectName():
+            tabSalon.setObjectName(u"tabSalon")
+        self.gridLayout_4 = QGridLayout(tabSalon)
+        self.gridLayout_4.setObjectName(u"gridLayout_4")
+        self.tblServices = QTableView(tabSalon)
+        self.tblServices.setObjectName(u"tblServices")
+        font = QFont()
+        font.setPointSize(14)
+        self.tblServices.setFont(font)
+
+        self.gridLayout_4.addWidget(self.tblServices, 0, 0, 1, 1)
+
+        self.horizontalLayout_4 = QHBoxLayout()
+        self.horizontalLayout_4.setObjectName(u"horizontalLayout_4")
+        self.btnAddService = QPushButton(tabSalon)
+        self.btnAddService.setObjectName(u"btnAddService")
+        self.btnAddService.setFont(font)
+
+        self.horizontalLayout_4.addWidget(self.btnAddService)
+
+        self.btnDeleteService = QPushButton(tabSalon)
+        self.btnDeleteService.setObjectName(u"btnDeleteService")
+        self.btnDeleteService.setFont(font)
+
+        self.horizontalLayout_4.addWidget(self.btnDeleteService)
+
+        self.btnSaveService = QPushButton(tabSalon)
+        self.btnSaveService.setObjectName(u"btnSaveService")
+        self.btnSaveService.setFont(font)
+
+        self.horizontalLayout_4.addWidget(self.btnSaveService)
+
+        self.btnGenerateSchedule = QPushButton(tabSalon)
+        self.btnGenerateSchedule.setObjectName(u"btnGenerateSchedule")
+        self.btnGenerateSchedule.setFont(font)
+
+        self.horizontalLayout_4.addWidget(self.btnGenerateSchedule)
+
+
+        self.gridLayout_4.addLayout(self.horizontalLayout_4, 1, 0, 1, 1)
+
+
+        self.retranslateUi(tabSalon)
+
+        QMetaObject.connectSlotsByName(tabSalon)
+    # setupUi
+
+    def retranslateUi(self, tabSalon):
+        tabSalon.setWindowTitle(QCoreApplication.translate("SalonTab", u"\u0421\u0430\u043b\u043e\u043d", None))
+        self.btnAddService.setText(QCoreApplication.translate("SalonTab", u"\u0414\u043e\u0431\u0430\u0432\u0438\u0442\u044c", None))
+        self.btnDeleteService.setText(QCoreApplication.translate("SalonTab", u"\u0423\u0434\u0430\u043b\u0438\u0442\u044c", None))
+        self.btnSaveService.setText(QCoreApplication.translate("SalonTab", u"\u0421\u043e\u0445\u0440\u0430\u043d\u0438\u0442\u044c", None))
+        self.btnGenerateSchedule.setText(QCoreApplication.translate("SalonTab", u"\u0420\u0430\u0441\u043f\u0438\u0441\u0430\u043d\u0438\u0435", None))
+    # retranslateUi
+
+FORM_BASE = "QWidget"
+SOURCE_DIGEST = "7f7866ec24c3346aaee63072750e9ee88c002a2c"
@@ -0,0 +1,65 @@
+import hashlib
+import importlib
+import os
+
+from PySide6.QtCore import QFile, QObject
+from PySide6.QtWidgets import QDialog, QMainWindow, QWidget
+
+UI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui")
+UI_PACKAGE = "ui"
+RUNTIME_UI_ENV = "SMART_SPA_RUNTIME_UI"
+FORM_BASES = {"QWidget": QWidget, "QDialog": QDialog, "QMainWindow": QMainWindow}
+
+
+def ui_path(name):
+    return os.path.join(UI_DIR, f"{name}.ui")
+
+
+def module_name(name):
+    return f"ui_{name.lower()}"
+
+
+def source_digest(path):
+    with open(path, "rb") as handle:
+        return hashlib.sha1(handle.read()).hexdigest()
+
+
+def compiled_form(name):
+    if os.environ.get(RUNTIME_UI_ENV):
+        return None
+    try:
+        module = importlib.import_module(f"{UI_PACKAGE}.{module_name(name)}")
+    except ImportError:
+        return None
+    path = ui_path(name)
+    if os.path.exists(path) and getattr(module, "SOURCE_DIGEST", None) != source_digest(path):
+        return None
+    return module
+
+
+def load_form(name, parent=None):
+    module = compiled_form(name)
+    if module is None:
+        return load_ui_file(ui_path(name), parent)
+    widget = FORM_BASES[module.FORM_BASE](parent)
+    form = getattr(module, f"Ui_{name}")()
+    form.setupUi(widget)
+    for attr, value in vars(form).items():
+        if isinstance(value, QObject):
+            setattr(widget, attr, value)
+    return widget
+
+
+def load_ui_file(path, parent=None):
+    from PySide6.QtUiTools import QUiLoader
+
+    ui_file = QFile(path)
+    if not ui_file.open(QFile.ReadOnly):
+        raise FileNotFoundError(f"Не удалось открыть файл интерфейса: {path}")
+    try:
+        widget = QUiLoader().load(ui_file, parent)
+    finally:
+        ui_file.close()
+    if widget is None:
+        raise RuntimeError(f"Не удалось загрузить интерфейс: {path}")
+    return widget